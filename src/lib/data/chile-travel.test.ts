@@ -1,8 +1,14 @@
 import { describe, expect, it } from 'vitest';
 import { readdirSync } from 'node:fs';
 import { join } from 'node:path';
-import { availableRouteIds, chileTravelData, loadRouteById } from './chile-travel/server';
-import type { RouteDetail } from './chile-travel';
+import {
+  availableRouteIds,
+  chileTravelData,
+  loadRouteById,
+  resolveAssetReferences,
+  resolveStopReferences
+} from './chile-travel/server';
+import type { ResourceImage, RouteDetail, RouteStop } from './chile-travel';
 
 const ROUTE_DATA_DIR = join(process.cwd(), 'travel-routes', 'data', 'routes');
 
@@ -90,3 +96,51 @@ describe('route structure sanity checks', () => {
     expect(routeWithStops?.segments?.length).toBeGreaterThan(0);
   });
 });
+
+describe('resolveStopReferences', () => {
+  it('ersetzt Stopp-IDs durch Einträge aus dem gemeinsamen Katalog', () => {
+    const catalog: Record<string, RouteStop> = {
+      'scl-airport': { id: 'scl-airport', name: 'Santiago International Airport (SCL)' }
+    };
+    const route = {
+      id: 'var-shared',
+      name: 'Geteilte Stopps',
+      stops: ['scl-airport', 'unbekannt'],
+      stopsCatalog: 'data/immutable/stops/stops-catalog.0123456789ab.json'
+    } as unknown as RouteDetail;
+
+    const resolved = resolveStopReferences(route, catalog);
+
+    expect(resolved.stops?.[0]).toBe(catalog['scl-airport']);
+    expect(resolved.stops?.[1]).toEqual({ id: 'unbekannt' });
+    expect(resolved.stopsCatalog).toBeUndefined();
+  });
+
+  it('lässt eingebettete Stopps unverändert', () => {
+    const stop = { id: 'santiago-center', name: 'Santiago Zentrum' };
+    const route = { id: 'var-inline', name: 'Inline', stops: [stop] } as RouteDetail;
+
+    expect(resolveStopReferences(route, null).stops?.[0]).toBe(stop);
+  });
+});
+
+describe('resolveAssetReferences', () => {
+  it('setzt Bilder aus der Asset-Tabelle in images- und photos-Listen ein', () => {
+    const assets: Record<string, ResourceImage> = {
+      '0123456789ab': { url: 'https://upload.wikimedia.org/placeholder.png', caption: 'Platzhalter', license: 'CC0' }
+    };
+    const inline = { url: 'https://upload.wikimedia.org/inline.png', caption: 'Inline' };
+    const route = {
+      id: 'var-assets',
+      name: 'Assets',
+      stops: [{ id: 'scl-airport', name: 'SCL', photos: [{ asset: '0123456789ab' }] }],
+      days: [{ hotels: [{ name: 'Hotel', images: [{ asset: '0123456789ab' }, inline, { asset: 'fehlt' }] }] }]
+    } as unknown as RouteDetail;
+
+    resolveAssetReferences(route, assets);
+
+    const hotel = (route.days?.[0] as unknown as { hotels: Array<{ images: unknown[] }> }).hotels[0];
+    expect(route.stops?.[0].photos?.[0]).toBe(assets['0123456789ab']);
+    expect(hotel.images).toEqual([assets['0123456789ab'], inline, { asset: 'fehlt' }]);
+  });
+});
@@ -1,6 +1,17 @@
 import { readFileSync } from 'node:fs';
 import { resolve } from 'node:path';
-import type { LoadedTravelRoutesDataset, RouteDetail, RouteIndexEntry, TravelRoutesDataset } from './types';
+import { resolveAssetReferences, resolveStopReferences } from '../../../../travel-routes/route-references.js';
+import type {
+  AssetTableArtifact,
+  LoadedTravelRoutesDataset,
+  ResourceImage,
+  RouteDetail,
+  RouteGeometryArtifact,
+  RouteIndexEntry,
+  RouteStop,
+  StopsCatalogArtifact,
+  TravelRoutesDataset
+} from './types';
 
 // Für Einsteiger:innen: Die JSON-Dateien liegen außerhalb von src, damit sie
 // sowohl vom statischen HTML-Demo als auch von SvelteKit genutzt werden können.
@@ -52,16 +63,56 @@ function normalizeRoute(raw: RouteDetail, entry?: RouteIndexEntry): RouteDetail
   }
 }
 
+// Die vorberechnete GeoJSON-Datei ist optional: Fehlt sie, baut
+// `map-data.ts` die Collections wie bisher im Browser zusammen.
+function attachMapGeometry(route: RouteDetail, entry: RouteIndexEntry) {
+  if (!entry.geo?.file) return;
+  try {
+    route.mapGeometry = readJsonFile<RouteGeometryArtifact>(entry.geo.file);
+  } catch (error) {
+    console.warn(`Kartengeometrie für ${entry.id} fehlt (${entry.geo.file})`, error);
+  }
+}
+
+// Mit `build_data.py --shared-stops` enthalten Routen-Dateien nur Stopp-IDs, mit
+// `--asset-table` stehen Bilder nur als `{ asset: "<id>" }` darin. Die Tabellen
+// liegen inhaltsgehasht daneben; das Einsetzen teilen wir uns mit
+// `travel-routes.js` und `chile-map.js` (`route-references.js`).
+export { resolveAssetReferences, resolveStopReferences };
+
+function loadStopsCatalog(dataset: TravelRoutesDataset): Record<string, RouteStop> | null {
+  if (!dataset.stopsCatalog?.file) return null;
+  try {
+    return readJsonFile<StopsCatalogArtifact>(dataset.stopsCatalog.file).stops;
+  } catch (error) {
+    console.warn(`Stopp-Katalog fehlt (${dataset.stopsCatalog.file})`, error);
+    return null;
+  }
+}
+
+function loadAssetTable(dataset: TravelRoutesDataset): Record<string, ResourceImage> | null {
+  if (!dataset.assetTable?.file) return null;
+  try {
+    return readJsonFile<AssetTableArtifact>(dataset.assetTable.file).assets;
+  } catch (error) {
+    console.warn(`Asset-Tabelle fehlt (${dataset.assetTable.file})`, error);
+    return null;
+  }
+}
+
 const baseDataset = readJsonFile<TravelRoutesDataset>('travel-routes-data.json');
+const stopsCatalog = loadStopsCatalog(baseDataset);
+const assetTable = loadAssetTable(baseDataset);
 const routes: Record<string, RouteDetail> = {};
 const filteredIndex: RouteIndexEntry[] = [];
 
 for (const entry of baseDataset.routeIndex) {
   const routeFile = entry.file ?? `data/routes/${entry.id}.json`;
   try {
-    const detail = readJsonFile<RouteDetail>(routeFile);
-    const parsed = normalizeRoute(detail, entry);
+    const detail = resolveAssetReferences(readJsonFile<RouteDetail>(routeFile), assetTable);
+    const parsed = normalizeRoute(resolveStopReferences(detail, stopsCatalog), entry);
     if (parsed) {
+      attachMapGeometry(parsed, entry);
       routes[parsed.id] = parsed;
       filteredIndex.push(entry);
     }
@@ -3,6 +3,8 @@
 // automatisch alle Felder – so lassen sich Tippfehler und fehlende Angaben früh
 // entdecken.
 
+import type { FeatureCollection } from 'geojson';
+
 export interface Coordinates {
   lat: number;
   lng: number;
@@ -11,6 +13,7 @@ export interface Coordinates {
 export interface ResourceImage {
   url: string;
   caption?: string;
+  source?: string;
   credit?: string;
   license?: string;
 }
@@ -89,6 +92,8 @@ export interface RouteMetrics {
   activityCount?: number;
   averageDailyBudget?: number;
   groundTransportCarbonKg?: number;
+  flightCarbonKg?: number;
+  dayCount?: number;
   [key: string]: number | undefined;
 }
 
@@ -262,6 +267,53 @@ export interface DailySegmentDefinition {
   [key: string]: unknown;
 }
 
+export type BoundingBox = [[number, number], [number, number]];
+
+// Vom Build (`travel-routes/route_geojson.py`) vorberechnete Kartengeometrie:
+// Farben, Labels und Dash-Arrays sind bereits aus den Transportmodi aufgelöst.
+export interface RouteGeometryCollections {
+  segments: FeatureCollection;
+  stops: FeatureCollection;
+  bounds: BoundingBox | null;
+}
+
+// Detailstufen (`travel-routes/line_simplify.py`): Das Haupt-Artefakt enthält die
+// Übersicht, feinere Zoom-Bänder liegen in eigenen Dateien (`file`).
+export interface RouteGeometryLevel {
+  minZoom: number;
+  maxZoom: number;
+  file?: string;
+}
+
+export interface RouteGeometryLevelArtifact {
+  version: number;
+  routeId: string;
+  minZoom: number;
+  maxZoom: number;
+  // Schlüssel ist `properties.order` des Segment-Features.
+  geometries: Record<string, [number, number][]>;
+}
+
+// Kumulierte Summen pro Slider-Schritt (`build_timeline()` in `travel-routes/build_data.py`):
+// Index `i` enthält die Summe bis einschließlich Schritt `i` (Tag bzw. Segment).
+export interface RouteTimeline {
+  steps: string[];
+  km: number[];
+  carbonKg: number[];
+  spendEUR: number[];
+  nights: number[];
+  // IDs der Segment-Features, die im jeweiligen Schritt aktiv sind.
+  segments: string[][];
+}
+
+export interface RouteGeometryArtifact extends RouteGeometryCollections {
+  version: number;
+  routeId: string;
+  days: Record<string, RouteGeometryCollections>;
+  levels?: RouteGeometryLevel[];
+  timeline?: RouteTimeline;
+}
+
 export interface RouteDetail {
   id: string;
   name: string;
@@ -283,6 +335,7 @@ export interface RouteDetail {
     dailySegments?: DailySegmentDefinition[];
   };
   mapFocus?: RouteMapFocus;
+  mapGeometry?: RouteGeometryArtifact;
   source?: string;
   [key: string]: unknown;
 }
@@ -298,6 +351,7 @@ export interface RouteIndexEntry {
   metrics?: RouteMetrics;
   searchTokens?: string[];
   mapFocus?: RouteMapFocus;
+  geo?: { file: string; bounds?: BoundingBox | null };
 }
 
 export interface TransportMode {
@@ -334,6 +388,22 @@ export interface TravelRoutesDataset {
   suggestionLibrary?: Array<Record<string, unknown>>;
   templates?: Record<string, unknown>;
   poiOverview?: Record<string, unknown>;
+  searchIndex?: { file: string };
+  spatialIndex?: Record<string, unknown>;
+  stopsCatalog?: { file: string; count: number };
+  assetTable?: { file: string; count: number };
+}
+
+// Gemeinsame Bildeinträge (`build_data.py --asset-table`), nach Asset-ID.
+export interface AssetTableArtifact {
+  version: number;
+  assets: Record<string, ResourceImage>;
+}
+
+// Gemeinsamer Stopp-Katalog (`build_data.py --shared-stops`), nach Stopp-ID.
+export interface StopsCatalogArtifact {
+  version: number;
+  stops: Record<string, RouteStop>;
 }
 
 export interface LoadedTravelRoutesDataset extends TravelRoutesDataset {
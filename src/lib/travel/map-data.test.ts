@@ -1,13 +1,21 @@
+import { readFileSync } from 'node:fs';
+import { join } from 'node:path';
 import { describe, expect, it } from 'vitest';
 import { chileTravelData } from '../data/chile-travel/server';
+import { calculateBoundingBox } from './map-bounds';
 import {
+  applyDetailLevel,
   buildSegmentCollection,
   buildStopCollection,
   collectAllCoordinates,
+  pickDetailLevel,
   type SegmentCollection,
   type StopCollection
 } from './map-data';
 
+// Dieselbe Datei prüft `tests/test_route_geojson.py` gegen `route_geojson.py`.
+const GEOMETRY_FIXTURE = join(process.cwd(), 'travel-routes', 'route-geometry.fixture.json');
+
 function pickClassicalRoute() {
   return Object.values(chileTravelData.routes).find(
     (route) => Array.isArray(route?.stops) && route?.stops?.length && route?.segments?.length
@@ -41,4 +49,63 @@ describe('map-data collections', () => {
     const sorted = [...orders].sort((a, b) => a - b);
     expect(orders).toEqual(sorted);
   });
+
+  it('übernimmt vorberechnete Kartengeometrie aus dem Build unverändert', () => {
+    expect(route, 'Route fehlt für die Geometrie-Prüfung').not.toBeNull();
+    const precomputed = {
+      version: 1,
+      routeId: route!.id,
+      segments: buildSegmentCollection(route, transportModes),
+      stops: buildStopCollection(route),
+      bounds: null,
+      days: {}
+    };
+    const withGeometry = { ...route!, mapGeometry: precomputed };
+
+    expect(buildSegmentCollection(withGeometry, {})).toBe(precomputed.segments);
+    expect(buildStopCollection(withGeometry)).toBe(precomputed.stops);
+  });
+
+  it('liefert dieselben Collections wie der Build (route-geometry.fixture.json)', () => {
+    const fixture = JSON.parse(readFileSync(GEOMETRY_FIXTURE, 'utf8'));
+    for (const { route, segments, stops, bounds } of fixture.routes) {
+      const builtSegments = buildSegmentCollection(route, fixture.transportModes);
+      const builtStops = buildStopCollection(route);
+      // JSON-Runde entfernt `undefined`-Properties wie beim Ausliefern.
+      expect(JSON.parse(JSON.stringify(builtSegments)), route.id).toEqual(segments);
+      expect(JSON.parse(JSON.stringify(builtStops)), route.id).toEqual(stops);
+      expect(calculateBoundingBox(collectAllCoordinates(builtSegments, builtStops))).toEqual(bounds);
+    }
+  });
+
+  it('wählt die Detailstufe passend zum Zoom und ersetzt nur bekannte Linien', () => {
+    const levels = [
+      { minZoom: 0, maxZoom: 5 },
+      { minZoom: 6, maxZoom: 9, file: 'data/geo/demo.z6.json' },
+      { minZoom: 10, maxZoom: 24, file: 'data/geo/demo.z10.json' }
+    ];
+    expect(pickDetailLevel(levels, 3.4)).toBe(levels[0]);
+    expect(pickDetailLevel(levels, 9.7)).toBe(levels[1]);
+    expect(pickDetailLevel(levels, 12)).toBe(levels[2]);
+    expect(pickDetailLevel(undefined, 12)).toBeNull();
+
+    const segments: SegmentCollection = {
+      type: 'FeatureCollection',
+      features: [0, 1].map((order) => ({
+        type: 'Feature',
+        geometry: { type: 'LineString', coordinates: [[-70, -33], [-71, -34]] },
+        properties: { id: `day-${order + 1}`, mode: 'car', order, color: '#000', label: 'Auto' }
+      }))
+    };
+    const detailed = applyDetailLevel(segments, {
+      geometries: { '1': [[-70, -33], [-70.5, -33.4], [-71, -34]] }
+    });
+
+    expect(detailed.features[0]).toBe(segments.features[0]);
+    expect(detailed.features[1].geometry).toEqual({
+      type: 'LineString',
+      coordinates: [[-70, -33], [-70.5, -33.4], [-71, -34]]
+    });
+    expect(applyDetailLevel(segments, null)).toBe(segments);
+  });
 });
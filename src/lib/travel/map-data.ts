@@ -6,6 +6,8 @@ import type {
   LoadedTravelRoutesDataset,
   ResourceImage,
   RouteDetail,
+  RouteGeometryLevel,
+  RouteGeometryLevelArtifact,
   RouteSegment,
   RouteStop
 } from '../data/chile-travel';
@@ -123,6 +125,9 @@ export function buildSegmentCollection(
   transportModes: LoadedTravelRoutesDataset['transportModes']
 ): SegmentCollection {
   if (!route) return EMPTY_SEGMENTS;
+  if (route.mapGeometry?.segments) {
+    return route.mapGeometry.segments as SegmentCollection;
+  }
 
   const features: SegmentCollection['features'] = [];
   let order = 0;
@@ -193,6 +198,9 @@ function pickPrimaryImage(images?: ResourceImage[] | null) {
 
 export function buildStopCollection(route: RouteDetail | null): StopCollection {
   if (!route) return EMPTY_STOPS;
+  if (route.mapGeometry?.stops) {
+    return route.mapGeometry.stops as StopCollection;
+  }
   const features: StopCollection['features'] = [];
 
   if (Array.isArray(route.stops) && route.stops.length > 0) {
@@ -274,6 +282,35 @@ export function buildStopCollection(route: RouteDetail | null): StopCollection {
   return { type: 'FeatureCollection', features };
 }
 
+/**
+ * Für Einsteiger:innen: Der Build legt pro Zoom-Band eine vereinfachte Linie ab.
+ * `pickDetailLevel` sucht das Band zum aktuellen Zoom, `applyDetailLevel` tauscht
+ * die Linien der Segmente (über `properties.order`) gegen die feinere Fassung.
+ */
+export function pickDetailLevel(
+  levels: RouteGeometryLevel[] | undefined,
+  zoom: number
+): RouteGeometryLevel | null {
+  if (!Array.isArray(levels) || levels.length === 0) return null;
+  const match = levels.find((level) => zoom >= level.minZoom && zoom < level.maxZoom + 1);
+  if (match) return match;
+  return zoom < levels[0].minZoom ? levels[0] : levels[levels.length - 1];
+}
+
+export function applyDetailLevel(
+  segments: SegmentCollection,
+  level: Pick<RouteGeometryLevelArtifact, 'geometries'> | null
+): SegmentCollection {
+  if (!level) return segments;
+  return {
+    type: 'FeatureCollection',
+    features: segments.features.map((feature) => {
+      const coordinates = level.geometries[String(feature.properties.order)];
+      return coordinates ? { ...feature, geometry: { type: 'LineString', coordinates } } : feature;
+    })
+  };
+}
+
 export function collectAllCoordinates(
   segments: SegmentCollection,
   stops: StopCollection
@@ -1,5 +1,6 @@
 import { describe, expect, it } from 'vitest';
-import { getDefaultSliderIndex, type TimelineStepLike } from './timeline-helpers';
+import type { RouteTimeline } from '../data/chile-travel/types';
+import { getDefaultSliderIndex, getTimelineTotals, type TimelineStepLike } from './timeline-helpers';
 
 describe('getDefaultSliderIndex', () => {
   it('returns 0 when no steps exist', () => {
@@ -22,3 +23,31 @@ describe('getDefaultSliderIndex', () => {
     expect(getDefaultSliderIndex(steps)).toBe(0);
   });
 });
+
+describe('getTimelineTotals', () => {
+  const timeline: RouteTimeline = {
+    steps: ['day-1', 'day-2', 'day-3'],
+    km: [120, 480.5, 480.5],
+    carbonKg: [23, 91.2, 91.2],
+    spendEUR: [80, 160, 310],
+    nights: [1, 2, 4],
+    segments: [['day-1'], ['day-2'], []]
+  };
+
+  it('reads the cumulative totals of a step', () => {
+    expect(getTimelineTotals(timeline, 1)).toEqual({
+      km: 480.5,
+      carbonKg: 91.2,
+      spendEUR: 160,
+      nights: 2,
+      segments: ['day-2']
+    });
+    expect(getTimelineTotals(timeline, 2)?.nights).toBe(4);
+  });
+
+  it('returns null without timeline or for indices outside the steps', () => {
+    expect(getTimelineTotals(undefined, 0)).toBeNull();
+    expect(getTimelineTotals(timeline, -1)).toBeNull();
+    expect(getTimelineTotals(timeline, 3)).toBeNull();
+  });
+});
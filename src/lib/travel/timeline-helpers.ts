@@ -6,6 +6,8 @@
  * Map-Komponente ohne DOM direkt mit Vitest prüfen – ideal für Einsteiger:innen.
  */
 
+import type { RouteTimeline } from '../data/chile-travel/types';
+
 export interface TimelineStepLike {
   order: number;
   label: string;
@@ -25,3 +27,33 @@ export function getDefaultSliderIndex(steps: TimelineStepLike[] | undefined | nu
   }
   return steps.length - 1;
 }
+
+export interface TimelineTotals {
+  km: number;
+  carbonKg: number;
+  spendEUR: number;
+  nights: number;
+  segments: string[];
+}
+
+/**
+ * Summen bis einschließlich Schritt `index` aus der vom Build vorberechneten Timeline.
+ * Für Einsteiger:innen: Die Arrays sind schon kumuliert – ein Slider-Schritt ist
+ * also nur ein Array-Zugriff, egal wie viele Tage die Route hat. Fehlt die
+ * Timeline oder passt der Index nicht, kommt `null` zurück.
+ */
+export function getTimelineTotals(
+  timeline: RouteTimeline | undefined | null,
+  index: number
+): TimelineTotals | null {
+  if (!timeline || !Number.isInteger(index) || index < 0 || index >= timeline.steps.length) {
+    return null;
+  }
+  return {
+    km: timeline.km[index],
+    carbonKg: timeline.carbonKg[index],
+    spendEUR: timeline.spendEUR[index],
+    nights: timeline.nights[index],
+    segments: timeline.segments[index] ?? []
+  };
+}
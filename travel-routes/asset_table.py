@@ -0,0 +1,79 @@
+"""Gemeinsame Asset-Tabelle für Bildeinträge aller Routen-Dateien.
+
+Viele Routen wiederholen identische Bildobjekte – allen voran den
+Platzhalter aus ``scripts/update_route_images.py`` und Standard-Bildunterschriften
+wie „Stimmungsbild aus Chile für die Travel Experience“. ``AssetTable`` legt
+jedes Bild einmal ab, Schlüssel sind URL, Bildunterschrift und Lizenz. In den
+Routen bleibt an seiner Stelle nur ``{"asset": "<id>"}`` stehen.
+
+Die ID ist ein Hash des Schlüssels und hängt deshalb nicht von der
+Reihenfolge der Routen ab. Teilt ein Bild den Schlüssel mit einem bereits
+aufgenommenen, unterscheidet sich aber in anderen Feldern (etwa ``credit``
+statt ``source``), bleibt es unverändert in der Route – es geht nichts verloren.
+
+Welche Listen Bildeinträge enthalten, legt ``ROUTE_IMAGE_LISTS`` in
+``json_select.py`` fest; nur diese Stellen werden besucht.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+
+from json_select import ROUTE_IMAGE_LISTS, Selector, replace_paths
+
+ARTIFACT_VERSION = 1
+IMAGE_LISTS = Selector(*ROUTE_IMAGE_LISTS)
+_DESCRIPTIVE_FIELDS = ("caption", "source", "credit", "license")
+
+
+def is_image_record(value: object) -> bool:
+    return (
+        isinstance(value, dict)
+        and isinstance(value.get("url"), str)
+        and any(field in value for field in _DESCRIPTIVE_FIELDS)
+    )
+
+
+def asset_id(record: dict) -> str:
+    key = json.dumps([record.get("url"), record.get("caption"), record.get("license")], ensure_ascii=False)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+
+
+class AssetTable:
+    """Interns image records and rewrites routes to reference them."""
+
+    def __init__(self) -> None:
+        self.assets: dict[str, dict] = {}
+        self.references = 0
+        self.conflicts = 0
+
+    def intern(self, record: dict) -> dict:
+        """Return a ``{"asset": id}`` reference, or ``record`` itself on a key conflict."""
+
+        identifier = asset_id(record)
+        known = self.assets.setdefault(identifier, record)
+        if known != record:
+            self.conflicts += 1
+            return record
+        self.references += 1
+        return {"asset": identifier}
+
+    def rewrite(self, value: object) -> object:
+        """Copy of ``value`` with every image record in an image list interned.
+
+        Only containers on the way to an image list are copied; the rest is shared with ``value``.
+        """
+
+        if isinstance(value, list):
+            # Sammel-Dateien enthalten mehrere Routen.
+            return [self.rewrite(item) for item in value]
+        replacements = [
+            (path, [self.intern(item) if is_image_record(item) else item for item in images])
+            for path, images in IMAGE_LISTS.matches(value)
+            if isinstance(images, list)
+        ]
+        return replace_paths(value, replacements)
+
+    def to_artifact(self) -> dict:
+        return {"version": ARTIFACT_VERSION, "assets": dict(sorted(self.assets.items()))}
@@ -1,12 +1,47 @@
-"""Hilfsskript zum Generieren der Travel-Routes-Daten als JSON."""
+"""Hilfsskript zum Generieren der Travel-Routes-Daten als JSON.
+
+Der Import ist billig: Alle Arbeit steckt in explizit aufrufbaren Stages.
+
+1. ``load_catalog()`` – STOP_ENRICHMENTS in eine Kopie von STOPS mergen
+2. ``enrich_route()`` – Segment-, Flug-, Unterkunfts-, Food- und Aktivitäts-Enrichments
+3. ``compute_route_metrics()`` – Distanz, CO₂, Nächte, Tagesbudget
+4. ``emit_route()`` / ``main()`` – JSON-Artefakte schreiben
+
+``build_route()`` bündelt 1–3 für eine einzelne Route aus ``ROUTE_DEFINITIONS``.
+
+Stopps, Enrichments und Routen-Definitionen liegen als JSON in ``tables/`` und
+werden erst geladen, wenn eine Stage sie braucht (``data_table()``).
+"""
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import json
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
 from copy import deepcopy
 from datetime import datetime
 from math import asin, cos, radians, sin, sqrt
 from pathlib import Path
+from typing import Callable, Container, Iterable, Iterator, Mapping
+
+import build_metrics
+import cbor_codec
+from asset_table import AssetTable
+from build_manifest import BuildManifest, KeySet, OutputRecords
+from build_metrics import BuildInstrumentation
+from data_tables import load_table
+from enrichment_join import EnrichmentJoin
+from frozen_data import FrozenDict, freeze, overlay
+from index_spool import IndexSpool, read_entry
+from json_select import Selector
+from line_simplify import ARTIFACT_VERSION as LOD_ARTIFACT_VERSION, ZOOM_BANDS, build_detail_levels
+from route_geojson import build_route_geometry
+from search_index import SearchIndex
+from spatial_index import SpatialIndex
 
 
 def haversine_km(coord_a: dict, coord_b: dict) -> float:
@@ -28,1950 +63,57 @@ def deep_merge(target: dict, extra: dict) -> dict:
 
     for key, value in extra.items():
         if isinstance(value, dict) and isinstance(target.get(key), dict):
+            if isinstance(target[key], FrozenDict):
+                # Copy-on-write: never modify a record shared with other routes.
+                target[key] = dict(target[key])
             deep_merge(target[key], value)
         else:
             target[key] = value
     return target
 
 
-META = {
-    "title": "Chile – Interaktive Reiserouten",
-    "subtitle": "Modulares Toolkit für 7 kuratierte Varianten plus eigene Entwürfe",
-    "defaultDurationDays": 19,
-    "currency": "EUR",
-    "editor": {
-        "localStorageKey": "travel-routes.custom",
-        "notesKey": "travel-routes.notes",
-    },
-    "map": {
-        "center": [-30, -71],
-        "zoom": 4,
-        "tileLayer": "https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png",
-        "styleUrl": "https://basemaps.cartocdn.com/gl/positron-gl-style/style.json",
-        "glyphsUrl": "https://demotiles.maplibre.org/font/{fontstack}/{range}.pbf",
-        "attribution": "© OpenStreetMap",
-    },
-}
-
-TRANSPORT_MODES = {
-    "drive": {
-        "label": "Mietwagen",
-        "color": "#5bd1ff",
-        "dashArray": None,
-        "icon": "🚗",
-        "description": "Flexibel unterwegs per Mietwagen – ideal für Tagesausflüge und Hidden Gems.",
-        "averageSpeedKmh": 75,
-        "carbonPerKm": 0.192,
-    },
-    "bus": {
-        "label": "Fernbus",
-        "color": "#ffd35b",
-        "dashArray": "8 6",
-        "icon": "🚌",
-        "description": "Komfortable Langstreckenbusse mit Liegesitzen und WLAN.",
-        "averageSpeedKmh": 60,
-        "carbonPerKm": 0.05,
-    },
-    "flight": {
-        "label": "Flug",
-        "color": "#c792ea",
-        "dashArray": "4 6",
-        "icon": "✈️",
-        "description": "Inlandsflüge überbrücken große Distanzen in kurzer Zeit.",
-        "averageSpeedKmh": 740,
-        "carbonPerKm": 0.285,
-    },
-    "walk": {
-        "label": "Zu Fuß",
-        "color": "#8affc1",
-        "dashArray": "2 6",
-        "icon": "🥾",
-        "description": "Entspannt zu Fuß oder per Trekking unterwegs.",
-        "averageSpeedKmh": 4,
-        "carbonPerKm": 0.0,
-    },
-    "ferry": {
-        "label": "Fähre",
-        "color": "#66d9ef",
-        "dashArray": "1 4",
-        "icon": "⛴️",
-        "description": "Fähren verbinden Inseln und Festland mit Panoramablicken.",
-        "averageSpeedKmh": 30,
-        "carbonPerKm": 0.18,
-    },
-}
-
-CARBON_FACTORS = {mode: cfg["carbonPerKm"] for mode, cfg in TRANSPORT_MODES.items()}
-
-TAG_LIBRARY = [
-    {"id": "culture", "label": "Kultur"},
-    {"id": "nature", "label": "Natur"},
-    {"id": "wine", "label": "Wein"},
-    {"id": "budget", "label": "Budget"},
-    {"id": "honeymoon", "label": "Honeymoon"},
-    {"id": "adventure", "label": "Abenteuer"},
-    {"id": "photography", "label": "Fotografie"},
-    {"id": "food", "label": "Food"},
-]
-
-GALLERY = [
-    {
-        "id": "atacama",
-        "title": "Valle de la Luna",
-        "caption": "Mondlandschaft bei goldenem Licht",
-        "image": "https://images.unsplash.com/photo-1595981267035-7b6b9c4f0a8a?q=80&w=600&auto=format&fit=crop",
-        "source": "Unsplash",
-        "sourceUrl": "https://unsplash.com/photos/Valle-de-la-Luna",
-        "credit": "Diego Jimenez",
-        "license": "Unsplash License",
-    },
-    {
-        "id": "torres",
-        "title": "Torres del Paine",
-        "caption": "Morgendämmerung am Base de las Torres Trail",
-        "image": "https://images.unsplash.com/photo-1544989164-31dc3c645987?q=80&w=600&auto=format&fit=crop",
-        "source": "Unsplash",
-        "sourceUrl": "https://unsplash.com/photos/torres-del-paine",
-        "credit": "Jonatan Pie",
-        "license": "Unsplash License",
-    },
-    {
-        "id": "valparaiso",
-        "title": "Streetart Valparaíso",
-        "caption": "Bunte Murals in den Cerros",
-        "image": "https://images.unsplash.com/photo-1558981800-ec0bd3b4f3fd?q=80&w=600&auto=format&fit=crop",
-        "source": "Unsplash",
-        "sourceUrl": "https://unsplash.com/photos/valparaiso",
-        "credit": "Liam Gant",
-        "license": "Unsplash License",
-    },
-    {
-        "id": "rapa-nui",
-        "title": "Ahu Tongariki",
-        "caption": "Moai im Morgenlicht",
-        "image": "https://images.unsplash.com/photo-1589735552861-4d7e34fdf2c1?q=80&w=600&auto=format&fit=crop",
-        "source": "Unsplash",
-        "sourceUrl": "https://unsplash.com/photos/moai",
-        "credit": "Thomas Griggs",
-        "license": "Unsplash License",
-    },
-]
-
-EVENTS = [
-    {
-        "id": "santiago-a-mil",
-        "title": "Santiago a Mil Festival",
-        "date": "03.–21. Januar",
-        "location": "Santiago de Chile",
-        "coordinates": [-33.45, -70.67],
-        "website": "https://www.santiagoamil.cl/",
-        "description": "Das größte Theaterfestival Lateinamerikas mit Performances im gesamten Stadtgebiet.",
-    },
-    {
-        "id": "providencia-jazz",
-        "title": "Providencia Jazz",
-        "date": "Mitte Januar",
-        "location": "Parque de las Esculturas, Santiago",
-        "coordinates": [-33.41, -70.61],
-        "website": "https://www.providencia.cl/",
-        "description": "Kostenloses Open-Air-Jazzfestival direkt am Mapocho-Fluss.",
-    },
-    {
-        "id": "chiloe-feria",
-        "title": "Ferias Costumbristas",
-        "date": "Januar",
-        "location": "Chiloé Inseln",
-        "coordinates": [-42.48, -73.76],
-        "website": "https://www.chiloe.travel/",
-        "description": "Regionale Märkte mit Meeresfrüchten, Holzschnitzkunst und Live-Musik.",
-    },
-]
-
-TEMPLATES = {
-    "blankRoute": {
-        "id": "custom-blank",
-        "name": "Neue Route",
-        "color": "#5bd1ff",
-        "tags": [],
-        "summary": "Starte mit einer leeren Leinwand und füge nach und nach Stopps, Flüge und Kosten hinzu.",
-        "meta": {
-            "theme": "Individuell",
-            "pace": "flexibel",
-            "durationDays": 7,
-            "costEstimate": 0,
-            "highlights": [],
-            "scores": {"budget": 3, "adventure": 3, "relax": 3, "culture": 3},
-        },
-        "stops": [],
-        "segments": [],
-        "flights": [],
-        "lodging": [],
-        "food": [],
-        "activities": [],
-        "notes": "",
-    }
-}
-
-STOPS: dict[str, dict] = {
-    "scl-airport": {
-        "id": "scl-airport",
-        "name": "Santiago International Airport (SCL)",
-        "type": "airport",
-        "coordinates": {"lat": -33.3929, "lng": -70.7858},
-        "city": "Santiago",
-        "address": {
-            "street": "Armando Cortínez Norte 1701",
-            "city": "Pudahuel",
-            "country": "Chile",
-        },
-        "website": "https://www.nuevopudahuel.cl",
-        "contact": {"phone": "+56 2 2690 1707"},
-        "openingHours": "24/7",
-        "popularFor": ["Internationaler Hub", "Duty-free Einkauf"],
-        "tips": [
-            "Online-Check-in spart Wartezeit.",
-            "TurBus und Centropuerto fahren alle 20 Minuten ins Zentrum.",
-        ],
-    },
-    "terminal-alameda": {
-        "id": "terminal-alameda",
-        "name": "Terminal Alameda",
-        "type": "bus",
-        "coordinates": {"lat": -33.4576, "lng": -70.6621},
-        "city": "Santiago",
-        "address": {
-            "street": "Av. Libertador Bernardo O'Higgins 3850",
-            "city": "Estación Central",
-            "country": "Chile",
-        },
-        "openingHours": "05:00–23:30",
-        "website": "https://www.turbus.cl",
-        "popularFor": ["Fernbusse Richtung Küste & Süden"],
-        "tips": ["Ticket vorab in der App sichern, um Wartezeiten zu vermeiden."],
-    },
-    "valparaiso-center": {
-        "id": "valparaiso-center",
-        "name": "Valparaíso – Cerro Alegre",
-        "type": "poi",
-        "coordinates": {"lat": -33.0458, "lng": -71.6197},
-        "city": "Valparaíso",
-        "address": {
-            "street": "Pasaje Gálvez",
-            "city": "Valparaíso",
-            "country": "Chile",
-        },
-        "openingHours": "Immer offen",
-        "popularFor": ["Streetart", "Aufzüge", "Cafés"],
-        "tips": ["Free-Walking-Tour um 10:00 Uhr am Plaza Sotomayor."],
-    },
-    "vina-del-mar": {
-        "id": "vina-del-mar",
-        "name": "Viña del Mar – Playa Acapulco",
-        "type": "beach",
-        "coordinates": {"lat": -33.0153, "lng": -71.55},
-        "city": "Viña del Mar",
-        "popularFor": ["Strandtage", "Sonnenuntergänge"],
-        "tips": ["Windjacke einpacken, der Humboldtstrom kühlt die Luft."],
-    },
-    "ipc-airport": {
-        "id": "ipc-airport",
-        "name": "Mataveri International Airport (IPC)",
-        "type": "airport",
-        "coordinates": {"lat": -27.1648, "lng": -109.4216},
-        "city": "Hanga Roa",
-        "openingHours": "06:00–22:00",
-        "website": "https://www.deachile.cl/aeropuerto-rapa-nui",
-    },
-    "hanga-roa-lodge": {
-        "id": "hanga-roa-lodge",
-        "name": "Hanga Roa Eco Lodge",
-        "type": "hotel",
-        "coordinates": {"lat": -27.15, "lng": -109.428},
-        "address": {
-            "street": "Av. Pont s/n",
-            "city": "Hanga Roa",
-            "country": "Chile",
-        },
-        "website": "https://www.hangaroa.cl",
-        "openingHours": "Check-in ab 15:00",
-        "popularFor": ["Bungalows", "Spa"],
-    },
-    "rano-raraku": {
-        "id": "rano-raraku",
-        "name": "Rano Raraku Vulkan",
-        "type": "trail",
-        "coordinates": {"lat": -27.1251, "lng": -109.2798},
-        "openingHours": "09:00–18:00",
-        "website": "https://www.gob.cl/rapanui",
-        "tips": ["Sonnenhut & Wasser mitnehmen."],
-    },
-    "cjc-airport": {
-        "id": "cjc-airport",
-        "name": "Calama Airport (CJC)",
-        "type": "airport",
-        "coordinates": {"lat": -22.4989, "lng": -68.903},
-        "openingHours": "05:00–23:00",
-    },
-    "san-pedro": {
-        "id": "san-pedro",
-        "name": "San Pedro de Atacama",
-        "type": "town",
-        "coordinates": {"lat": -22.911, "lng": -68.203},
-        "popularFor": ["Touren ins Valle de la Luna", "Geysire del Tatio"],
-        "tips": ["Tourtickets mindestens einen Tag vorher sichern."],
-    },
-    "valle-luna": {
-        "id": "valle-luna",
-        "name": "Valle de la Luna",
-        "type": "trail",
-        "coordinates": {"lat": -23.071, "lng": -68.308},
-        "openingHours": "09:00–17:00",
-    },
-    "pichilemu": {
-        "id": "pichilemu",
-        "name": "Pichilemu Zentrum",
-        "type": "town",
-        "coordinates": {"lat": -34.3866, "lng": -72.0062},
-        "popularFor": ["Surfen", "Strandcafés"],
-    },
-    "punta-lobos": {
-        "id": "punta-lobos",
-        "name": "Punta de Lobos",
-        "type": "trail",
-        "coordinates": {"lat": -34.4028, "lng": -72.0279},
-        "popularFor": ["Wellenreiten", "Aussichtspunkt"],
-    },
-    "santiago-center": {
-        "id": "santiago-center",
-        "name": "Santiago – Barrio Lastarria",
-        "type": "poi",
-        "coordinates": {"lat": -33.439, "lng": -70.644},
-        "popularFor": ["Museen", "Food Market"],
-    },
-    "punta-arenas-airport": {
-        "id": "punta-arenas-airport",
-        "name": "Punta Arenas Airport (PUQ)",
-        "type": "airport",
-        "coordinates": {"lat": -53.1351, "lng": -70.8786},
-    },
-    "puerto-natales": {
-        "id": "puerto-natales",
-        "name": "Puerto Natales",
-        "type": "town",
-        "coordinates": {"lat": -51.7245, "lng": -72.5079},
-    },
-    "torres-base": {
-        "id": "torres-base",
-        "name": "Torres del Paine – Base Torres",
-        "type": "trail",
-        "coordinates": {"lat": -50.9741, "lng": -72.8472},
-        "openingHours": "06:00–20:00",
-    },
-    "pucon": {
-        "id": "pucon",
-        "name": "Pucón – Huerquehue Trailhead",
-        "type": "trail",
-        "coordinates": {"lat": -39.165, "lng": -71.708},
-    },
-    "puerto-varas": {
-        "id": "puerto-varas",
-        "name": "Puerto Varas",
-        "type": "town",
-        "coordinates": {"lat": -41.318, "lng": -72.983},
-    },
-    "castro": {
-        "id": "castro",
-        "name": "Castro – Palafitos",
-        "type": "poi",
-        "coordinates": {"lat": -42.481, "lng": -73.762},
-    },
-    "puerto-montt-airport": {
-        "id": "puerto-montt-airport",
-        "name": "Puerto Montt Airport (PMC)",
-        "type": "airport",
-        "coordinates": {"lat": -41.4389, "lng": -73.0939},
-    },
-    "la-serena": {
-        "id": "la-serena",
-        "name": "La Serena",
-        "type": "town",
-        "coordinates": {"lat": -29.904, "lng": -71.2489},
-    },
-    "vicuna": {
-        "id": "vicuna",
-        "name": "Vicuña",
-        "type": "town",
-        "coordinates": {"lat": -30.0319, "lng": -70.7081},
-    },
-    "antofagasta": {
-        "id": "antofagasta",
-        "name": "Antofagasta – Hand des Desierto",
-        "type": "poi",
-        "coordinates": {"lat": -24.1589, "lng": -70.1614},
-    },
-    "santa-cruz": {
-        "id": "santa-cruz",
-        "name": "Santa Cruz – Colchagua",
-        "type": "town",
-        "coordinates": {"lat": -34.6394, "lng": -71.3657},
-    },
-    "talca": {
-        "id": "talca",
-        "name": "Talca – Altos de Lircay",
-        "type": "trail",
-        "coordinates": {"lat": -35.596, "lng": -71.043},
-    },
-    "concepcion": {
-        "id": "concepcion",
-        "name": "Concepción – Mercado Central",
-        "type": "food",
-        "coordinates": {"lat": -36.828, "lng": -73.051},
-    },
-    "colchagua-lodge": {
-        "id": "colchagua-lodge",
-        "name": "Colchagua Weinlodge",
-        "type": "hotel",
-        "coordinates": {"lat": -34.6394, "lng": -71.3657},
-    },
-    "cajon-maipo": {
-        "id": "cajon-maipo",
-        "name": "Cajón del Maipo – Thermen",
-        "type": "trail",
-        "coordinates": {"lat": -33.65, "lng": -70.17},
-    },
-    "san-pedro-boutique": {
-        "id": "san-pedro-boutique",
-        "name": "San Pedro Boutiquehotel",
-        "type": "hotel",
-        "coordinates": {"lat": -22.914, "lng": -68.203},
-    },
-    "torres-ecocamp": {
-        "id": "torres-ecocamp",
-        "name": "EcoCamp Patagonia",
-        "type": "hotel",
-        "coordinates": {"lat": -51.1086, "lng": -72.9996},
-    },
-}
-
-STOP_ENRICHMENTS = {
-    "scl-airport": {
-        "description": "Hauptdrehscheibe Chiles mit direkter Metro-Busanbindung und modernem Terminal 2.",
-        "timezone": "America/Santiago",
-        "category": ["Airport", "Transport"],
-        "rating": 4.3,
-        "reviewCount": 18942,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1505843513577-22bb7d21e455?w=600&auto=format&fit=crop",
-                "caption": "Check-in Halle des SCL Flughafens",
-                "credit": "Daniel Vargas",
-                "license": "Unsplash License",
-            }
-        ],
-        "contact": {
-            "email": "info@nuevopudahuel.cl",
-            "instagram": "https://www.instagram.com/aeropuertodesantiago/",
-        },
-        "services": {
-            "transport": ["Centropuerto Shuttle", "TurBus", "Cabify Pick-up"],
-            "amenities": ["Kostenloses WLAN", "VIP-Lounges", "Duschen"],
-        },
-        "knowledge": {
-            "bestTime": "Check-in spätestens 2 Stunden vor Abflug, internationale Flüge 3 Stunden.",
-            "security": "Sicherheitskontrollen liegen im zweiten Stock, Flüssigkeiten max. 100 ml.",
-        },
-    },
-    "terminal-alameda": {
-        "description": "Größter Fernbusbahnhof Santiagos mit Shops, Gepäckaufbewahrung und 24/7-Kiosken.",
-        "timezone": "America/Santiago",
-        "category": ["Bus Station"],
-        "rating": 3.9,
-        "reviewCount": 14210,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1489515217757-5fd1be406fef?w=600&auto=format&fit=crop",
-                "caption": "Abfahrtsbereich Terminal Alameda",
-                "credit": "Alejandro Barba",
-                "license": "Unsplash License",
-            }
-        ],
-        "contact": {
-            "phone": "+56 2 2582 0000",
-            "email": "atencion@turbus.cl",
-        },
-        "services": {
-            "transport": ["TurBus", "Pullman", "Condor Bus"],
-            "amenities": ["Schließfächer", "Wi-Fi Hotspots", "Geldautomaten"],
-        },
-        "knowledge": {
-            "bestTime": "Späten Nachmittag meiden – Rush Hour. Tickets digital bereithalten.",
-        },
-    },
-    "valparaiso-center": {
-        "description": "Historische Hügel mit Straßenkunst, Boutiquen und Aussicht auf die Bucht.",
-        "timezone": "America/Santiago",
-        "category": ["Historic Quarter", "Viewpoint"],
-        "rating": 4.7,
-        "reviewCount": 25678,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1526402462922-1e1d481d87fd?w=600&auto=format&fit=crop",
-                "caption": "Bunte Häuser im Cerro Alegre",
-                "credit": "Fabiola Peñailillo",
-                "license": "Unsplash License",
-            }
-        ],
-        "contact": {
-            "instagram": "https://www.instagram.com/visitvalparaiso/",
-        },
-        "services": {
-            "transport": ["Ascensor El Peral", "Trolebus"],
-            "amenities": ["Galerien", "Cafés", "Aussichtsplattformen"],
-        },
-        "knowledge": {
-            "bestTime": "Frühmorgens für Fotos ohne Menschenmengen.",
-            "safety": "Nachts in Gruppen unterwegs sein, da Kopfsteinpflaster rutschig werden kann.",
-        },
-    },
-    "vina-del-mar": {
-        "description": "Beliebter Stadtstrand mit Promenade, Sonnenuntergangs- und Surfspots.",
-        "timezone": "America/Santiago",
-        "category": ["Beach"],
-        "rating": 4.5,
-        "reviewCount": 18650,
-        "address": {
-            "street": "Av. San Martín 200",
-            "city": "Viña del Mar",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1526401485004-46910ecc8e51?w=600&auto=format&fit=crop",
-                "caption": "Strandpromenade von Viña del Mar",
-                "credit": "Ricardo Gomez",
-                "license": "Unsplash License",
-            }
-        ],
-        "services": {
-            "amenities": ["Liegenverleih", "Lifeguards", "Beachvolleyball"],
-        },
-        "knowledge": {
-            "bestTime": "Sonnenuntergang gegen 20:45 Uhr im Januar.",
-        },
-    },
-    "ipc-airport": {
-        "description": "Abgeschiedener Insel-Airport auf Rapa Nui mit einer der längsten Pisten im Pazifik.",
-        "timezone": "Pacific/Easter",
-        "category": ["Airport", "Island"],
-        "rating": 4.4,
-        "reviewCount": 4120,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1533929736458-ca588d08c8be?w=600&auto=format&fit=crop",
-                "caption": "Anflug auf Rapa Nui",
-                "credit": "Colton Jones",
-                "license": "Unsplash License",
-            }
-        ],
-        "contact": {
-            "phone": "+56 32 210 0255",
-            "instagram": "https://www.instagram.com/rapanuitravel/",
-        },
-        "services": {
-            "transport": ["Taxi Collectivo", "Hotel-Shuttle"],
-            "amenities": ["Souvenirshops", "Tourdesk"],
-        },
-    },
-    "hanga-roa-lodge": {
-        "description": "Boutique-Lodge mit Meerblick, Spa und nachhaltigem Fokus im Herzen von Hanga Roa.",
-        "timezone": "Pacific/Easter",
-        "category": ["Hotel", "Wellness"],
-        "rating": 4.8,
-        "reviewCount": 985,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1496417263034-38ec4f0b665a?w=600&auto=format&fit=crop",
-                "caption": "Außenpool der Eco Lodge",
-                "credit": "Taryn Elliott",
-                "license": "Unsplash License",
-            }
-        ],
-        "contact": {
-            "phone": "+56 32 210 1120",
-            "email": "reservas@hangaroa.cl",
-        },
-        "services": {
-            "amenities": ["Spa", "Restaurant", "Bike-Verleih"],
-            "booking": "https://www.hangaroa.cl",
-        },
-    },
-    "rano-raraku": {
-        "description": "Vulkanischer Steinbruch, aus dem die Moai gefertigt wurden – UNESCO-Weltkulturerbe.",
-        "timezone": "Pacific/Easter",
-        "category": ["Archaeological Site"],
-        "rating": 4.9,
-        "reviewCount": 12650,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1516959512124-903c2e1f4f99?w=600&auto=format&fit=crop",
-                "caption": "Moai am Rano Raraku",
-                "credit": "Marcelo Cidrack",
-                "license": "Unsplash License",
-            }
-        ],
-        "knowledge": {
-            "bestTime": "Kurz vor Schließung für warmes Licht und weniger Besucher.",
-            "tickets": "Nationalparkpass online kaufen und Personalausweis mitführen.",
-        },
-    },
-    "cjc-airport": {
-        "description": "Tor zur Atacama – kompakter Flughafen mit schnellen Shuttle-Verbindungen nach San Pedro.",
-        "timezone": "America/Santiago",
-        "category": ["Airport"],
-        "rating": 4.1,
-        "reviewCount": 8230,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1502920917128-1aa500764b43?w=600&auto=format&fit=crop",
-                "caption": "Terminalgebäude in Calama",
-                "credit": "Rafael Lopez",
-                "license": "Unsplash License",
-            }
-        ],
-        "contact": {
-            "phone": "+56 55 273 1400",
-        },
-        "services": {
-            "transport": ["Shuttle Transvip", "Car-Rental"],
-            "amenities": ["Cafés", "ATM"],
-        },
-    },
-    "san-pedro": {
-        "description": "Wüstenoase mit Adobe-Häusern, Observatorien und Ausgangspunkt für Atacama-Exkursionen.",
-        "timezone": "America/Santiago",
-        "category": ["Town", "Gateway"],
-        "rating": 4.6,
-        "reviewCount": 17890,
-        "address": {
-            "street": "Caracoles 360",
-            "city": "San Pedro de Atacama",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1500530855697-b586d89ba3ee?w=600&auto=format&fit=crop",
-                "caption": "Adobe-Gassen in San Pedro",
-                "credit": "Felipe Pizarro",
-                "license": "Unsplash License",
-            }
-        ],
-        "contact": {
-            "instagram": "https://www.instagram.com/sanpedrochile/",
-        },
-        "services": {
-            "amenities": ["Tourbüros", "Bike-Verleih", "Apotheken"],
-        },
-    },
-    "valle-luna": {
-        "description": "Mondlandschaft im Reserva Nacional Los Flamencos mit Dünen und Salzformationen.",
-        "timezone": "America/Santiago",
-        "category": ["Nature Reserve"],
-        "rating": 4.8,
-        "reviewCount": 20110,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1519681393784-d120267933ba?w=600&auto=format&fit=crop",
-                "caption": "Sanddünen im Valle de la Luna",
-                "credit": "Pablo Garcia",
-                "license": "Unsplash License",
-            }
-        ],
-        "knowledge": {
-            "bestTime": "Sunset Slots begrenzt – Ticket vorab sichern.",
-            "gear": "Windjacke und Stirnlampe für späten Rückweg einpacken.",
-        },
-    },
-    "pichilemu": {
-        "description": "Chiles Surf-Hauptstadt mit entspannter Atmosphäre, Hostels und Craft-Coffee.",
-        "timezone": "America/Santiago",
-        "category": ["Surf Town"],
-        "rating": 4.6,
-        "reviewCount": 13620,
-        "address": {
-            "street": "Avenida Ortúzar 151",
-            "city": "Pichilemu",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1526481280695-3c469928b67b?w=600&auto=format&fit=crop",
-                "caption": "Boardwalk in Pichilemu",
-                "credit": "Matías Silva",
-                "license": "Unsplash License",
-            }
-        ],
-        "services": {
-            "amenities": ["Surfshops", "Yoga Studios", "Coworking"],
-        },
-    },
-    "punta-lobos": {
-        "description": "Legendärer Point Break südlich von Pichilemu mit Aussichtsklippen.",
-        "timezone": "America/Santiago",
-        "category": ["Surf Spot", "Viewpoint"],
-        "rating": 4.9,
-        "reviewCount": 8450,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1470246973918-29a93221c455?w=600&auto=format&fit=crop",
-                "caption": "Wellen am Punta de Lobos",
-                "credit": "Alexandre Pellaes",
-                "license": "Unsplash License",
-            }
-        ],
-        "knowledge": {
-            "bestTime": "Beste Sets im südlichen Winter; im Januar morgens wenig Wind.",
-            "safety": "Abstieg zu den Felsen nur mit festen Schuhen.",
-        },
-    },
-    "santiago-center": {
-        "description": "Kulturviertel Lastarria mit Museen, Bars und dem GAM Kulturzentrum.",
-        "timezone": "America/Santiago",
-        "category": ["Neighborhood", "Culture"],
-        "rating": 4.7,
-        "reviewCount": 30100,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1544984243-ec57ea16fe25?w=600&auto=format&fit=crop",
-                "caption": "Abendstimmung im Barrio Lastarria",
-                "credit": "Sebastian Sarria",
-                "license": "Unsplash License",
-            }
-        ],
-        "contact": {
-            "instagram": "https://www.instagram.com/lastarria_santiago/",
-        },
-        "services": {
-            "amenities": ["Museo de Bellas Artes", "Mercado Lastarria", "E-Bike Sharing"],
-        },
-    },
-    "punta-arenas-airport": {
-        "description": "Flughafen von Patagonien mit eigenem Pinguin-Souvenirshop und Mietwagenzentrum.",
-        "timezone": "America/Punta_Arenas",
-        "category": ["Airport", "Patagonia"],
-        "rating": 4.2,
-        "reviewCount": 5630,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1534447677768-be436bb09401?w=600&auto=format&fit=crop",
-                "caption": "Ankunft in Punta Arenas",
-                "credit": "Rodrigo Gomez",
-                "license": "Unsplash License",
-            }
-        ],
-        "services": {
-            "transport": ["Bus Sur", "Transfer Australis"],
-            "amenities": ["Duty Free", "Snack Bars"],
-        },
-    },
-    "puerto-natales": {
-        "description": "Kleines Hafenstädtchen mit Fjordblick, Ausgangspunkt für Torres del Paine.",
-        "timezone": "America/Punta_Arenas",
-        "category": ["Town", "Gateway"],
-        "rating": 4.6,
-        "reviewCount": 11200,
-        "address": {
-            "street": "Pedro Montt 189",
-            "city": "Puerto Natales",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1526403222653-0e2d61b4a427?w=600&auto=format&fit=crop",
-                "caption": "Uferpromenade Puerto Natales",
-                "credit": "Marcos Beresovsky",
-                "license": "Unsplash License",
-            }
-        ],
-        "services": {
-            "amenities": ["Outdoor Gear Shops", "Craft Beer Bars"],
-        },
-    },
-    "torres-base": {
-        "description": "Legendärer Aussichtspunkt in Torres del Paine nach steilem Tagesmarsch.",
-        "timezone": "America/Punta_Arenas",
-        "category": ["Trail", "National Park"],
-        "rating": 5.0,
-        "reviewCount": 15420,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1528892952291-009c663ce843?w=600&auto=format&fit=crop",
-                "caption": "Laguna am Base de las Torres",
-                "credit": "Diego Jimenez",
-                "license": "Unsplash License",
-            }
-        ],
-        "knowledge": {
-            "gear": "Trekkingstöcke und Regenjacke obligatorisch – Wetterumschwünge häufig.",
-            "permits": "Parkeintritt vorab online bezahlen, Ticket bei Laguna Amarga vorzeigen.",
-        },
-    },
-    "pucon": {
-        "description": "Abenteuer-Hub am Vulkan Villarrica mit Thermalquellen und Outdoor-Angebot.",
-        "timezone": "America/Santiago",
-        "category": ["Adventure Town"],
-        "rating": 4.7,
-        "reviewCount": 14880,
-        "address": {
-            "street": "Calle Fresia 223",
-            "city": "Pucón",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1519681393784-d120267933ba?w=600&auto=format&fit=crop",
-                "caption": "Blick auf den Villarrica",
-                "credit": "Andrés Darricau",
-                "license": "Unsplash License",
-            }
-        ],
-        "services": {
-            "amenities": ["Thermalbäder", "Klettershops", "Craft Cafés"],
-        },
-    },
-    "puerto-varas": {
-        "description": "See-Städtchen mit deutschem Erbe, Blick auf Osorno und zahlreiche Cafés.",
-        "timezone": "America/Santiago",
-        "category": ["Lake Town", "Culture"],
-        "rating": 4.8,
-        "reviewCount": 19300,
-        "address": {
-            "street": "Del Salvador 219",
-            "city": "Puerto Varas",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1516741535768-20da1914e42e?w=600&auto=format&fit=crop",
-                "caption": "Puerto Varas Uferpromenade",
-                "credit": "Camila Gutiérrez",
-                "license": "Unsplash License",
-            }
-        ],
-        "services": {
-            "amenities": ["Seepromenade", "Craft-Bier", "Bäckereien"],
-        },
-    },
-    "castro": {
-        "description": "Hauptstadt Chiloés mit berühmten Pfahlbauten, Märkten und Holzkirchen.",
-        "timezone": "America/Santiago",
-        "category": ["Heritage", "Harbor"],
-        "rating": 4.6,
-        "reviewCount": 12100,
-        "address": {
-            "street": "Pedro Montt 51",
-            "city": "Castro",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1614636268922-9c65b11472ed?w=600&auto=format&fit=crop",
-                "caption": "Palafitos in Castro",
-                "credit": "Johan Mouchet",
-                "license": "Unsplash License",
-            }
-        ],
-        "services": {
-            "amenities": ["Fischmärkte", "Bootstouren", "Kunsthandwerk"],
-        },
-    },
-    "puerto-montt-airport": {
-        "description": "Regionalflughafen für die Seenregion mit schnellen Check-ins und Mietwagencenter.",
-        "timezone": "America/Santiago",
-        "category": ["Airport"],
-        "rating": 4.1,
-        "reviewCount": 6380,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1479077315426-5f1a0c4e6b76?w=600&auto=format&fit=crop",
-                "caption": "Anflug auf Puerto Montt",
-                "credit": "Hernan Pablo",
-                "license": "Unsplash License",
-            }
-        ],
-        "services": {
-            "transport": ["Transfer Delfín", "Taxi Oficial"],
-        },
-    },
-    "la-serena": {
-        "description": "Koloniale Stadt mit Stränden und Ausgangspunkt für das Elqui-Tal.",
-        "timezone": "America/Santiago",
-        "category": ["City", "Beach"],
-        "rating": 4.4,
-        "reviewCount": 15210,
-        "address": {
-            "street": "Prat 350",
-            "city": "La Serena",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1534447677768-be436bb09401?w=600&auto=format&fit=crop",
-                "caption": "Kathedrale von La Serena",
-                "credit": "Claudio Tuma",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "vicuna": {
-        "description": "Charmantes Pisco-Städtchen im Elqui-Tal mit Observatorien.",
-        "timezone": "America/Santiago",
-        "category": ["Wine", "Stargazing"],
-        "rating": 4.5,
-        "reviewCount": 8420,
-        "address": {
-            "street": "Gabriela Mistral 181",
-            "city": "Vicuña",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1534447677768-be436bb09401?w=600&auto=format&fit=crop",
-                "caption": "Sternwarte nahe Vicuña",
-                "credit": "Jorge Barahona",
-                "license": "Unsplash License",
-            }
-        ],
-        "knowledge": {
-            "bestTime": "Klares Beobachtungsfenster Mai–November, im Januar trotzdem gute Bedingungen.",
-        },
-    },
-    "antofagasta": {
-        "description": "Skulptur ""La Mano del Desierto"" mitten in der Atacama – ikonischer Fotostopp.",
-        "timezone": "America/Santiago",
-        "category": ["Sculpture", "Roadside"],
-        "rating": 4.6,
-        "reviewCount": 9620,
-        "address": {
-            "street": "Ruta 5 Norte km 75",
-            "city": "Antofagasta",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1582719478250-c89cae4dc85b?w=600&auto=format&fit=crop",
-                "caption": "Hand des Desierto",
-                "credit": "Felix Mittermeier",
-                "license": "Unsplash License",
-            }
-        ],
-        "knowledge": {
-            "bestTime": "Am besten frühmorgens für Schattenwurf und geringeren Verkehr.",
-        },
-    },
-    "santa-cruz": {
-        "description": "Weinstadt im Colchagua-Tal mit Museen, Seilbahn und Spitzenweingütern.",
-        "timezone": "America/Santiago",
-        "category": ["Wine", "Town"],
-        "rating": 4.5,
-        "reviewCount": 7450,
-        "address": {
-            "street": "Plaza de Armas",
-            "city": "Santa Cruz",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1517248135467-4c7edcad34c4?w=600&auto=format&fit=crop",
-                "caption": "Weinberge in Colchagua",
-                "credit": "Thomas Schaefer",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "talca": {
-        "description": "Tor zum Reserva Nacional Altos de Lircay – Wanderparadies mit Araukarien.",
-        "timezone": "America/Santiago",
-        "category": ["Trail", "Nature"],
-        "rating": 4.6,
-        "reviewCount": 5210,
-        "address": {
-            "street": "Camino Pehuenche km 37",
-            "city": "Talca",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1458224755287-281747167c72?w=600&auto=format&fit=crop",
-                "caption": "Wälder Altos de Lircay",
-                "credit": "Constanza Hevia",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "concepcion": {
-        "description": "Universitätsstadt mit Streetfood-Markt, Jazzszene und nächtlichem Leben.",
-        "timezone": "America/Santiago",
-        "category": ["City", "Food"],
-        "rating": 4.3,
-        "reviewCount": 11800,
-        "address": {
-            "street": "Aníbal Pinto 65",
-            "city": "Concepción",
-            "country": "Chile",
-        },
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1512058564366-c9e1d31714af?w=600&auto=format&fit=crop",
-                "caption": "Mercado in Concepción",
-                "credit": "Eduardo Casajús",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "colchagua-lodge": {
-        "description": "Boutique-Lodge zwischen Weinbergen mit Spa und Degustationsmenüs.",
-        "timezone": "America/Santiago",
-        "category": ["Hotel", "Wine"],
-        "rating": 4.9,
-        "reviewCount": 620,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1496412705862-e0088f16f791?w=600&auto=format&fit=crop",
-                "caption": "Infinity-Pool mit Blick auf Weinberge",
-                "credit": "Glen Carrie",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "cajon-maipo": {
-        "description": "Anden-Canyon mit Thermalquellen, Hängebrücken und Sternenhimmel.",
-        "timezone": "America/Santiago",
-        "category": ["Nature", "Wellness"],
-        "rating": 4.7,
-        "reviewCount": 13220,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1516366434321-728a48e6b7f1?w=600&auto=format&fit=crop",
-                "caption": "Thermalquellen im Cajón del Maipo",
-                "credit": "Francisca Alvarez",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "san-pedro-boutique": {
-        "description": "Boutique-Hotel mit Adobe-Suiten, Rooftop und Sternengucker-Deck.",
-        "timezone": "America/Santiago",
-        "category": ["Hotel", "Boutique"],
-        "rating": 4.9,
-        "reviewCount": 780,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1505693416388-ac5ce068fe85?w=600&auto=format&fit=crop",
-                "caption": "Suite im Boutiquehotel",
-                "credit": "Ralph (Ravi) Kayden",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "torres-ecocamp": {
-        "description": "Ikonische Geodomes mitten im Torres-del-Paine-Nationalpark.",
-        "timezone": "America/Punta_Arenas",
-        "category": ["Hotel", "Glamping"],
-        "rating": 4.8,
-        "reviewCount": 1340,
-        "photos": [
-            {
-                "url": "https://images.unsplash.com/photo-1500530855697-b586d89ba3ee?w=600&auto=format&fit=crop",
-                "caption": "EcoCamp Dome bei Nacht",
-                "credit": "James Wheeler",
-                "license": "Unsplash License",
-            }
-        ],
-        "services": {
-            "amenities": ["Yoga Dome", "Restaurant", "Private Guides"],
-        },
-    },
-}
-
-for stop_id, enrichment in STOP_ENRICHMENTS.items():
-    deep_merge(STOPS[stop_id], enrichment)
-
-FLIGHT_ENRICHMENTS = {
-    "flight-scl-ipc": {
-        "aircraft": "Boeing 787-9",
-        "cabinClass": "Economy Plus",
-        "baggage": {"carryOn": "8 kg", "checked": "1 x 23 kg inklusive"},
-        "checkIn": "Online-Check-in 48 h vor Abflug, Gepäckabgabe Terminal 2",
-        "fromTerminal": "SCL T2",
-        "toTerminal": "IPC Hauptterminal",
-        "notes": "Fensterplätze links bieten Blick auf die Anden und den Pazifik.",
-        "fareClasses": ["Economy", "Premium Economy", "Business"],
-        "onTimePerformance": "87%", 
-    },
-    "flight-ipc-cjc": {
-        "aircraft": "Airbus A321neo",
-        "cabinClass": "Economy",
-        "baggage": {"carryOn": "10 kg", "checked": "1 x 23 kg"},
-        "checkIn": "Check-in am kleinen Terminal – 90 Minuten vorher genügen.",
-        "fromTerminal": "IPC",
-        "toTerminal": "CJC T1",
-        "notes": "Zwischenlandung in SCL möglich, Snacks an Bord inklusive.",
-        "fareClasses": ["Economy", "Full Flex"],
-        "onTimePerformance": "81%",
-    },
-    "flight-cjc-scl": {
-        "aircraft": "Airbus A320",
-        "cabinClass": "Economy",
-        "baggage": {"carryOn": "8 kg", "checked": "1 x 23 kg"},
-        "checkIn": "Online 24 h vor Abflug, Gate schließt 20 Minuten vor Abflug.",
-        "fromTerminal": "CJC",
-        "toTerminal": "SCL T1",
-        "notes": "Fensterplätze rechts mit Sicht auf die schneebedeckten Anden.",
-        "fareClasses": ["Light", "Plus", "Top"],
-        "onTimePerformance": "90%",
-    },
-    "flight-scl-puq": {
-        "aircraft": "Airbus A321",
-        "cabinClass": "Economy",
-        "baggage": {"carryOn": "8 kg", "checked": "1 x 23 kg"},
-        "checkIn": "Sicherheitskontrolle Terminal 1, Boarding startet 35 Minuten vor Abflug.",
-        "fromTerminal": "SCL T1",
-        "toTerminal": "PUQ",
-        "notes": "Sitz links für Torres-del-Paine-Blicke beim Landeanflug wählen.",
-        "fareClasses": ["Promo", "Plus", "Premium"],
-        "onTimePerformance": "83%",
-    },
-    "flight-puq-cjc": {
-        "aircraft": "Airbus A320neo",
-        "cabinClass": "Economy",
-        "baggage": {"carryOn": "10 kg", "checked": "1 x 23 kg"},
-        "checkIn": "Check-in öffnet 2 h vor Abflug, Transfer zwischen Terminals in SCL beachten.",
-        "fromTerminal": "PUQ",
-        "toTerminal": "CJC",
-        "notes": "Snacks an Bord optional kaufbar, Klimaanlage an Bord kräftig.",
-        "fareClasses": ["Zero", "Plus"],
-        "onTimePerformance": "78%",
-    },
-    "flight-cjc-scl-final": {
-        "aircraft": "Airbus A320",
-        "cabinClass": "Economy",
-        "baggage": {"carryOn": "8 kg", "checked": "1 x 23 kg"},
-        "checkIn": "Self-Bag-Drop verfügbar, Boarding nach Gruppen.",
-        "fromTerminal": "CJC",
-        "toTerminal": "SCL T1",
-        "notes": "Kurzer Flug – Snacks in der Lounge vorher einplanen.",
-        "fareClasses": ["Light", "Plus"],
-        "onTimePerformance": "88%",
-    },
-    "flight-pmc-scl": {
-        "aircraft": "Airbus A320",
-        "cabinClass": "Economy",
-        "baggage": {"carryOn": "8 kg", "checked": "1 x 23 kg"},
-        "checkIn": "Boarding-Gates B3/B4, Sicherheitskontrolle meist zügig.",
-        "fromTerminal": "PMC",
-        "toTerminal": "SCL T1",
-        "notes": "Fensterplätze rechts zeigen die Vulkane Osorno & Calbuco.",
-        "fareClasses": ["Light", "Plus"],
-        "onTimePerformance": "91%",
-    },
-    "flight-scl-calama": {
-        "aircraft": "Airbus A321",
-        "cabinClass": "Economy",
-        "baggage": {"carryOn": "8 kg", "checked": "1 x 23 kg"},
-        "checkIn": "Express-Sicherheitslinie mit Premium-Economy verfügbar.",
-        "fromTerminal": "SCL T1",
-        "toTerminal": "CJC",
-        "notes": "Fensterplätze rechts für Aussicht auf den Atacama-Salar.",
-        "fareClasses": ["Basic", "Plus", "Full"],
-        "onTimePerformance": "85%",
-    },
-    "flight-scl-rapa": {
-        "aircraft": "Boeing 787-9",
-        "cabinClass": "Economy Plus",
-        "baggage": {"carryOn": "8 kg", "checked": "2 x 23 kg"},
-        "checkIn": "Langstreckenbereich Terminal 2, Boarding ab 60 Minuten vor Abflug.",
-        "fromTerminal": "SCL T2",
-        "toTerminal": "IPC",
-        "notes": "Spezielles Rapa-Nui-Menü an Bord, zwei Mahlzeiten inklusive.",
-        "fareClasses": ["Economy", "Premium Business"],
-        "onTimePerformance": "82%",
-    },
-    "flight-scl-cjc-honeymoon": {
-        "aircraft": "Airbus A321",
-        "cabinClass": "Premium Economy",
-        "baggage": {"carryOn": "10 kg", "checked": "2 x 23 kg"},
-        "checkIn": "Priority-Check-in am Premium-Schalter, Loungezugang inklusive.",
-        "fromTerminal": "SCL T1",
-        "toTerminal": "CJC",
-        "notes": "Champagner-Servierung zum Start, Sitzplätze 3A/B reserviert.",
-        "fareClasses": ["Premium", "Full Flex"],
-        "onTimePerformance": "89%",
-    },
-    "flight-cjc-pmc-honeymoon": {
-        "aircraft": "Airbus A320",
-        "cabinClass": "Premium Economy",
-        "baggage": {"carryOn": "10 kg", "checked": "2 x 23 kg"},
-        "checkIn": "Priority Boarding, Lounge in CJC inkludiert.",
-        "fromTerminal": "CJC",
-        "toTerminal": "PMC",
-        "notes": "Fensterplätze links – Blick auf die Küste von Los Lagos.",
-        "fareClasses": ["Premium"],
-        "onTimePerformance": "80%",
-    },
-    "flight-puq-scl-honeymoon": {
-        "aircraft": "Boeing 737-800",
-        "cabinClass": "Premium Economy",
-        "baggage": {"carryOn": "10 kg", "checked": "2 x 23 kg"},
-        "checkIn": "Priority-Schalter in PUQ, Boarding per Jetbridge.",
-        "fromTerminal": "PUQ",
-        "toTerminal": "SCL T1",
-        "notes": "Beim Abflug Blick auf die Magellanstraße.",
-        "fareClasses": ["Premium"],
-        "onTimePerformance": "86%",
-    },
-}
-
-SEGMENT_MODE_DEFAULTS = {
-    "bus": {
-        "operator": "Fernbus", 
-        "frequency": "stündlich",
-        "bookingUrl": "https://www.recorrido.cl",
-        "luggagePolicy": "2 x 23 kg im Gepäckraum + Handgepäck",
-        "seatInfo": "Semi-Cama Sitze mit USB und Heizung",
-    },
-    "drive": {
-        "operator": "Selbstfahrer",
-        "frequency": "flexibel",
-        "bookingUrl": "https://www.kayak.com/cars",
-        "recommendedVehicle": "SUV oder Mittelklasse",
-        "tollInfo": "Maut via TAG-Pass oder Barzahlung, Tankstellen alle 80 km",
-    },
-    "flight": {
-        "operator": "Inlandsflug",
-        "frequency": "täglich",
-        "bookingUrl": "https://www.latamairlines.com/",
-        "seatInfo": "Fensterplätze für Landschaftsblick empfohlen",
-    },
-    "walk": {
-        "operator": "Zu Fuß",
-        "frequency": "frei planbar",
-        "bookingUrl": None,
-        "recommendedGear": "Bequeme Wanderschuhe, Sonnen- und Windschutz",
-    },
-    "ferry": {
-        "operator": "Naviera Austral",
-        "frequency": "2-3 x täglich",
-        "bookingUrl": "https://www.navieraustral.cl",
-        "seatInfo": "Innen- und Außendecks, Café an Bord",
-    },
+# Datentabellen liegen als JSON in ``tables/`` (siehe ``data_tables.py``) und
+# werden erst beim ersten Zugriff geladen. ``build_data.STOPS`` usw. funktionieren
+# weiterhin; Zuweisungen (z. B. im Benchmark) ersetzen eine Tabelle für den Prozess.
+# Kuratierte Varianten (ROUTE_DEFINITIONS): "stops" listet nur Stopp-IDs aus STOPS;
+# erst die Catalog-Stage (siehe ``resolve_route``) setzt die angereicherten Datensätze ein.
+TABLES_DIR = Path(__file__).parent / "tables"
+TABLE_FILES = {
+    "META": "meta.json",
+    "TRANSPORT_MODES": "transport-modes.json",
+    "TAG_LIBRARY": "tag-library.json",
+    "GALLERY": "gallery.json",
+    "EVENTS": "events.json",
+    "TEMPLATES": "templates.json",
+    "STOPS": "stops.json",
+    "STOP_ENRICHMENTS": "stop-enrichments.json",
+    "FLIGHT_ENRICHMENTS": "flight-enrichments.json",
+    "SEGMENT_MODE_DEFAULTS": "segment-defaults.json",
+    "SEGMENT_SPECIFICS": "segment-specifics.json",
+    "LODGING_ENRICHMENTS": "lodging-enrichments.json",
+    "FOOD_ENRICHMENTS": "food-enrichments.json",
+    "ACTIVITY_ENRICHMENTS": "activity-enrichments.json",
+    "ROUTE_DEFINITIONS": "route-definitions.json",
 }
 
-SEGMENT_SPECIFICS = {
-    ("scl-airport", "terminal-alameda", "bus"): {
-        "operator": "Centropuerto Express",
-        "frequency": "alle 10 Minuten",
-        "bookingUrl": "https://www.centropuerto.cl",
-        "notes": "Zahlung mit Bip!-Karte oder Kreditkarte möglich.",
-    },
-    ("terminal-alameda", "valparaiso-center", "bus"): {
-        "operator": "TurBus",
-        "frequency": "alle 15 Minuten",
-        "bookingUrl": "https://www.turbus.cl",
-        "notes": "Einchecken auf Bahnsteig 22, WLAN an Bord.",
-    },
-    ("valparaiso-center", "ipc-airport", "flight"): {
-        "operator": "LATAM",
-        "notes": "Direkter Sonderflug ab SCL – Transfer Valparaíso→SCL inklusive.",
-    },
-    ("ipc-airport", "rano-raraku", "drive"): {
-        "operator": "Hotel Shuttle",
-        "notes": "Unbefestigte Straßen – 4x4 empfohlen.",
-    },
-    ("cjc-airport", "san-pedro", "bus"): {
-        "operator": "Transvip Shuttle",
-        "frequency": "alle 30 Minuten",
-        "notes": "Stopps in allen Hotels möglich, Klimaanlage kräftig.",
-    },
-    ("san-pedro", "valle-luna", "drive"): {
-        "operator": "Geführter Tourvan",
-        "notes": "Eintrittstickets werden vom Guide organisiert.",
-    },
-    ("san-pedro", "pichilemu", "flight"): {
-        "operator": "LATAM + Shuttle",
-        "notes": "Umstieg in SCL, Surfboards können als Sportgepäck aufgegeben werden.",
-    },
-    ("pichilemu", "punta-lobos", "walk"): {
-        "notes": "Küstenweg mit wenig Schatten – Wasser einpacken.",
-    },
-    ("punta-arenas-airport", "puerto-natales", "bus"): {
-        "operator": "Bus Sur",
-        "frequency": "3 x täglich",
-        "notes": "Zwischenstopp in Villa Tehuelches.",
-    },
-    ("puerto-natales", "torres-base", "bus"): {
-        "operator": "Vans Torres",
-        "frequency": "täglich 07:00 & 14:00",
-        "notes": "Ticket enthält Parkeintritt Laguna Amarga nicht – separat kaufen.",
-    },
-    ("punta-arenas-airport", "cjc-airport", "flight"): {
-        "operator": "Sky Airline",
-        "notes": "Sitzplätze mittig mit bester Beinfreiheit (Exit Row).",
-    },
-    ("valparaiso-center", "pichilemu", "drive"): {
-        "notes": "Route via Ruta 66 (Carretera de la Fruta) mit vielen Obstständen.",
-    },
-    ("puerto-varas", "castro", "ferry"): {
-        "operator": "Transbordadora Austral",
-        "notes": "Fähre Pargua–Chacao, Boarding 40 Minuten vorher.",
-    },
-    ("castro", "puerto-montt-airport", "drive"): {
-        "notes": "Panamericana Sur – ausreichend Tankstellen.",
-    },
-    ("santiago-center", "colchagua-lodge", "drive"): {
-        "notes": "Route via Ruta 5 und Ruta I-50, Weinverkostung unterwegs möglich.",
-    },
-    ("santiago-center", "cajon-maipo", "drive"): {
-        "notes": "Schmale Serpentinen – früh starten, um Staus zu vermeiden.",
-    },
-    ("san-pedro-boutique", "puerto-varas", "flight"): {
-        "operator": "Sky Airline",
-        "notes": "Direkter Charter via SCL – Gepäck wird durchgecheckt.",
-    },
-    ("castro", "torres-ecocamp", "flight"): {
-        "operator": "Charter",
-        "notes": "Privatflugzeug mit 12 Sitzen, maximal 15 kg pro Person.",
-    },
-}
 
-LODGING_ENRICHMENTS = {
-    "Hotel Casa Higueras": {
-        "address": "Higuera 133, Valparaíso",
-        "contact": {"phone": "+56 32 249 7900", "email": "reservas@casahigueras.cl"},
-        "amenities": ["Infinity-Pool", "Rooftop-Bar", "Spa"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1489515217757-5fd1be406fef?w=600&auto=format&fit=crop",
-                "caption": "Terrassenblick Hotel Casa Higueras",
-                "credit": "Andres J" ,
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.7,
-        "reviewCount": 1280,
-        "checkInWindow": "15:00–23:00",
-        "checkOutWindow": "bis 12:00",
-        "roomHighlights": ["Meerblick", "Freestanding Bathtub"],
-    },
-    "Hare Uta Hotel": {
-        "address": "Av. Hotu Matu'a s/n, Hanga Roa",
-        "contact": {"phone": "+56 32 255 1415", "email": "reservas@hareuta.cl"},
-        "amenities": ["Spa", "Thalasso-Pool", "Restaurant"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1505691938895-1758d7feb511?w=600&auto=format&fit=crop",
-                "caption": "Bungalow auf Rapa Nui",
-                "credit": "Brooke Cagle",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.8,
-        "reviewCount": 540,
-        "checkInWindow": "15:00–21:00",
-        "checkOutWindow": "bis 11:00",
-        "roomHighlights": ["Privater Balkon", "Außendusche"],
-    },
-    "Hotel Desertica": {
-        "address": "Tocopilla 18, San Pedro de Atacama",
-        "contact": {"phone": "+56 55 255 1212", "email": "reservas@desertica.cl"},
-        "amenities": ["Salzwasserpool", "Observatorium", "E-Bike Verleih"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1470246973918-29a93221c455?w=600&auto=format&fit=crop",
-                "caption": "Adobe-Suiten in San Pedro",
-                "credit": "Alexandre Pellaes",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.9,
-        "reviewCount": 890,
-        "checkInWindow": "14:00–22:00",
-        "checkOutWindow": "bis 11:00",
-        "roomHighlights": ["Feuerstelle", "Outdoor-Dusche"],
-    },
-    "Hotel Cabo de Hornos": {
-        "address": "Plaza Muñoz Gamero 1025, Punta Arenas",
-        "contact": {"phone": "+56 61 271 5000", "email": "reservas@cabodehornos.cl"},
-        "amenities": ["Patagonische Küche", "Fitnessstudio", "Bibliothek"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1551888419-7f0c0f5fbac1?w=600&auto=format&fit=crop",
-                "caption": "Lobby im Hotel Cabo de Hornos",
-                "credit": "Roberto Nickson",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.5,
-        "reviewCount": 1540,
-        "checkInWindow": "15:00–23:30",
-        "checkOutWindow": "bis 12:00",
-        "roomHighlights": ["Blick auf die Magellanstraße"],
-    },
-    "Hotel Lago Grey": {
-        "address": "Sector Lago Grey, Torres del Paine",
-        "contact": {"phone": "+56 61 241 0541", "email": "reservas@lagogrey.com"},
-        "amenities": ["Katamaran-Tour", "Aussichtslounge", "Trails ab Haustür"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1519046904884-53103b34b206?w=600&auto=format&fit=crop",
-                "caption": "Lodge am Lago Grey",
-                "credit": "Fabrizio Conti",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.6,
-        "reviewCount": 620,
-        "checkInWindow": "15:00–21:00",
-        "checkOutWindow": "bis 11:00",
-        "roomHighlights": ["Panoramafenster", "Heißwasserflaschen"],
-    },
-    "Hotel Noi Casa Atacama": {
-        "address": "Tocopilla E-8, San Pedro de Atacama",
-        "contact": {"phone": "+56 55 285 1120", "email": "reservas@noihotels.com"},
-        "amenities": ["Solarbeheizter Pool", "Wellness", "Bike-Verleih"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1470246973918-29a93221c455?w=600&auto=format&fit=crop",
-                "caption": "Poolbereich Hotel Noi",
-                "credit": "Alexandre Pellaes",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.7,
-        "reviewCount": 980,
-        "checkInWindow": "15:00–22:00",
-        "checkOutWindow": "bis 11:00",
-        "roomHighlights": ["Feuerstellen", "Nachthimmel Deck"],
-    },
-    "WineBox Valparaíso": {
-        "address": "Pasaje Gálvez 4, Valparaíso",
-        "contact": {"phone": "+56 9 4226 5545", "email": "hola@wineboxvalparaiso.cl"},
-        "amenities": ["Rooftop mit Bar", "Weinproben", "Streetart-Galerie"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1445019980597-93fa8acb246c?w=600&auto=format&fit=crop",
-                "caption": "Containerhotel WineBox",
-                "credit": "Aleksandar Pasaric",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.6,
-        "reviewCount": 720,
-        "checkInWindow": "15:00–22:00",
-        "checkOutWindow": "bis 11:00",
-        "roomHighlights": ["Privater Balkon", "Kitchenette"],
-    },
-    "Hotel Antumalal": {
-        "address": "Camino Pucón a Villarrica km 2,5",
-        "contact": {"phone": "+56 45 244 1011", "email": "reservas@antumalal.com"},
-        "amenities": ["Designklassiker", "Spa", "Privater Seezugang"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1522708323590-d24dbb6b0267?w=600&auto=format&fit=crop",
-                "caption": "Retro Lounge im Hotel Antumalal",
-                "credit": "Tanya Pro",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.7,
-        "reviewCount": 510,
-        "checkInWindow": "15:00–22:00",
-        "checkOutWindow": "bis 11:00",
-        "roomHighlights": ["Panoramafenster", "Holzkamin"],
-    },
-    "Palafito 1326": {
-        "address": "Galvarino Riveros 1326, Castro",
-        "contact": {"phone": "+56 65 263 1000", "email": "reservas@palafito1326.cl"},
-        "amenities": ["Floating Terrace", "Bio-Frühstück", "Kajaks"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1545239351-1141bd82e8a6?w=600&auto=format&fit=crop",
-                "caption": "Pfahlbau-Zimmer",
-                "credit": "Sebastian Leon",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.8,
-        "reviewCount": 460,
-        "checkInWindow": "15:00–20:00",
-        "checkOutWindow": "bis 11:00",
-        "roomHighlights": ["Meerblick", "Fussbodenheizung"],
-    },
-    "Hotel Magnolia": {
-        "address": "Huérfanos 539, Santiago",
-        "contact": {"phone": "+56 2 2470 7000", "email": "reservas@hotelmagnolia.cl"},
-        "amenities": ["Rooftop Bar", "Bibliothek", "Design Suites"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1522708323590-d24dbb6b0267?w=600&auto=format&fit=crop",
-                "caption": "Rooftop des Hotel Magnolia",
-                "credit": "Tanya Pro",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.7,
-        "reviewCount": 980,
-        "checkInWindow": "15:00–00:00",
-        "checkOutWindow": "bis 12:00",
-        "roomHighlights": ["Designerbad", "Nespresso"],
-    },
-    "Explora Atacama": {
-        "address": "Ayllu de Larache s/n, San Pedro",
-        "contact": {"phone": "+56 2 2395 2800", "email": "reservas@explora.com"},
-        "amenities": ["Vollpension", "Observatorium", "Reitställe"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1517248135467-4c7edcad34c4?w=600&auto=format&fit=crop",
-                "caption": "Pool der Explora Atacama",
-                "credit": "Thomas Schaefer",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.9,
-        "reviewCount": 430,
-        "checkInWindow": "15:00–22:00",
-        "checkOutWindow": "bis 12:00",
-        "roomHighlights": ["All-inclusive Guides", "Whirlpools"],
-    },
-    "Clos Apalta Residence": {
-        "address": "Camino Apalta km 4.5, Santa Cruz",
-        "contact": {"phone": "+56 72 295 9000", "email": "reservas@lapostolle.com"},
-        "amenities": ["Infinity Pool", "Private Butler", "Degustationsmenüs"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1522708323590-d24dbb6b0267?w=600&auto=format&fit=crop",
-                "caption": "Villa in den Weinbergen",
-                "credit": "Tanya Pro",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.9,
-        "reviewCount": 220,
-        "checkInWindow": "15:00–19:00",
-        "checkOutWindow": "bis 12:00",
-        "roomHighlights": ["Panoramablick", "Privater Whirlpool"],
-    },
-    "Refugio CasaBosque": {
-        "address": "Ruta 5 Sur km 57, Chillán",
-        "contact": {"phone": "+56 42 266 2010", "email": "contacto@casabosque.cl"},
-        "amenities": ["Whirlpool", "Holzöfen", "Outdoor-Lounge"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1522708323590-d24dbb6b0267?w=600&auto=format&fit=crop",
-                "caption": "Refugio im Wald",
-                "credit": "Tanya Pro",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.6,
-        "reviewCount": 410,
-        "checkInWindow": "15:00–21:00",
-        "checkOutWindow": "bis 11:00",
-        "roomHighlights": ["Holzbadewannen", "Blick in den Wald"],
-    },
-    "La Casona Matetic": {
-        "address": "Fundo El Rosario km 18, San Antonio",
-        "contact": {"phone": "+56 2 2964 7800", "email": "reservas@matetic.com"},
-        "amenities": ["Kolonialvilla", "Weinverkostungen", "Pool"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1542318428-29f26af1ff86?w=600&auto=format&fit=crop",
-                "caption": "Herrenhaus La Casona",
-                "credit": "William Moreland",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.8,
-        "reviewCount": 350,
-        "checkInWindow": "14:00–20:00",
-        "checkOutWindow": "bis 12:00",
-        "roomHighlights": ["Veranda", "Antike Möbel"],
-    },
-    "Viña Vik": {
-        "address": "Hacienda Vik, Millahue",
-        "contact": {"phone": "+56 2 2383 3600", "email": "reservations@vik.cl"},
-        "amenities": ["Weintherapie Spa", "Helipad", "Kunstsammlung"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1522708323590-d24dbb6b0267?w=600&auto=format&fit=crop",
-                "caption": "Designhotel in den Hügeln",
-                "credit": "Tanya Pro",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.9,
-        "reviewCount": 410,
-        "checkInWindow": "15:00–20:00",
-        "checkOutWindow": "bis 12:00",
-        "roomHighlights": ["Kunstwerke", "Panoramafenster"],
-    },
-    "Nayara Alto Atacama": {
-        "address": "Camino Pukará 6, San Pedro",
-        "contact": {"phone": "+56 55 284 1919", "email": "reservas@nayaratentedcamp.com"},
-        "amenities": ["Privates Observatorium", "Sechs Pools", "All-Inclusive Ausflüge"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1470246973918-29a93221c455?w=600&auto=format&fit=crop",
-                "caption": "Terrakotta-Bauten im Alto Atacama",
-                "credit": "Alexandre Pellaes",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.9,
-        "reviewCount": 520,
-        "checkInWindow": "15:00–22:00",
-        "checkOutWindow": "bis 11:00",
-        "roomHighlights": ["Privatterrasse", "Außendusche"],
-    },
-    "EcoCamp Patagonia Suite Dome": {
-        "address": "Sector Las Torres, Torres del Paine",
-        "contact": {"phone": "+56 2 2923 5950", "email": "reservas@ecocamp.travel"},
-        "amenities": ["Community Dome", "Yoga", "Guide-Team"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1500530855697-b586d89ba3ee?w=600&auto=format&fit=crop",
-                "caption": "Geodomes bei Nacht",
-                "credit": "James Wheeler",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.8,
-        "reviewCount": 880,
-        "checkInWindow": "15:00–20:00",
-        "checkOutWindow": "bis 10:00",
-        "roomHighlights": ["Holzofen", "Privates Bad"],
-    },
-    "Hostal El Arbol": {
-        "address": "Eduardo de la Barra 29, La Serena",
-        "contact": {"phone": "+56 51 221 3370", "email": "info@hostelelarbol.cl"},
-        "amenities": ["Garten", "Gemeinschaftsküche", "Yoga"],
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1505691723518-36a9f9439c32?w=600&auto=format&fit=crop",
-                "caption": "Innenhof Hostal El Arbol",
-                "credit": "Gaelle Marcel",
-                "license": "Unsplash License",
-            }
-        ],
-        "rating": 4.5,
-        "reviewCount": 680,
-        "checkInWindow": "14:00–22:00",
-        "checkOutWindow": "bis 11:00",
-        "roomHighlights": ["Hängematten", "Gemeinschaftsatmosphäre"],
-    },
-}
-
-FOOD_ENRICHMENTS = {
-    "Bocanáriz Wine Bar": {
-        "contact": {"phone": "+56 2 2638 9893", "instagram": "https://www.instagram.com/bocanariz/"},
-        "mustTry": ["Wine Flight Tierra de Chile", "Merquén Crostini"],
-        "reservation": "Empfohlen für Abendservice",
-        "googlePlaceId": "ChIJ8Qj4b2VZYpYR7mxzXIv2qx4",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1517248135467-4c7edcad34c4?w=600&auto=format&fit=crop",
-                "caption": "Wine Pairing bei Bocanáriz",
-                "credit": "Thomas Schaefer",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "Mercado Central": {
-        "contact": {"phone": "+56 2 2628 7160", "website": "https://www.mercadocentral.cl"},
-        "mustTry": ["Caldillo de Congrio", "Empanada de Mariscos"],
-        "reservation": "Nicht nötig – mehrere Stände, Karte akzeptiert",
-        "googlePlaceId": "ChIJL1tZBKVZYpYRl3F1l16rDp0",
-        "instagram": "https://www.instagram.com/mercadocentralsantiago/",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1529257414771-1960ab1f3d30?w=600&auto=format&fit=crop",
-                "caption": "Fischstände im Mercado Central",
-                "credit": "Nicolas Perez",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "Empanadas Hanga Roa": {
-        "contact": {"phone": "+56 32 255 1410"},
-        "mustTry": ["Empanada de Atún", "Jugo de Guayaba"],
-        "reservation": "Walk-in",
-        "googlePlaceId": "ChIJ3V69z0C8hZQRV6x6tEN84qk",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1589308078055-44e511e7d303?w=600&auto=format&fit=crop",
-                "caption": "Frische Empanadas",
-                "credit": "Gabriel Gurrola",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "Damiana Elena": {
-        "contact": {"phone": "+56 61 241 3757", "website": "https://www.damianaelena.cl"},
-        "mustTry": ["Centolla", "Patagonisches Lamm"],
-        "reservation": "Empfohlen 1 Woche im Voraus",
-        "googlePlaceId": "ChIJv4oJLN9b0JUR3gH-6Q4Dzg0",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1504674900247-0877df9cc836?w=600&auto=format&fit=crop",
-                "caption": "Patagonisches Fine Dining",
-                "credit": "Jay Wennington",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "El Huerto": {
-        "contact": {"phone": "+56 55 285 1000", "instagram": "https://www.instagram.com/elhuertospa/"},
-        "mustTry": ["Quinoa Burger", "Atacama Craft Beer"],
-        "reservation": "Empfohlen für Abendservice",
-        "googlePlaceId": "ChIJq0WX7C02YpYRQ4BP8M0YfQc",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1499028344343-cd173ffc68a9?w=600&auto=format&fit=crop",
-                "caption": "Veggie Bowls im El Huerto",
-                "credit": "Anna Pelzer",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "Apice Cocina": {
-        "contact": {"phone": "+56 32 322 8444", "instagram": "https://www.instagram.com/apicecocina/"},
-        "mustTry": ["Degustationsmenü de Temporada"],
-        "reservation": "Zwingend – 2 Wochen Vorlauf",
-        "googlePlaceId": "ChIJp3Cq6lLBYpYRyYB9H9n1tOI",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1466978913421-dad2ebd01d17?w=600&auto=format&fit=crop",
-                "caption": "Fine Dining Teller",
-                "credit": "Sebastian Coman",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "Feria Costumbrista de Chonchi": {
-        "contact": {"instagram": "https://www.instagram.com/feriachonchi/"},
-        "mustTry": ["Curanto en Hoyo", "Milcao"],
-        "reservation": "Eintritt frei, Cash only",
-        "googlePlaceId": "ChIJDd6rzQVo0JURafqCk41sJL0",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1514986888952-8cd320577b68?w=600&auto=format&fit=crop",
-                "caption": "Chilenische Märkte",
-                "credit": "Jarritos Mexican Soda",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "Boragó": {
-        "contact": {"phone": "+56 2 2953 8893", "website": "https://borago.cl"},
-        "mustTry": ["Endemico Menu", "Murtilla Dessert"],
-        "reservation": "Mehrere Wochen im Voraus",
-        "googlePlaceId": "ChIJN0K8P2JYYpYRtoDnNMSKyk4",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1504674900247-0877df9cc836?w=600&auto=format&fit=crop",
-                "caption": "Signature Dish Boragó",
-                "credit": "Jay Wennington",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "Café Matilde": {
-        "contact": {"phone": "+56 2 2632 4456", "instagram": "https://www.instagram.com/cafematilde/"},
-        "mustTry": ["Torta Tres Leches", "Flat White"],
-        "reservation": "Nicht nötig",
-        "googlePlaceId": "ChIJn8J72VlZYpYR1pRkNvztNF4",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1521017432531-fbd92d768814?w=600&auto=format&fit=crop",
-                "caption": "Kaffee und Kuchen",
-                "credit": "Nathan Dumlao",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "Cocina y Amor": {
-        "mustTry": ["Reineta mit Chilote-Kräutern", "Chilotanisches Risotto"],
-        "reservation": "Empfohlen",
-        "googlePlaceId": "ChIJ7e1bGCDcYpYR2_n0KBPXn1E",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1517248135467-4c7edcad34c4?w=600&auto=format&fit=crop",
-                "caption": "Abendessen in Puerto Varas",
-                "credit": "Thomas Schaefer",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "Cafe El Kiosco": {
-        "contact": {"phone": "+56 51 221 1222"},
-        "mustTry": ["Papayas con Crema", "Sandwich Barros Luco"],
-        "reservation": "Walk-in",
-        "googlePlaceId": "ChIJi8J1H6z3YpYR7Vj1vZ1tcIA",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1455619452474-d2be8b1e70cd?w=600&auto=format&fit=crop",
-                "caption": "Cafe in La Serena",
-                "credit": "Pablo Merchán",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "La Recova Market": {
-        "mustTry": ["Papayasaft", "Handwerk aus Lapislazuli"],
-        "reservation": "Nicht erforderlich",
-        "googlePlaceId": "ChIJjZy9fWb4YpYRmS5aXoaZySU",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1515003197210-e0cd71810b5f?w=600&auto=format&fit=crop",
-                "caption": "Marktstände La Recova",
-                "credit": "Giorgio Trovato",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-    "Fabrica de Cecinas Fischer": {
-        "mustTry": ["Fischer Wurstplatte", "Kräuter-Käse"],
-        "reservation": "Nicht nötig",
-        "googlePlaceId": "ChIJyUR2uM7CYpYR7bHimoMuquI",
-        "images": [
-            {
-                "url": "https://images.unsplash.com/photo-1484981184820-2e84ea0b2700?w=600&auto=format&fit=crop",
-                "caption": "Delikatessenladen",
-                "credit": "Jakub Kapusnak",
-                "license": "Unsplash License",
-            }
-        ],
-    },
-}
+def data_table(name: str):
+    """Shared data table ``name`` (e.g. ``"STOPS"``), loaded on first use."""
 
-ACTIVITY_ENRICHMENTS = {
-    "Streetart Walk Valparaíso": {
-        "website": "https://www.tours4tips.com/valparaiso",
-        "meetingPoint": "Plaza Anibal Pinto um 10:00 Uhr",
-        "gear": ["Bequeme Schuhe", "Kamera"],
-        "difficulty": "leicht",
-        "groupSize": "max. 12 Personen",
-        "included": ["Guide", "Streetart-Map"],
-        "notes": "Trinkgeld-basiert – 10.000 CLP pro Person empfohlen.",
-    },
-    "Rapa Nui Sunrise": {
-        "website": "https://www.mahinatur.cl",
-        "meetingPoint": "Hotel Lobby 04:30 Uhr",
-        "gear": ["Windjacke", "Kopflampe"],
-        "difficulty": "leicht",
-        "groupSize": "max. 8 Personen",
-        "included": ["Nationalpark-Ticket", "Breakfast Box"],
-        "notes": "Respektabstand zu den Moai einhalten, Stativ erlaubt.",
-    },
-    "Atacama Stargazing": {
-        "website": "https://www.spaceobs.com",
-        "meetingPoint": "SpaceObs Observatory 20:00 Uhr",
-        "gear": ["Warme Kleidung", "Kamera"],
-        "difficulty": "leicht",
-        "groupSize": "max. 12 Personen",
-        "included": ["Transport", "Teleskop", "Heißgetränke"],
-        "notes": "Wolkenlosigkeit prüfen – kurzfristige Umbuchung möglich.",
-    },
-    "Base Torres Trek": {
-        "website": "https://chilenativo.com",
-        "meetingPoint": "Puerto Natales 06:30 Uhr",
-        "gear": ["Trekkingstöcke", "Regenschutz", "Lunchpaket"],
-        "difficulty": "anspruchsvoll",
-        "groupSize": "max. 8 Personen",
-        "included": ["Transport", "Guide", "Erste-Hilfe Set"],
-        "notes": "700 m Höhenmeter, starke Winde – Handschuhe einpacken.",
-    },
-    "Geysire del Tatio": {
-        "website": "https://www.desertadventure.cl",
-        "meetingPoint": "Hotel Pick-up 04:30 Uhr",
-        "gear": ["Warme Layer", "Mütze", "Badesachen"],
-        "difficulty": "mittel",
-        "groupSize": "max. 15 Personen",
-        "included": ["Frühstück", "Guide", "Oxygen-Kit"],
-        "notes": "Höhe 4.300 m – langsame Bewegungen, viel trinken.",
-    },
-    "Surfkurs Punta de Lobos": {
-        "website": "https://www.pichilemusurfschool.cl",
-        "meetingPoint": "Surf School Base 09:30 Uhr",
-        "gear": ["Neoprenanzug", "Sonnencreme"],
-        "difficulty": "mittel",
-        "groupSize": "max. 6 Personen",
-        "included": ["Board", "Neoprenanzug", "Foto/Video"],
-        "notes": "Beste Bedingungen bei Ebbe, Unterricht in Englisch & Spanisch.",
-    },
-    "Kayak Llanquihue": {
-        "website": "https://www.kokayak.cl",
-        "meetingPoint": "Puerto Chico 08:30 Uhr",
-        "gear": ["Wasserfeste Kleidung", "Sonnenhut"],
-        "difficulty": "leicht",
-        "groupSize": "max. 10 Personen",
-        "included": ["Doppelkajak", "Guide", "Heißgetränke"],
-        "notes": "Delfinsichtungen möglich – Kamera wasserdicht verpacken.",
-    },
-    "Sunrise Moai Shooting": {
-        "website": "https://www.mahinatur.cl",
-        "meetingPoint": "Hotel Pick-up 05:00 Uhr",
-        "gear": ["Stativ", "Graufilter"],
-        "difficulty": "leicht",
-        "groupSize": "max. 6 Personen",
-        "included": ["Privater Guide", "Transfer", "Permit"],
-        "notes": "Golden Hour am Ahu Tongariki – respektvolle Distanz einhalten.",
-    },
-    "Private Thermal Retreat": {
-        "website": "https://www.termasvalledecolina.cl",
-        "meetingPoint": "Santiago Hotel 08:00 Uhr",
-        "gear": ["Badesachen", "Flip-Flops"],
-        "difficulty": "leicht",
-        "groupSize": "max. 2 Personen",
-        "included": ["Private Cabana", "Sekt", "Snacks"],
-        "notes": "Thermalbecken zwischen 30–50°C, Höhenlage 2.500 m.",
-    },
-    "Sunset Cruise Llanquihue": {
-        "website": "https://www.southernlakes.cl",
-        "meetingPoint": "Muelle Puerto Varas 18:00 Uhr",
-        "gear": ["Windjacke", "Kamera"],
-        "difficulty": "leicht",
-        "groupSize": "max. 10 Personen",
-        "included": ["Glas Sekt", "Fingerfood", "Guide"],
-        "notes": "Beste Sicht auf Vulkan Osorno bei klarer Sicht.",
-    },
-    "Chilenischer Kochkurs": {
-        "website": "https://www.culinariachile.cl",
-        "meetingPoint": "La Serena Markt 10:00 Uhr",
-        "gear": ["Schürze"],
-        "difficulty": "leicht",
-        "groupSize": "max. 8 Personen",
-        "included": ["Einkauf am Markt", "Kochkurs", "Rezepte"],
-        "notes": "Vegetarische Optionen verfügbar.",
-    },
-    "Observatorium Mamalluca": {
-        "website": "https://www.observatoriomamalluca.cl",
-        "meetingPoint": "Touristeninfo Vicuña 20:00 Uhr",
-        "gear": ["Jacke", "Kamera"],
-        "difficulty": "leicht",
-        "groupSize": "max. 15 Personen",
-        "included": ["Transport", "Teleskope", "Astronomie-Guide"],
-        "notes": "Spanisch & Englisch, warme Kleidung für kühle Nächte.",
-    },
-    "Weinverkostung Casa del Bosque": {
-        "website": "https://www.casadelbosque.cl",
-        "meetingPoint": "Weingut Empfang 11:00 Uhr",
-        "gear": ["Bequeme Kleidung"],
-        "difficulty": "leicht",
-        "groupSize": "max. 12 Personen",
-        "included": ["Kellerführung", "4 Weine", "Käseplatte"],
-        "notes": "Fahrer:in sollte verzichten – Shuttle buchbar.",
-    },
-}
+    value = globals().get(name)
+    if value is not None:
+        return value
+    if name == "CARBON_FACTORS":
+        value = {mode: cfg["carbonPerKm"] for mode, cfg in data_table("TRANSPORT_MODES").items()}
+    elif name in TABLE_FILES:
+        value = load_table(TABLES_DIR / TABLE_FILES[name], Path(__file__).parent / CACHE_DIR_NAME)
+        if name == "SEGMENT_SPECIFICS":
+            # JSON kennt keine Tupel-Schlüssel: "from|to|mode" → (from, to, mode).
+            value = {tuple(key.split("|")): enrichment for key, enrichment in value.items()}
+    else:
+        raise KeyError(name)
+    globals()[name] = value
+    return value
 
 
 def nights_between(start: str | None, end: str | None) -> int:
@@ -1988,815 +130,175 @@ def nights_between(start: str | None, end: str | None) -> int:
     return max(delta.days, 0)
 
 
+_CATALOG: dict[str, dict] | None = None
+
+
+def load_catalog() -> dict[str, dict]:
+    """Stage 1 – merge STOP_ENRICHMENTS into a copy of STOPS (once per process).
+
+    The result is frozen and shared by every route that visits a stop.
+    """
+
+    global _CATALOG
+    if _CATALOG is None:
+        catalog = deepcopy(data_table("STOPS"))
+        for stop_id, enrichment in data_table("STOP_ENRICHMENTS").items():
+            deep_merge(catalog[stop_id], enrichment)
+        _CATALOG = freeze(catalog)
+    return _CATALOG
+
+
+def catalog_places(catalog: dict[str, dict]) -> list[dict]:
+    """Stops and events as flat spatial-index items."""
+
+    places = [
+        {"id": stop_id, "kind": "stop", "lat": stop["coordinates"]["lat"], "lng": stop["coordinates"]["lng"], "name": stop.get("name", "")}
+        for stop_id, stop in catalog.items()
+        if stop.get("coordinates")
+    ]
+    places.extend(
+        {"id": event["id"], "kind": "event", "lat": event["coordinates"][0], "lng": event["coordinates"][1], "name": event.get("title", "")}
+        for event in data_table("EVENTS")
+        if event.get("coordinates")
+    )
+    return places
+
+
+def route_places(route: dict) -> list[dict]:
+    """Day stations and ``arrival.mapPoints`` of a 2026 route as spatial-index items."""
+
+    places = []
+    for position, day in enumerate(route.get("days", []), start=1):
+        day_id = day.get("id") or f"day-{position}"
+        station = day.get("station") or {}
+        points = [(f"{route.get('id')}/{day_id}", "station", station)]
+        points.extend(
+            (f"{route.get('id')}/{point.get('id', day_id)}", "poi", point)
+            for point in (day.get("arrival") or {}).get("mapPoints", [])
+        )
+        for place_id, kind, point in points:
+            coords = point.get("coordinates") or {}
+            if "lat" in coords and "lng" in coords:
+                places.append(
+                    {"id": place_id, "kind": kind, "lat": coords["lat"], "lng": coords["lng"], "name": point.get("name", "")}
+                )
+    return places
+
+
 def stops(*ids: str) -> list[dict]:
-    return [deepcopy(STOPS[sid]) for sid in ids]
-
-routes: list[dict] = []
-
-routes.append(
-    {
-        "id": "var1",
-        "name": "Variante 1 – Flugreise Zentral + Osterinsel + Atacama",
-        "color": "#5bd1ff",
-        "tags": ["culture", "nature", "adventure", "flight"],
-        "summary": "Flug zu Chiles Top-Spots: Santiago, Rapa Nui und Atacama mit Surf-Finale in Pichilemu.",
-        "meta": {
-            "theme": "Flugreise • Inseln • Wüste",
-            "pace": "ausgewogen",
-            "durationDays": 19,
-            "costEstimate": 3200,
-            "highlights": ["Rapa Nui", "Valle de la Luna", "Streetart Valparaíso"],
-            "scores": {"budget": 3, "adventure": 3, "relax": 3, "culture": 4},
-        },
-        "costBreakdown": {
-            "currency": "EUR",
-            "items": [
-                {"category": "Flüge", "estimate": 1450, "notes": "SCL↔IPC, IPC→CJC, CJC→SCL"},
-                {"category": "Unterkünfte", "estimate": 950, "notes": "Eco-Lodges & Boutique Hotels"},
-                {"category": "Transport", "estimate": 380, "notes": "Bus, Taxi, Surf-Van"},
-                {"category": "Aktivitäten", "estimate": 220, "notes": "Sunrise-Touren & Surfkurs"},
-                {"category": "Food", "estimate": 200, "notes": "Streetfood + Degustation"},
-            ],
-        },
-        "stops": stops(
-            "scl-airport",
-            "terminal-alameda",
-            "valparaiso-center",
-            "vina-del-mar",
-            "ipc-airport",
-            "hanga-roa-lodge",
-            "rano-raraku",
-            "cjc-airport",
-            "san-pedro",
-            "valle-luna",
-            "pichilemu",
-            "punta-lobos",
-            "santiago-center",
-        ),
-        "segments": [
-            {"from": "scl-airport", "to": "terminal-alameda", "mode": "bus", "distanceKm": 18, "durationMinutes": 35, "price": 5},
-            {"from": "terminal-alameda", "to": "valparaiso-center", "mode": "bus", "distanceKm": 120, "durationMinutes": 110, "price": 9},
-            {"from": "valparaiso-center", "to": "ipc-airport", "mode": "flight", "distanceKm": 3750, "durationMinutes": 330, "price": 480},
-            {"from": "ipc-airport", "to": "rano-raraku", "mode": "drive", "distanceKm": 17, "durationMinutes": 30, "price": 35},
-            {"from": "ipc-airport", "to": "cjc-airport", "mode": "flight", "distanceKm": 4200, "durationMinutes": 310, "price": 410},
-            {"from": "cjc-airport", "to": "san-pedro", "mode": "bus", "distanceKm": 105, "durationMinutes": 90, "price": 12},
-            {"from": "san-pedro", "to": "valle-luna", "mode": "drive", "distanceKm": 13, "durationMinutes": 25, "price": 18},
-            {"from": "san-pedro", "to": "pichilemu", "mode": "flight", "distanceKm": 1540, "durationMinutes": 210, "price": 160},
-            {"from": "pichilemu", "to": "punta-lobos", "mode": "walk", "distanceKm": 4, "durationMinutes": 50, "price": 0},
-            {"from": "pichilemu", "to": "santiago-center", "mode": "bus", "distanceKm": 215, "durationMinutes": 210, "price": 14},
-        ],
-        "flights": [
-            {
-                "id": "flight-scl-ipc",
-                "fromStopId": "scl-airport",
-                "toStopId": "ipc-airport",
-                "airline": "LATAM",
-                "flightNumber": "LA841",
-                "departure": "2025-01-05T08:40:00-03:00",
-                "arrival": "2025-01-05T12:35:00-06:00",
-                "durationMinutes": 295,
-                "price": 480,
-                "currency": "EUR",
-                "bookingUrl": "https://www.latamairlines.com/",
-            },
-            {
-                "id": "flight-ipc-cjc",
-                "fromStopId": "ipc-airport",
-                "toStopId": "cjc-airport",
-                "airline": "Sky Airline",
-                "flightNumber": "H2193",
-                "departure": "2025-01-10T13:10:00-06:00",
-                "arrival": "2025-01-10T17:20:00-03:00",
-                "durationMinutes": 250,
-                "price": 410,
-                "currency": "EUR",
-                "bookingUrl": "https://www.skyairline.com/",
-            },
-            {
-                "id": "flight-cjc-scl",
-                "fromStopId": "cjc-airport",
-                "toStopId": "scl-airport",
-                "airline": "LATAM",
-                "flightNumber": "LA329",
-                "departure": "2025-01-16T19:40:00-03:00",
-                "arrival": "2025-01-16T21:45:00-03:00",
-                "durationMinutes": 125,
-                "price": 160,
-                "currency": "EUR",
-                "bookingUrl": "https://www.latamairlines.com/",
-            },
-        ],
-        "lodging": [
-            {
-                "name": "Hotel Casa Higueras",
-                "stopId": "valparaiso-center",
-                "checkIn": "2025-01-04",
-                "checkOut": "2025-01-06",
-                "website": "https://www.casahigueras.cl",
-                "pricePerNight": 180,
-                "currency": "EUR",
-                "roomType": "Premium Doppelzimmer",
-            },
-            {
-                "name": "Hare Uta Hotel",
-                "stopId": "hanga-roa-lodge",
-                "checkIn": "2025-01-06",
-                "checkOut": "2025-01-09",
-                "website": "https://www.hareuta.cl",
-                "pricePerNight": 210,
-                "currency": "EUR",
-                "roomType": "Bungalow",
-            },
-            {
-                "name": "Hotel Desertica",
-                "stopId": "san-pedro",
-                "checkIn": "2025-01-09",
-                "checkOut": "2025-01-13",
-                "website": "https://www.desertica.cl",
-                "pricePerNight": 195,
-                "currency": "EUR",
-                "roomType": "Suite Adobe",
-            },
-        ],
-        "food": [
-            {
-                "name": "Mercado Central",
-                "stopId": "santiago-center",
-                "type": "Seafood Market",
-                "address": "San Pablo 967, Santiago",
-                "openingHours": "09:00–18:00",
-                "specialties": ["Curanto", "Ceviche Mixto"],
-                "priceRange": "€€",
-            },
-            {
-                "name": "Empanadas Hanga Roa",
-                "stopId": "hanga-roa-lodge",
-                "type": "Streetfood",
-                "address": "Atamu Tekena, Hanga Roa",
-                "openingHours": "12:00–21:00",
-                "specialties": ["Empanada de Atún", "Jugos Naturales"],
-                "priceRange": "€",
-            },
-        ],
-        "activities": [
-            {
-                "title": "Streetart Walk Valparaíso",
-                "stopId": "valparaiso-center",
-                "durationHours": 3,
-                "operator": "Tours4Tips",
-                "price": 15,
-                "currency": "EUR",
-            },
-            {
-                "title": "Rapa Nui Sunrise",
-                "stopId": "rano-raraku",
-                "durationHours": 5,
-                "operator": "Mahinatur",
-                "price": 85,
-                "currency": "EUR",
-            },
-            {
-                "title": "Atacama Stargazing",
-                "stopId": "san-pedro",
-                "durationHours": 2,
-                "operator": "SpaceObs",
-                "price": 40,
-                "currency": "EUR",
-            },
-        ],
-        "notes": "Flex-Tag in Santiago am Ende einplanen, um Festivals mitzunehmen.",
-    }
-)
+    # Shared, read-only catalog records; use overlay() for route-specific changes.
+    catalog = load_catalog()
+    return [catalog[sid] for sid in ids]
 
-routes.append(
-    {
-        "id": "var2",
-        "name": "Variante 2 – Flug zu Patagonien & Atacama",
-        "color": "#8affc1",
-        "tags": ["nature", "adventure", "photography", "flight"],
-        "summary": "Flüge verbinden Patagonien, Atacama und Santiago für die ultimative Chile-Highlight-Tour.",
-        "meta": {
-            "theme": "Flugreise Patagonien • Atacama",
-            "pace": "zügig",
-            "durationDays": 19,
-            "costEstimate": 3400,
-            "highlights": ["Base Torres", "El Tatio", "Lago Grey"],
-            "scores": {"budget": 2, "adventure": 4, "relax": 2, "culture": 3},
-        },
-        "costBreakdown": {
-            "currency": "EUR",
-            "items": [
-                {"category": "Flüge", "estimate": 1650, "notes": "SCL→PUQ→CJC→SCL"},
-                {"category": "Unterkünfte", "estimate": 980, "notes": "Refugio + Boutique"},
-                {"category": "Guides", "estimate": 280, "notes": "Base Torres Trek, Geysire"},
-                {"category": "Transport", "estimate": 220, "notes": "Busse & Transfers"},
-                {"category": "Essen", "estimate": 220, "notes": "Patagonische Küche"},
-            ],
-        },
-        "stops": stops(
-            "scl-airport",
-            "valparaiso-center",
-            "punta-arenas-airport",
-            "puerto-natales",
-            "torres-base",
-            "cjc-airport",
-            "san-pedro",
-            "valle-luna",
-            "santiago-center",
-        ),
-        "segments": [
-            {"from": "scl-airport", "to": "valparaiso-center", "mode": "bus", "distanceKm": 120, "durationMinutes": 110, "price": 9},
-            {"from": "scl-airport", "to": "punta-arenas-airport", "mode": "flight", "distanceKm": 2180, "durationMinutes": 195, "price": 320},
-            {"from": "punta-arenas-airport", "to": "puerto-natales", "mode": "bus", "distanceKm": 250, "durationMinutes": 190, "price": 12},
-            {"from": "puerto-natales", "to": "torres-base", "mode": "bus", "distanceKm": 146, "durationMinutes": 150, "price": 18},
-            {"from": "punta-arenas-airport", "to": "cjc-airport", "mode": "flight", "distanceKm": 3620, "durationMinutes": 320, "price": 480},
-            {"from": "cjc-airport", "to": "san-pedro", "mode": "bus", "distanceKm": 105, "durationMinutes": 90, "price": 12},
-            {"from": "san-pedro", "to": "valle-luna", "mode": "drive", "distanceKm": 13, "durationMinutes": 25, "price": 18},
-            {"from": "cjc-airport", "to": "santiago-center", "mode": "flight", "distanceKm": 1220, "durationMinutes": 120, "price": 160},
-        ],
-        "flights": [
-            {
-                "id": "flight-scl-puq",
-                "fromStopId": "scl-airport",
-                "toStopId": "punta-arenas-airport",
-                "airline": "LATAM",
-                "flightNumber": "LA285",
-                "departure": "2025-01-05T07:20:00-03:00",
-                "arrival": "2025-01-05T10:35:00-03:00",
-                "durationMinutes": 195,
-                "price": 320,
-                "currency": "EUR",
-            },
-            {
-                "id": "flight-puq-cjc",
-                "fromStopId": "punta-arenas-airport",
-                "toStopId": "cjc-airport",
-                "airline": "Sky Airline",
-                "flightNumber": "H520",
-                "departure": "2025-01-11T12:00:00-03:00",
-                "arrival": "2025-01-11T17:20:00-03:00",
-                "durationMinutes": 320,
-                "price": 480,
-                "currency": "EUR",
-            },
-            {
-                "id": "flight-cjc-scl-final",
-                "fromStopId": "cjc-airport",
-                "toStopId": "scl-airport",
-                "airline": "LATAM",
-                "flightNumber": "LA329",
-                "departure": "2025-01-17T18:40:00-03:00",
-                "arrival": "2025-01-17T20:45:00-03:00",
-                "durationMinutes": 125,
-                "price": 160,
-                "currency": "EUR",
-            },
-        ],
-        "lodging": [
-            {
-                "name": "Hotel Cabo de Hornos",
-                "stopId": "punta-arenas-airport",
-                "checkIn": "2025-01-05",
-                "checkOut": "2025-01-06",
-                "website": "https://www.hotelcabodehornos.com",
-                "pricePerNight": 140,
-                "currency": "EUR",
-            },
-            {
-                "name": "Hotel Lago Grey",
-                "stopId": "torres-base",
-                "checkIn": "2025-01-06",
-                "checkOut": "2025-01-09",
-                "website": "https://www.lagogrey.com",
-                "pricePerNight": 260,
-                "currency": "EUR",
-            },
-            {
-                "name": "Hotel Noi Casa Atacama",
-                "stopId": "san-pedro",
-                "checkIn": "2025-01-11",
-                "checkOut": "2025-01-15",
-                "website": "https://www.noihotels.com",
-                "pricePerNight": 230,
-                "currency": "EUR",
-            },
-        ],
-        "food": [
-            {
-                "name": "Damiana Elena",
-                "stopId": "puerto-natales",
-                "type": "Restaurant",
-                "address": "Hermann Eberhard 385, Puerto Natales",
-                "openingHours": "19:00–23:00",
-                "specialties": ["Patagonisches Lamm", "Königskrabbe"],
-                "priceRange": "€€€",
-            },
-            {
-                "name": "El Huerto",
-                "stopId": "san-pedro",
-                "type": "Vegetarisch",
-                "address": "Gustavo Le Paige 419, San Pedro",
-                "openingHours": "13:00–22:00",
-                "specialties": ["Quinoa-Burger", "Kaktus-Salat"],
-                "priceRange": "€€",
-            },
-        ],
-        "activities": [
-            {
-                "title": "Base Torres Trek",
-                "stopId": "torres-base",
-                "durationHours": 9,
-                "operator": "Chile Nativo",
-                "price": 120,
-                "currency": "EUR",
-            },
-            {
-                "title": "Geysire del Tatio",
-                "stopId": "san-pedro",
-                "durationHours": 7,
-                "operator": "Desert Adventures",
-                "price": 60,
-                "currency": "EUR",
-            },
-        ],
-        "notes": "Warme Layer für Patagonien und Höhenanpassung für San Pedro einplanen.",
-    }
-)
 
-routes.append(
-    {
-        "id": "var3",
-        "name": "Variante 3 – Roadtrip Küste • Seen • Chiloé",
-        "color": "#ffb86b",
-        "tags": ["nature", "food", "culture", "roadtrip"],
-        "summary": "Gemächlicher Roadtrip auf eigener Achse von Santiago über Seenland bis Chiloé.",
-        "meta": {
-            "theme": "Roadtrip Küste & Seen",
-            "pace": "gemütlich",
-            "durationDays": 19,
-            "costEstimate": 2600,
-            "highlights": ["Valparaíso", "Pucón", "Chiloé"],
-            "scores": {"budget": 4, "adventure": 3, "relax": 4, "culture": 3},
-        },
-        "costBreakdown": {
-            "currency": "EUR",
-            "items": [
-                {"category": "Mietwagen", "estimate": 620, "notes": "SUV mit Vollkasko"},
-                {"category": "Unterkünfte", "estimate": 880, "notes": "B&B + Cabañas"},
-                {"category": "Fähren", "estimate": 90, "notes": "Überfahrt nach Chiloé"},
-                {"category": "Aktivitäten", "estimate": 180, "notes": "Thermen, Nationalparks"},
-                {"category": "Food", "estimate": 220, "notes": "Seafood & Craft Beer"},
-            ],
-        },
-        "stops": stops(
-            "scl-airport",
-            "valparaiso-center",
-            "vina-del-mar",
-            "pichilemu",
-            "pucon",
-            "puerto-varas",
-            "castro",
-            "puerto-montt-airport",
-            "santiago-center",
-        ),
-        "segments": [
-            {"from": "scl-airport", "to": "valparaiso-center", "mode": "drive", "distanceKm": 120, "durationMinutes": 110, "price": 20},
-            {"from": "valparaiso-center", "to": "pichilemu", "mode": "drive", "distanceKm": 190, "durationMinutes": 180, "price": 30},
-            {"from": "pichilemu", "to": "pucon", "mode": "drive", "distanceKm": 620, "durationMinutes": 480, "price": 75},
-            {"from": "pucon", "to": "puerto-varas", "mode": "drive", "distanceKm": 315, "durationMinutes": 240, "price": 40},
-            {"from": "puerto-varas", "to": "castro", "mode": "ferry", "distanceKm": 85, "durationMinutes": 180, "price": 25},
-            {"from": "castro", "to": "puerto-montt-airport", "mode": "drive", "distanceKm": 180, "durationMinutes": 150, "price": 25},
-            {"from": "puerto-montt-airport", "to": "santiago-center", "mode": "flight", "distanceKm": 918, "durationMinutes": 110, "price": 95},
-        ],
-        "flights": [
-            {
-                "id": "flight-pmc-scl",
-                "fromStopId": "puerto-montt-airport",
-                "toStopId": "scl-airport",
-                "airline": "Sky Airline",
-                "flightNumber": "H012",
-                "departure": "2025-01-18T16:00:00-03:00",
-                "arrival": "2025-01-18T17:45:00-03:00",
-                "durationMinutes": 105,
-                "price": 95,
-                "currency": "EUR",
-            }
-        ],
-        "lodging": [
-            {
-                "name": "WineBox Valparaíso",
-                "stopId": "valparaiso-center",
-                "checkIn": "2025-01-03",
-                "checkOut": "2025-01-05",
-                "website": "https://wineboxvalparaiso.cl",
-                "pricePerNight": 130,
-                "currency": "EUR",
-            },
-            {
-                "name": "Hotel Antumalal",
-                "stopId": "pucon",
-                "checkIn": "2025-01-07",
-                "checkOut": "2025-01-10",
-                "website": "https://www.antumalal.com",
-                "pricePerNight": 180,
-                "currency": "EUR",
-            },
-            {
-                "name": "Palafito 1326",
-                "stopId": "castro",
-                "checkIn": "2025-01-12",
-                "checkOut": "2025-01-15",
-                "website": "https://palafito1326.cl",
-                "pricePerNight": 160,
-                "currency": "EUR",
-            },
-        ],
-        "food": [
-            {
-                "name": "Apice Cocina",
-                "stopId": "valparaiso-center",
-                "type": "Fine Dining",
-                "address": "Calle Templeman 494, Valparaíso",
-                "openingHours": "19:00–23:00",
-                "specialties": ["Degustationsmenü"],
-                "priceRange": "€€€",
-            },
-            {
-                "name": "Feria Costumbrista de Chonchi",
-                "stopId": "castro",
-                "type": "Markt",
-                "address": "Costanera de Chonchi",
-                "openingHours": "10:00–18:00",
-                "specialties": ["Curanto", "Milcao"],
-                "priceRange": "€",
-            },
-        ],
-        "activities": [
-            {
-                "title": "Surfkurs Punta de Lobos",
-                "stopId": "pichilemu",
-                "durationHours": 2,
-                "operator": "Pichilemu Surf School",
-                "price": 45,
-                "currency": "EUR",
-            },
-            {
-                "title": "Kayak Llanquihue",
-                "stopId": "puerto-varas",
-                "durationHours": 3,
-                "operator": "KO Kayak",
-                "price": 55,
-                "currency": "EUR",
-            },
-        ],
-        "notes": "Zwei Ruhetage in Puerto Varas einplanen, um flexibel zu bleiben.",
-    }
-)
+def resolve_route(definition: dict) -> dict:
+    """Copy a route definition and replace its stop ids with catalog records."""
 
-routes.append(
-    {
-        "id": "var4",
-        "name": "Variante 4 – Flugreise Instagram-Hotspots",
-        "color": "#c792ea",
-        "tags": ["photography", "adventure", "culture", "flight"],
-        "summary": "Flüge verbinden die fotogensten Orte Chiles für Sunrise-Shoots von Rapa Nui bis Patagonien.",
-        "meta": {
-            "theme": "Flugreise IG-Hotspots",
-            "pace": "zügig",
-            "durationDays": 19,
-            "costEstimate": 3600,
-            "highlights": ["Ahu Tongariki", "Base Torres", "Valle de la Luna"],
-            "scores": {"budget": 2, "adventure": 3, "relax": 2, "culture": 3},
-        },
-        "costBreakdown": {
-            "currency": "EUR",
-            "items": [
-                {"category": "Flüge", "estimate": 1900, "notes": "Mehrere Inlandsflüge"},
-                {"category": "Unterkünfte", "estimate": 900, "notes": "Fotofreundliche Hotels"},
-                {"category": "Guides", "estimate": 320, "notes": "Foto-Guides & Permits"},
-                {"category": "Transport", "estimate": 220, "notes": "Private Transfers"},
-                {"category": "Food", "estimate": 180, "notes": "Snacks & Cafés"},
-            ],
-        },
-        "stops": stops(
-            "santiago-center",
-            "valparaiso-center",
-            "valle-luna",
-            "torres-base",
-            "ipc-airport",
-            "rano-raraku",
-            "pichilemu",
-            "punta-lobos",
-        ),
-        "segments": [
-            {"from": "santiago-center", "to": "valparaiso-center", "mode": "bus", "distanceKm": 120, "durationMinutes": 110, "price": 9},
-            {"from": "santiago-center", "to": "valle-luna", "mode": "flight", "distanceKm": 1220, "durationMinutes": 120, "price": 160},
-            {"from": "valle-luna", "to": "torres-base", "mode": "flight", "distanceKm": 2180, "durationMinutes": 190, "price": 320},
-            {"from": "santiago-center", "to": "ipc-airport", "mode": "flight", "distanceKm": 3750, "durationMinutes": 330, "price": 500},
-            {"from": "ipc-airport", "to": "rano-raraku", "mode": "drive", "distanceKm": 17, "durationMinutes": 30, "price": 35},
-            {"from": "santiago-center", "to": "pichilemu", "mode": "bus", "distanceKm": 215, "durationMinutes": 210, "price": 14},
-            {"from": "pichilemu", "to": "punta-lobos", "mode": "walk", "distanceKm": 4, "durationMinutes": 50, "price": 0},
-        ],
-        "flights": [
-            {
-                "id": "flight-scl-calama",
-                "fromStopId": "santiago-center",
-                "toStopId": "valle-luna",
-                "airline": "LATAM",
-                "flightNumber": "LA330",
-                "departure": "2025-01-05T06:30:00-03:00",
-                "arrival": "2025-01-05T08:35:00-03:00",
-                "durationMinutes": 125,
-                "price": 160,
-                "currency": "EUR",
-            },
-            {
-                "id": "flight-scl-puq",
-                "fromStopId": "santiago-center",
-                "toStopId": "torres-base",
-                "airline": "JetSMART",
-                "flightNumber": "JA117",
-                "departure": "2025-01-10T05:45:00-03:00",
-                "arrival": "2025-01-10T09:20:00-03:00",
-                "durationMinutes": 215,
-                "price": 210,
-                "currency": "EUR",
-            },
-            {
-                "id": "flight-scl-rapa",
-                "fromStopId": "santiago-center",
-                "toStopId": "ipc-airport",
-                "airline": "LATAM",
-                "flightNumber": "LA841",
-                "departure": "2025-01-14T08:40:00-03:00",
-                "arrival": "2025-01-14T12:35:00-06:00",
-                "durationMinutes": 295,
-                "price": 500,
-                "currency": "EUR",
-            },
-        ],
-        "lodging": [
-            {
-                "name": "Hotel Magnolia",
-                "stopId": "santiago-center",
-                "checkIn": "2025-01-03",
-                "checkOut": "2025-01-05",
-                "website": "https://www.hotelmagnolia.cl",
-                "pricePerNight": 160,
-                "currency": "EUR",
-            },
-            {
-                "name": "Explora Atacama",
-                "stopId": "valle-luna",
-                "checkIn": "2025-01-05",
-                "checkOut": "2025-01-08",
-                "website": "https://www.explora.com",
-                "pricePerNight": 520,
-                "currency": "EUR",
-            },
-        ],
-        "food": [
-            {
-                "name": "Café Matilde",
-                "stopId": "santiago-center",
-                "type": "Café",
-                "address": "Jose Victorino Lastarria 43, Santiago",
-                "openingHours": "09:00–20:00",
-                "specialties": ["Flat White", "Torta Tres Leches"],
-                "priceRange": "€€",
-            }
-        ],
-        "activities": [
-            {
-                "title": "Sunrise Moai Shooting",
-                "stopId": "rano-raraku",
-                "durationHours": 4,
-                "operator": "Mahinatur",
-                "price": 95,
-                "currency": "EUR",
-            }
-        ],
-        "notes": "Filtersets und Akkus einpacken – viele Sonnenaufgänge.",
-    }
-)
+    route = deepcopy(definition)
+    if "stops" in route:
+        route["stops"] = stops(*definition["stops"])
+    return route
 
-routes.append(
-    {
-        "id": "var5",
-        "name": "Variante 5 – Budget & Bus",
-        "color": "#f7768e",
-        "tags": ["budget", "culture", "nature", "roadtrip"],
-        "summary": "Roadtrip mit Langstreckenbussen, Hostales und lokalen Märkten quer durch Chile.",
-        "meta": {
-            "theme": "Roadtrip Budget & Bus",
-            "pace": "ausgewogen",
-            "durationDays": 19,
-            "costEstimate": 2200,
-            "highlights": ["Elqui-Tal", "San Pedro", "Chiloé"],
-            "scores": {"budget": 5, "adventure": 3, "relax": 3, "culture": 3},
-        },
-        "costBreakdown": {
-            "currency": "EUR",
-            "items": [
-                {"category": "Buspässe", "estimate": 420, "notes": "Nachtbusse & Sitz-Upgrades"},
-                {"category": "Unterkünfte", "estimate": 750, "notes": "Hostales & Cabañas"},
-                {"category": "Aktivitäten", "estimate": 160, "notes": "Observatorium, Trekking"},
-                {"category": "Food", "estimate": 260, "notes": "Märkte & einfache Restaurants"},
-                {"category": "Extras", "estimate": 110, "notes": "Eintritte & Leihgeräte"},
-            ],
-        },
-        "stops": stops(
-            "terminal-alameda",
-            "la-serena",
-            "vicuna",
-            "antofagasta",
-            "san-pedro",
-            "pucon",
-            "puerto-varas",
-            "castro",
-            "santiago-center",
-        ),
-        "segments": [
-            {"from": "terminal-alameda", "to": "la-serena", "mode": "bus", "distanceKm": 470, "durationMinutes": 400, "price": 25},
-            {"from": "la-serena", "to": "vicuna", "mode": "bus", "distanceKm": 62, "durationMinutes": 70, "price": 4},
-            {"from": "vicuna", "to": "antofagasta", "mode": "bus", "distanceKm": 875, "durationMinutes": 780, "price": 32},
-            {"from": "antofagasta", "to": "san-pedro", "mode": "bus", "distanceKm": 312, "durationMinutes": 320, "price": 18},
-            {"from": "san-pedro", "to": "pucon", "mode": "bus", "distanceKm": 1550, "durationMinutes": 1080, "price": 52},
-            {"from": "pucon", "to": "puerto-varas", "mode": "bus", "distanceKm": 315, "durationMinutes": 300, "price": 16},
-            {"from": "puerto-varas", "to": "castro", "mode": "bus", "distanceKm": 180, "durationMinutes": 180, "price": 10},
-            {"from": "castro", "to": "santiago-center", "mode": "bus", "distanceKm": 1210, "durationMinutes": 960, "price": 45},
-        ],
-        "flights": [],
-        "lodging": [
-            {
-                "name": "Hostal El Arbol",
-                "stopId": "la-serena",
-                "checkIn": "2025-01-03",
-                "checkOut": "2025-01-05",
-                "pricePerNight": 40,
-                "currency": "EUR",
-            },
-            {
-                "name": "Refugio CasaBosque",
-                "stopId": "pucon",
-                "checkIn": "2025-01-11",
-                "checkOut": "2025-01-14",
-                "pricePerNight": 55,
-                "currency": "EUR",
-            },
-        ],
-        "food": [
-            {
-                "name": "La Recova Market",
-                "stopId": "la-serena",
-                "type": "Markt",
-                "openingHours": "09:00–18:00",
-                "specialties": ["Papayas", "Empanadas"],
-                "priceRange": "€",
-            },
-            {
-                "name": "Cafe El Kiosco",
-                "stopId": "puerto-varas",
-                "type": "Konditorei",
-                "openingHours": "08:00–20:00",
-                "specialties": ["Kuchen", "Kaffee"],
-                "priceRange": "€€",
-            },
-        ],
-        "activities": [
-            {
-                "title": "Observatorium Mamalluca",
-                "stopId": "vicuna",
-                "durationHours": 3,
-                "operator": "Observatorio Mamalluca",
-                "price": 18,
-                "currency": "EUR",
-            }
-        ],
-        "notes": "Nachtbusse mit Cama-Sitz wählen für mehr Komfort.",
-    }
-)
 
-routes.append(
-    {
-        "id": "var6",
-        "name": "Variante 6 – Kulinarik & Weintäler",
-        "color": "#52fa7c",
-        "tags": ["food", "wine", "culture", "roadtrip"],
-        "summary": "Genussvoller Roadtrip im Mietwagen zwischen Santiago, den Weintälern und Concepción.",
-        "meta": {
-            "theme": "Roadtrip Wein & Küche",
-            "pace": "gemütlich",
-            "durationDays": 19,
-            "costEstimate": 2500,
-            "highlights": ["Casablanca", "Colchagua", "Concepción"],
-            "scores": {"budget": 4, "adventure": 2, "relax": 4, "culture": 4},
-        },
-        "costBreakdown": {
-            "currency": "EUR",
-            "items": [
-                {"category": "Degustationen", "estimate": 420, "notes": "Geführte Touren"},
-                {"category": "Unterkünfte", "estimate": 820, "notes": "Boutique Lodges"},
-                {"category": "Transport", "estimate": 310, "notes": "Mietwagen & Fahrer"},
-                {"category": "Food", "estimate": 320, "notes": "Verkostungen & Fine Dining"},
-                {"category": "Workshops", "estimate": 150, "notes": "Cooking Class & Käse"},
-            ],
-        },
-        "stops": stops(
-            "santiago-center",
-            "valparaiso-center",
-            "santa-cruz",
-            "talca",
-            "concepcion",
-            "santiago-center",
+_JOINS: dict[str, EnrichmentJoin] = {}
+
+
+def enrichment_joins() -> dict[str, EnrichmentJoin]:
+    """Compiled joins over the current enrichment tables (rebuilt when a table is replaced)."""
+
+    specs = (
+        ("segmentDefaults", data_table("SEGMENT_MODE_DEFAULTS"), lambda segment: segment["mode"], False),
+        (
+            "segments",
+            data_table("SEGMENT_SPECIFICS"),
+            lambda segment: (segment["from"], segment["to"], segment["mode"]),
+            False,
         ),
-        "segments": [
-            {"from": "santiago-center", "to": "valparaiso-center", "mode": "drive", "distanceKm": 120, "durationMinutes": 110, "price": 20},
-            {"from": "valparaiso-center", "to": "santa-cruz", "mode": "drive", "distanceKm": 190, "durationMinutes": 180, "price": 32},
-            {"from": "santa-cruz", "to": "talca", "mode": "drive", "distanceKm": 120, "durationMinutes": 110, "price": 18},
-            {"from": "talca", "to": "concepcion", "mode": "drive", "distanceKm": 210, "durationMinutes": 180, "price": 28},
-            {"from": "concepcion", "to": "santiago-center", "mode": "bus", "distanceKm": 500, "durationMinutes": 320, "price": 17},
-        ],
-        "flights": [],
-        "lodging": [
-            {
-                "name": "La Casona Matetic",
-                "stopId": "valparaiso-center",
-                "checkIn": "2025-01-04",
-                "checkOut": "2025-01-06",
-                "website": "https://www.matetic.com",
-                "pricePerNight": 210,
-                "currency": "EUR",
-            },
-            {
-                "name": "Clos Apalta Residence",
-                "stopId": "santa-cruz",
-                "checkIn": "2025-01-06",
-                "checkOut": "2025-01-09",
-                "website": "https://www.closapalta.cl",
-                "pricePerNight": 260,
-                "currency": "EUR",
-            },
-        ],
-        "food": [
-            {
-                "name": "Bocanáriz Wine Bar",
-                "stopId": "santiago-center",
-                "type": "Wine Bar",
-                "address": "Lastarria 276, Santiago",
-                "openingHours": "12:00–00:00",
-                "specialties": ["Flight Degustationen", "Tapas"],
-                "priceRange": "€€€",
-            },
-            {
-                "name": "Fabrica de Cecinas Fischer",
-                "stopId": "concepcion",
-                "type": "Delikatessen",
-                "openingHours": "09:00–19:00",
-                "specialties": ["Charcuterie", "Käse"],
-                "priceRange": "€€",
-            },
-        ],
-        "activities": [
-            {
-                "title": "Weinverkostung Casa del Bosque",
-                "stopId": "valparaiso-center",
-                "durationHours": 4,
-                "operator": "Casa del Bosque",
-                "price": 65,
-                "currency": "EUR",
-            },
-            {
-                "title": "Chilenischer Kochkurs",
-                "stopId": "santa-cruz",
-                "durationHours": 3,
-                "operator": "Rayuela Wine & Grill",
-                "price": 85,
-                "currency": "EUR",
-            },
-        ],
-        "notes": "Fahrerwechsel einplanen, damit Verkostungen entspannt bleiben.",
-    }
+        ("flights", data_table("FLIGHT_ENRICHMENTS"), lambda flight: flight["id"], True),
+        ("lodging", data_table("LODGING_ENRICHMENTS"), lambda stay: stay["name"], True),
+        ("food", data_table("FOOD_ENRICHMENTS"), lambda item: item["name"], True),
+        ("activities", data_table("ACTIVITY_ENRICHMENTS"), lambda activity: activity["title"], True),
+    )
+    for name, table, key, required in specs:
+        join = _JOINS.get(name)
+        if join is None or join.table is not table:
+            _JOINS[name] = EnrichmentJoin(name, table, key, required)
+    return _JOINS
+
+
+# Route lists each join reads, in the order enrich_route() applies them.
+_JOIN_FIELDS = (
+    ("segmentDefaults", "segments"),
+    ("segments", "segments"),
+    ("flights", "flights"),
+    ("lodging", "lodging"),
+    ("food", "food"),
+    ("activities", "activities"),
 )
 
 
+def enrich_route(route: dict) -> dict:
+    """Stage 2 – join segment, flight, lodging, food and activity enrichments."""
+
+    for index, segment in enumerate(route.get("segments", []), start=1):
+        segment["id"] = f"{route['id']}-seg-{index:02d}"
+    joins = enrichment_joins()
+    for name, field in _JOIN_FIELDS:
+        joins[name].apply(route.get(field, []))
+
+    seat_info = data_table("SEGMENT_MODE_DEFAULTS")["flight"].get("seatInfo")
+    for flight in route.get("flights", []):
+        if "seatInfo" not in flight and seat_info:
+            flight["seatInfo"] = seat_info
+    return route
+
+
+def observe_enrichments(definition: dict) -> None:
+    """Record join hits and misses of a definition for ``enrichment_report()`` (lookups only)."""
+
+    joins = enrichment_joins()
+    for name, field in _JOIN_FIELDS:
+        joins[name].observe(definition.get(field, []), definition["id"])
+
+
+def observed_definitions(definitions: Iterable[dict]) -> Iterator[dict]:
+    for definition in definitions:
+        observe_enrichments(definition)
+        yield definition
+
+
+def enrichment_report() -> dict:
+    return {name: join.report() for name, join in enrichment_joins().items()}
+
+
+def enrichment_report_lines(report: dict) -> list[str]:
+    """Human-readable misses of required joins and enrichments no route used."""
+
+    misses = [(name, miss) for name, section in report.items() for miss in section.get("misses", [])]
+    miss_count = sum(section.get("missCount", 0) for section in report.values())
+    lines = []
+    if miss_count:
+        lines.append(f"Enrichment: {miss_count} Eintrag/Einträge ohne Treffer")
+        lines.extend(f"  {name}: {miss['key']} ({miss['route']})" for name, miss in misses)
+        if miss_count > len(misses):
+            lines.append(f"  … und {miss_count - len(misses)} weitere")
+    unused = [f"{name} {len(section['unused'])}" for name, section in report.items() if section["unused"]]
+    if unused:
+        lines.append(f"Ungenutzte Enrichments: {', '.join(unused)}")
+    return lines
+
+
+def compute_route_metrics(route: dict) -> dict:
+    """Stage 3 – derive distance, carbon, night and budget metrics for a route."""
 
-for route in routes:
     segment_distance_map: dict[tuple[str, str], float] = {}
     total_distance = 0.0
     total_carbon = 0.0
-    for index, segment in enumerate(route.get("segments", []), start=1):
-        segment["id"] = f"{route['id']}-seg-{index:02d}"
-        defaults = SEGMENT_MODE_DEFAULTS.get(segment["mode"])
-        if defaults:
-            deep_merge(segment, deepcopy(defaults))
-        specific = SEGMENT_SPECIFICS.get((segment["from"], segment["to"], segment["mode"]))
-        if specific:
-            deep_merge(segment, deepcopy(specific))
+    for segment in route.get("segments", []):
         distance = float(segment.get("distanceKm", 0) or 0)
         segment_distance_map[(segment["from"], segment["to"])] = distance
         total_distance += distance
-        factor = CARBON_FACTORS.get(segment["mode"], 0.0)
+        factor = data_table("CARBON_FACTORS").get(segment["mode"], 0.0)
         carbon = round(distance * factor, 2) if distance else 0.0
         if carbon:
             segment["carbonKg"] = carbon
@@ -2809,23 +311,19 @@ for route in routes:
     metrics["flightCount"] = sum(1 for seg in route.get("segments", []) if seg["mode"] == "flight")
     metrics["stopCount"] = len(route.get("stops", []))
 
+    catalog = load_catalog()
     flight_carbon = 0.0
     for flight in route.get("flights", []):
-        info = FLIGHT_ENRICHMENTS.get(flight["id"])
-        if info:
-            deep_merge(flight, deepcopy(info))
-        if "seatInfo" not in flight and SEGMENT_MODE_DEFAULTS["flight"].get("seatInfo"):
-            flight["seatInfo"] = SEGMENT_MODE_DEFAULTS["flight"]["seatInfo"]
         distance = flight.get("distanceKm") or segment_distance_map.get((flight["fromStopId"], flight["toStopId"]))
         if not distance:
-            from_stop = STOPS.get(flight["fromStopId"])
-            to_stop = STOPS.get(flight["toStopId"])
-            if from_stop and to_stop:
-                distance = haversine_km(from_stop["coordinates"], to_stop["coordinates"])
+            from_coords = catalog.get(flight["fromStopId"], {}).get("coordinates")
+            to_coords = catalog.get(flight["toStopId"], {}).get("coordinates")
+            if from_coords and to_coords:
+                distance = haversine_km(from_coords, to_coords)
         if distance:
             distance = float(distance)
             flight["distanceKm"] = round(distance, 1)
-            carbon = round(distance * CARBON_FACTORS["flight"], 2)
+            carbon = round(distance * data_table("CARBON_FACTORS")["flight"], 2)
             flight["carbonKg"] = carbon
             flight_carbon += carbon
     if flight_carbon:
@@ -2835,9 +333,6 @@ for route in routes:
     total_nights = 0
     total_rate = 0.0
     for stay in route.get("lodging", []):
-        info = LODGING_ENRICHMENTS.get(stay["name"])
-        if info:
-            deep_merge(stay, deepcopy(info))
         nights = nights_between(stay.get("checkIn"), stay.get("checkOut"))
         if nights:
             stay["nights"] = nights
@@ -2848,144 +343,1385 @@ for route in routes:
         metrics["totalNights"] = total_nights
         metrics["avgNightlyRate"] = round(total_rate / total_nights, 2)
     metrics["lodgingCount"] = len(route.get("lodging", []))
-
-    for item in route.get("food", []):
-        info = FOOD_ENRICHMENTS.get(item["name"])
-        if info:
-            deep_merge(item, deepcopy(info))
     metrics["foodCount"] = len(route.get("food", []))
-
-    for activity in route.get("activities", []):
-        info = ACTIVITY_ENRICHMENTS.get(activity["title"])
-        if info:
-            deep_merge(activity, deepcopy(info))
     metrics["activityCount"] = len(route.get("activities", []))
 
-    duration_days = route.get("meta", {}).get("durationDays", META["defaultDurationDays"])
+    duration_days = route.get("meta", {}).get("durationDays", data_table("META")["defaultDurationDays"])
     cost_estimate = route.get("meta", {}).get("costEstimate", 0)
     if duration_days:
         metrics["averageDailyBudget"] = round(cost_estimate / duration_days, 2)
+    return metrics
 
 
-def main() -> None:
-    base_dir = Path(__file__).parent
-    data_dir = base_dir / "data"
-    route_dir = data_dir / "routes"
-    data_dir.mkdir(exist_ok=True)
-    route_dir.mkdir(exist_ok=True)
+# Verkehrsmittel der 2026-Tagesrouten, die in TRANSPORT_MODES anders heißen.
+DAY_MODE_ALIASES = {
+    "car": "drive",
+    "car-rental": "drive",
+    "airport-shuttle": "drive",
+    "tour-operator": "drive",
+    "ship": "ferry",
+    "car-ferry": "ferry",
+}
+
+
+def transport_mode(mode: str | None) -> str:
+    return DAY_MODE_ALIASES.get(mode or "", mode or "")
+
+
+def line_length_km(coordinates: list | None) -> float:
+    """Length of a GeoJSON ``LineString`` (``[lng, lat]`` pairs) along its vertices."""
+
+    coordinates = coordinates or []
+    return sum(
+        haversine_km({"lat": start[1], "lng": start[0]}, {"lat": end[1], "lng": end[0]})
+        for start, end in zip(coordinates, coordinates[1:])
+    )
+
+
+def day_segment_km(segment: dict) -> float | None:
+    """``distanceKm`` of an arrival segment, else the great-circle distance between its ends."""
+
+    if segment.get("distanceKm"):
+        return float(segment["distanceKm"])
+    start = (segment.get("from") or {}).get("coordinates") or {}
+    end = (segment.get("to") or {}).get("coordinates") or {}
+    if "lat" in start and "lng" in start and "lat" in end and "lng" in end:
+        return haversine_km(start, end)
+    return None
+
+
+def day_legs(day: dict, layer_segments: list[dict]) -> list[tuple[str, float]]:
+    """``(mode, km)`` of everything travelled on a day.
+
+    ``arrival.segments`` carry the mode of every leg and win; the day's
+    ``mapLayers.dailySegments`` lines only fill in when a segment has neither a
+    distance nor coordinates, or when the day lists no segments at all.
+    """
+
+    legs = [
+        (transport_mode(segment.get("mode")), day_segment_km(segment))
+        for segment in (day.get("arrival") or {}).get("segments", [])
+    ]
+    if layer_segments and (not legs or any(km is None for _, km in legs)):
+        return [
+            (transport_mode(segment.get("mode")), line_length_km((segment.get("geometry") or {}).get("coordinates")))
+            for segment in layer_segments
+        ]
+    return [(mode, km) for mode, km in legs if km is not None]
+
+
+def day_hotel_stay(days: list[dict], position: int) -> tuple[int, float]:
+    """Nights covered by the hotels of ``days[position]`` and their cost.
+
+    A day's hotels are alternatives: they cover the nights until the next
+    day's date (at least one) and are budgeted with their mean rate.
+    """
+
+    hotels = days[position].get("hotels", [])
+    if not hotels:
+        return 0, 0.0
+    following = days[position + 1].get("date") if position + 1 < len(days) else None
+    nights = nights_between(days[position].get("date"), following) or 1
+    rates = [float(hotel["avgNightlyRateEUR"]) for hotel in hotels if hotel.get("avgNightlyRateEUR")]
+    return nights, (sum(rates) / len(rates) * nights if rates else 0.0)
+
+
+def compute_day_metrics(route: dict) -> dict:
+    """Stage 3 for 2026 day routes – the legacy metrics from ``days[]`` in a single pass.
+
+    Distances come from ``days[].arrival.segments`` (haversine between
+    ``from``/``to`` when ``distanceKm`` is missing) or ``mapLayers.dailySegments``;
+    carbon uses ``CARBON_FACTORS``. Nights come from ``day_hotel_stay`` unless
+    route-level ``lodging`` lists explicit nights. Unlike
+    ``compute_route_metrics`` the route is not modified.
+    """
+
+    layer: dict[str | None, list[dict]] = {}
+    for segment in (route.get("mapLayers") or {}).get("dailySegments", []):
+        layer.setdefault(segment.get("dayId"), []).append(segment)
+
+    days = route.get("days", [])
+    total_distance = 0.0
+    total_carbon = 0.0
+    flight_carbon = 0.0
+    segment_count = 0
+    flight_count = 0
+    hotel_nights = 0
+    hotel_rate = 0.0
+    hotels: set[str] = set()
+    food_count = 0
+    activity_count = 0
+    for position, day in enumerate(days):
+        for mode, distance in day_legs(day, layer.get(day.get("id"), [])):
+            carbon = distance * data_table("CARBON_FACTORS").get(mode, 0.0)
+            total_distance += distance
+            total_carbon += carbon
+            segment_count += 1
+            if mode == "flight":
+                flight_count += 1
+                flight_carbon += carbon
+
+        hotels.update(hotel.get("id") or hotel.get("name", "") for hotel in day.get("hotels", []))
+        nights, spend = day_hotel_stay(days, position)
+        hotel_nights += nights
+        hotel_rate += spend
+
+        activities = day.get("activities", [])
+        activity_count += len(activities)
+        food_count += sum(len(activity.get("restaurants", [])) for activity in activities)
+
+    metrics = {
+        "totalDistanceKm": round(total_distance, 1),
+        "estimatedCarbonKg": round(total_carbon, 1),
+        "segmentCount": segment_count,
+        "flightCount": flight_count,
+        "stopCount": len(days),
+        "dayCount": len(days),
+    }
+    if flight_carbon:
+        metrics["flightCarbonKg"] = round(flight_carbon, 1)
+        metrics["groundTransportCarbonKg"] = round(max(total_carbon - flight_carbon, 0), 1)
+
+    total_nights = 0
+    total_rate = 0.0
+    for stay in route.get("lodging", []):
+        nights = stay.get("nights") or nights_between(stay.get("checkIn"), stay.get("checkOut"))
+        if nights:
+            total_nights += nights
+            total_rate += float(stay.get("avgNightlyRateEUR") or stay.get("pricePerNight") or 0) * nights
+    if not total_nights:
+        total_nights, total_rate = hotel_nights, hotel_rate
+    if total_nights:
+        metrics["totalNights"] = total_nights
+        metrics["avgNightlyRate"] = round(total_rate / total_nights, 2)
+    metrics["lodgingCount"] = len(route.get("lodging", [])) or len(hotels)
+    metrics["foodCount"] = food_count
+    metrics["activityCount"] = activity_count
+
+    duration_days = route.get("meta", {}).get("durationDays", data_table("META")["defaultDurationDays"])
+    cost_estimate = route.get("meta", {}).get("costEstimate", 0)
+    if duration_days:
+        metrics["averageDailyBudget"] = round(cost_estimate / duration_days, 2)
+    return metrics
 
-    route_index: list[dict] = []
 
-    for route in routes:
-        route_copy = deepcopy(route)
-        route_copy["source"] = "curated"
-        route_file = route_dir / f"{route_copy['id']}.json"
-        route_file.write_text(
-            json.dumps(route_copy, indent=2, ensure_ascii=False),
-            encoding="utf-8",
+def _nightly_rates(route: dict) -> list[float]:
+    """Rate of every night listed in route-level ``lodging``, in travel order."""
+
+    rates: list[float] = []
+    for stay in route.get("lodging", []):
+        nights = stay.get("nights") or nights_between(stay.get("checkIn"), stay.get("checkOut"))
+        rates.extend([float(stay.get("avgNightlyRateEUR") or stay.get("pricePerNight") or 0)] * (nights or 0))
+    return rates
+
+
+def _day_timeline_steps(route: dict, geometry: dict) -> Iterator[tuple[str, float, float, float, int, list[str]]]:
+    layer: dict[str | None, list[dict]] = {}
+    for segment in (route.get("mapLayers") or {}).get("dailySegments", []):
+        layer.setdefault(segment.get("dayId"), []).append(segment)
+    days = route["days"]
+    # Route-level lodging is not tied to days; its nights are used up in order, one per calendar day.
+    rates = _nightly_rates(route)
+    start = days[0].get("date")
+    used = 0
+    for position, day in enumerate(days):
+        day_id = day.get("id") or f"day-{position + 1}"
+        legs = day_legs(day, layer.get(day.get("id"), []))
+        if rates:
+            elapsed = nights_between(start, day.get("date")) if start and day.get("date") else position
+            reached = len(rates) if position == len(days) - 1 else min(len(rates), max(elapsed + 1, used))
+            nights, spend = reached - used, sum(rates[used:reached])
+            used = reached
+        else:
+            nights, spend = day_hotel_stay(days, position)
+        features = ((geometry["days"].get(day.get("id")) or {}).get("segments") or {}).get("features", [])
+        yield (
+            day_id,
+            sum(km for _, km in legs),
+            sum(km * data_table("CARBON_FACTORS").get(mode, 0.0) for mode, km in legs),
+            spend,
+            nights,
+            [feature["properties"]["id"] for feature in features],
         )
-        tokens = {
-            route_copy.get("name", ""),
-            route_copy.get("summary", ""),
+
+
+def _segment_timeline_steps(route: dict, geometry: dict) -> list[tuple[str, float, float, float, int, list[str]]]:
+    lodging: dict[str, list[dict]] = {}
+    for stay in route.get("lodging", []):
+        lodging.setdefault(stay.get("stopId"), []).append(stay)
+    flight_prices = {
+        (flight.get("fromStopId"), flight.get("toStopId")): flight.get("price") for flight in route.get("flights", [])
+    }
+    drawn = {feature["properties"]["id"] for feature in geometry["segments"]["features"]}
+
+    def stays(stop_ids: Iterable) -> tuple[int, float]:
+        nights, spend = 0, 0.0
+        for stop_id in stop_ids:
+            for stay in lodging.pop(stop_id, []):
+                stay_nights = stay.get("nights") or nights_between(stay.get("checkIn"), stay.get("checkOut"))
+                nights += stay_nights
+                spend += float(stay.get("pricePerNight") or stay.get("avgNightlyRateEUR") or 0) * stay_nights
+        return nights, spend
+
+    steps = []
+    segments = route["segments"]
+    for index, segment in enumerate(segments):
+        segment_id = segment.get("id") or f"segment-{index + 1}"
+        distance = float(segment.get("distanceKm") or 0)
+        factor = data_table("CARBON_FACTORS").get(transport_mode(segment.get("mode")), 0.0)
+        carbon = segment.get("carbonKg") or distance * factor
+        price = float(segment.get("price") or flight_prices.get((segment.get("from"), segment.get("to"))) or 0)
+        # Lodging counts when its stop is first reached; the start stop belongs to the first step and stays
+        # at stops no segment touches to the last one, so the final totals match the route metrics.
+        stop_ids = [segment.get("from"), segment.get("to")] if index == 0 else [segment.get("to")]
+        if index == len(segments) - 1:
+            stop_ids.extend(list(lodging))
+        nights, spend = stays(stop_ids)
+        active = [segment_id] if segment_id in drawn else []
+        steps.append((segment_id, distance, float(carbon), price + spend, nights, active))
+    return steps
+
+
+def build_timeline(route: dict, geometry: dict) -> dict | None:
+    """Cumulative totals per slider step, parallel to ``buildTimeline`` in ``+page.svelte``.
+
+    Steps are the days of a 2026 route or the segments of a legacy route.
+    Index ``i`` of ``km``, ``carbonKg``, ``spendEUR`` and ``nights`` holds the
+    total up to and including step ``i``; ``segments[i]`` lists the ids of the
+    segment features active in that step. The slider reads one index instead
+    of aggregating all earlier days on every move.
+    """
+
+    if route.get("days"):
+        steps = _day_timeline_steps(route, geometry)
+    elif route.get("segments") and isinstance(route.get("stops"), list):
+        steps = _segment_timeline_steps(route, geometry)
+    else:
+        return None
+    timeline: dict[str, list] = {"steps": [], "km": [], "carbonKg": [], "spendEUR": [], "nights": [], "segments": []}
+    km = carbon = spend = 0.0
+    nights = 0
+    for step_id, step_km, step_carbon, step_spend, step_nights, segment_ids in steps:
+        km += step_km
+        carbon += step_carbon
+        spend += step_spend
+        nights += step_nights
+        timeline["steps"].append(step_id)
+        timeline["km"].append(round(km, 1))
+        timeline["carbonKg"].append(round(carbon, 1))
+        timeline["spendEUR"].append(round(spend, 2))
+        timeline["nights"].append(nights)
+        timeline["segments"].append(segment_ids)
+    return timeline
+
+
+def route_metrics(route: dict) -> dict:
+    """Metrics of a hand-written route; day routes get them computed like the curated variants."""
+
+    if route.get("days") and not route.get("segments"):
+        return {**route.get("metrics", {}), **compute_day_metrics(route)}
+    return route.get("metrics", {})
+
+
+def build_route(definition: dict) -> dict:
+    """Run catalog resolution, enrichment and metrics for a single route."""
+
+    with build_metrics.step("resolve"):
+        route = resolve_route(definition)
+    with build_metrics.step("enrich"):
+        enrich_route(route)
+    with build_metrics.step("metrics"):
+        compute_route_metrics(route)
+    return route
+
+
+def iter_routes(definitions: Iterable[dict] | None = None) -> Iterator[dict]:
+    """Build routes one at a time; nothing but the current route is kept."""
+
+    for definition in data_table("ROUTE_DEFINITIONS") if definitions is None else definitions:
+        yield build_route(definition)
+
+
+def build_routes() -> list[dict]:
+    return list(iter_routes())
+
+
+def __getattr__(name: str):
+    # ``build_data.routes`` used to be filled at import time; keep it working
+    # for older tooling, but only build the routes on first access.
+    if name == "routes":
+        routes = build_routes()
+        globals()["routes"] = routes
+        return routes
+    if name == "CARBON_FACTORS" or name in TABLE_FILES:
+        return data_table(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Bump whenever the enrichment/metrics logic changes so incremental builds
+# do not keep artifacts that were produced by an older pipeline.
+BUILD_SCHEMA_VERSION = 11
+CACHE_DIR_NAME = ".build-cache"
+MANIFEST_NAME = "manifest.sqlite"
+ROUTE_INDEX_SPOOL = "route-index.jsonl"
+EMIT_PROFILES = ("default", "compact")
+IMMUTABLE_DIR = "data/immutable"
+STOPS_CATALOG_KEY = "data/stops/stops-catalog.json"
+STOPS_CATALOG_VERSION = 1
+ASSET_TABLE_KEY = "data/assets/asset-table.json"
+ASSET_ROUTE_DIR = "data/asset-routes"
+
+
+def content_hash(value: object) -> str:
+    """Return a stable SHA-256 digest for raw bytes or JSON-serialisable data."""
+
+    if isinstance(value, bytes):
+        payload = value
+    else:
+        payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def enrichment_tables_hash() -> str:
+    """Hash every shared table a route build depends on."""
+
+    return content_hash(
+        {
+            "schema": BUILD_SCHEMA_VERSION,
+            "meta": data_table("META"),
+            "transportModes": data_table("TRANSPORT_MODES"),
+            "stops": data_table("STOPS"),
+            "stopEnrichments": data_table("STOP_ENRICHMENTS"),
+            "flights": data_table("FLIGHT_ENRICHMENTS"),
+            "segmentDefaults": data_table("SEGMENT_MODE_DEFAULTS"),
+            "segmentSpecifics": {"|".join(key): value for key, value in data_table("SEGMENT_SPECIFICS").items()},
+            "lodging": data_table("LODGING_ENRICHMENTS"),
+            "food": data_table("FOOD_ENRICHMENTS"),
+            "activities": data_table("ACTIVITY_ENRICHMENTS"),
+        }
+    )
+
+
+def file_signature(path: Path) -> dict | None:
+    """Cheap change detector for files on disk (size + mtime)."""
+
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return {"size": stat.st_size, "mtimeNs": stat.st_mtime_ns}
+
+
+def dump_json(value: object, compact: bool = False) -> str:
+    """Serialise an artifact; the compact profile drops all indentation."""
+
+    if compact:
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def write_artifact(path: Path, text: str | bytes, outputs: dict, key: str) -> bool:
+    """Write ``text`` unless the file on disk already holds exactly these bytes.
+
+    ``outputs`` is the manifest section that remembers hash and signature of
+    every artifact, so unchanged files are neither rewritten nor re-read.
+    """
+
+    payload = text if isinstance(text, bytes) else text.encode("utf-8")
+    digest = content_hash(payload)
+    previous = outputs.get(key)
+    signature = file_signature(path)
+    unchanged = bool(previous) and previous.get("sha256") == digest and previous.get("signature") == signature
+    if not unchanged and signature and signature["size"] == len(payload):
+        unchanged = path.read_bytes() == payload
+    if not unchanged:
+        path.write_bytes(payload)
+        build_metrics.record_write(len(payload))
+        signature = file_signature(path)
+    outputs[key] = {"sha256": digest, "signature": signature}
+    return not unchanged
+
+
+def iter_dump_json(value: object, compact: bool = False) -> Iterator[str]:
+    """``dump_json`` in chunks, for artifacts too large to build as one string."""
+
+    if compact:
+        return json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).iterencode(value)
+    return json.JSONEncoder(ensure_ascii=False, indent=2).iterencode(value)
+
+
+def write_artifact_chunks(path: Path, chunks: Iterable[str | bytes], outputs: dict, key: str) -> bool:
+    """Streaming ``write_artifact``: the payload never sits in memory as a whole.
+
+    Chunks go to a temporary sibling while they are hashed; the artifact is
+    only replaced when its content differs.
+    """
+
+    temporary = path.with_name(f"{path.name}.tmp")
+    hasher = hashlib.sha256()
+    size = 0
+
+    def flush(buffer: list[bytes]) -> None:
+        payload = b"".join(buffer)
+        hasher.update(payload)
+        handle.write(payload)
+        buffer.clear()
+
+    with temporary.open("wb") as handle:
+        # ``iterencode`` yields tiny pieces; batch them before hashing/writing.
+        buffer: list[bytes] = []
+        buffered = 0
+        for chunk in chunks:
+            payload = chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+            buffer.append(payload)
+            buffered += len(payload)
+            size += len(payload)
+            if buffered >= 1 << 16:
+                flush(buffer)
+                buffered = 0
+        flush(buffer)
+    digest = hasher.hexdigest()
+    previous = outputs.get(key)
+    signature = file_signature(path)
+    unchanged = bool(previous) and previous.get("sha256") == digest and previous.get("signature") == signature
+    if not unchanged and signature and signature["size"] == size:
+        with path.open("rb") as handle:
+            unchanged = hashlib.file_digest(handle, "sha256").hexdigest() == digest
+    if unchanged:
+        temporary.unlink()
+    else:
+        os.replace(temporary, path)
+        build_metrics.record_write(size)
+        signature = file_signature(path)
+    outputs[key] = {"sha256": digest, "signature": signature}
+    return not unchanged
+
+
+SEARCH_TOKEN_FIELDS = Selector(
+    "name",
+    "summary",
+    "meta.theme",
+    "tags[*]",
+    "stops[*].name",
+    "food[*].name",
+    "activities[*].title",
+    "flights[*].flightNumber",
+    "days[*].station.name",
+    "days[*].hotels[*].name",
+    "days[*].activities[*].name",
+)
+
+
+def collect_search_tokens(route: dict) -> list[str]:
+    """Texts a route should be findable by; they feed the inverted search index."""
+
+    return sorted({token for token in SEARCH_TOKEN_FIELDS.values(route) if isinstance(token, str) and token})
+
+
+def curated_index_entry(route: dict, file: str) -> dict:
+    return {
+        "id": route["id"],
+        "file": file,
+        "name": route.get("name"),
+        "summary": route.get("summary"),
+        "color": route.get("color"),
+        "tags": route.get("tags", []),
+        "meta": route.get("meta", {}),
+        "metrics": route.get("metrics", {}),
+        "searchTokens": collect_search_tokens(route),
+    }
+
+
+def extra_index_entry(route: dict, file: str, fallback_id: str) -> dict:
+    return {
+        "id": route.get("id", fallback_id),
+        "file": file,
+        "name": route.get("name", "Unbenannte Route"),
+        "summary": route.get("summary", ""),
+        "color": route.get("color", "#cccccc"),
+        "tags": route.get("tags", []),
+        "meta": route.get("meta", {}),
+        "metrics": route_metrics(route),
+        "searchTokens": collect_search_tokens(route),
+    }
+
+
+def detail_level_key(route_id: str, min_zoom: int) -> str:
+    return f"data/geo/{route_id}.z{min_zoom}.json"
+
+
+def route_output_keys(route_id: str) -> list[str]:
+    # Detail levels that a route does not need are simply absent; their
+    # missing signature matches the missing manifest record.
+    return [
+        f"data/routes/{route_id}.json",
+        f"data/geo/{route_id}.json",
+        *(detail_level_key(route_id, min_zoom) for min_zoom, _ in ZOOM_BANDS[1:]),
+    ]
+
+
+def _apply_line_geometries(features: list[dict], geometries: dict[str, list]) -> None:
+    for feature in features:
+        coordinates = geometries.get(str(feature["properties"]["order"]))
+        if coordinates is not None:
+            feature["geometry"] = {"type": "LineString", "coordinates": coordinates}
+
+
+def emit_geometry(route: dict, data_dir: Path, outputs: dict) -> tuple[dict, int]:
+    """Write the ready-to-render GeoJSON of a route and return its index reference.
+
+    The main artifact carries the overview level of every line; more detailed
+    zoom bands go to ``data/geo/<id>.z<minZoom>.json`` and are listed under
+    ``levels``. Bounds always come from the full-resolution geometry.
+    """
+
+    geometry = build_route_geometry(route, data_table("TRANSPORT_MODES"))
+    route_id = route["id"]
+    lines = {
+        str(feature["properties"]["order"]): feature["geometry"]["coordinates"]
+        for feature in geometry["segments"]["features"]
+    }
+    levels = build_detail_levels(lines)
+    _apply_line_geometries(geometry["segments"]["features"], levels[0]["geometries"])
+    for day in geometry["days"].values():
+        _apply_line_geometries(day["segments"]["features"], levels[0]["geometries"])
+
+    timeline = build_timeline(route, geometry)
+    if timeline:
+        geometry["timeline"] = timeline
+
+    (data_dir / "geo").mkdir(exist_ok=True)
+    changed = 0
+    geometry["levels"] = [{"minZoom": levels[0]["minZoom"], "maxZoom": levels[0]["maxZoom"]}]
+    written_keys = set()
+    for level in levels[1:]:
+        key = detail_level_key(route_id, level["minZoom"])
+        payload = {
+            "version": LOD_ARTIFACT_VERSION,
+            "routeId": route_id,
+            "minZoom": level["minZoom"],
+            "maxZoom": level["maxZoom"],
+            "geometries": level["geometries"],
         }
-        tokens.update(route_copy.get("tags", []))
-        tokens.update(stop.get("name", "") for stop in route_copy.get("stops", []))
-        tokens.update(food.get("name", "") for food in route_copy.get("food", []))
-        tokens.update(activity.get("title", "") for activity in route_copy.get("activities", []))
-        tokens.update(flight.get("flightNumber", "") for flight in route_copy.get("flights", []))
-        clean_tokens = sorted({token for token in tokens if token})
-        route_index.append(
-            {
-                "id": route_copy["id"],
-                "file": f"data/routes/{route_copy['id']}.json",
-                "name": route_copy.get("name"),
-                "summary": route_copy.get("summary"),
-                "color": route_copy.get("color"),
-                "tags": route_copy.get("tags", []),
-                "meta": route_copy.get("meta", {}),
-                "metrics": route_copy.get("metrics", {}),
-                "searchTokens": clean_tokens,
-            }
+        changed += write_artifact(
+            data_dir.parent / key, json.dumps(payload, ensure_ascii=False, separators=(",", ":")), outputs, key
         )
-    
-    existing_ids = {item["id"] for item in route_index}
-
-    # Scan for additional JSON files in the routes directory
-    for route_file in route_dir.glob("*.json"):
-        try:
-            content = route_file.read_text(encoding="utf-8")
-            json_data = json.loads(content)
-            
-            # Normalize to list of routes
-            routes_in_file = json_data if isinstance(json_data, list) else [json_data]
-            
-            for route_data in routes_in_file:
-                # Skip if already in index (from hardcoded routes)
-                if route_data.get("id") in existing_ids:
+        written_keys.add(key)
+        geometry["levels"].append({"minZoom": level["minZoom"], "maxZoom": level["maxZoom"], "file": key})
+    for min_zoom, _ in ZOOM_BANDS[1:]:
+        key = detail_level_key(route_id, min_zoom)
+        if key not in written_keys and outputs.pop(key, None) is not None:
+            (data_dir.parent / key).unlink(missing_ok=True)
+
+    file = f"data/geo/{route_id}.json"
+    changed += write_artifact(
+        data_dir / "geo" / f"{route_id}.json",
+        json.dumps(geometry, ensure_ascii=False, separators=(",", ":")),
+        outputs,
+        file,
+    )
+    return {"file": file, "bounds": geometry["bounds"]}, changed
+
+
+def emit_stops_catalog(base_dir: Path, outputs: dict, compact: bool) -> tuple[str, int, int]:
+    """Write the enriched stop catalog under a content-hashed name.
+
+    Returns the artifact key, the number of stops and whether it was written.
+    """
+
+    catalog = load_catalog()
+    text = dump_json({"version": STOPS_CATALOG_VERSION, "stops": catalog}, compact)
+    key = immutable_key(STOPS_CATALOG_KEY, content_hash(text.encode("utf-8")))
+    (base_dir / key).parent.mkdir(parents=True, exist_ok=True)
+    return key, len(catalog), write_artifact(base_dir / key, text, outputs, key)
+
+
+def stop_references(route: dict, stops_catalog: str) -> dict:
+    """Replace catalog stops by their ids and point the route at ``stops_catalog``.
+
+    Only records that are the shared catalog objects themselves are replaced;
+    anything route-specific stays inline.
+    """
+
+    catalog = load_catalog()
+    references = [
+        stop["id"] if isinstance(stop, dict) and catalog.get(stop.get("id")) is stop else stop
+        for stop in route.get("stops", [])
+    ]
+    return overlay(route, {"stops": references, "stopsCatalog": stops_catalog})
+
+
+def emit_route(
+    route: dict, route_dir: Path, outputs: dict, compact: bool = False, stops_catalog: str | None = None
+) -> tuple[dict, int]:
+    """Stage 4 – serialise a built route and return its index entry.
+
+    With ``stops_catalog`` the route file lists stop ids only; index entry and
+    geometry are still derived from the full stops.
+    """
+
+    with build_metrics.step("copy"):
+        route_copy = overlay(route, {"source": "curated"})
+        emitted = stop_references(route_copy, stops_catalog) if stops_catalog and "stops" in route_copy else route_copy
+    file = f"data/routes/{route_copy['id']}.json"
+    with build_metrics.step("serialize"):
+        text = dump_json(emitted, compact)
+    with build_metrics.step("write"):
+        changed = write_artifact(route_dir / f"{route_copy['id']}.json", text, outputs, file)
+    index_entry = curated_index_entry(route_copy, file)
+    with build_metrics.step("geometry"):
+        index_entry["geo"], geo_changed = emit_geometry(route_copy, route_dir.parent, outputs)
+    return index_entry, changed + geo_changed
+
+
+def _emit_definition(
+    task: tuple[dict, str, dict, bool, str | None, dict | None],
+) -> tuple[dict, dict, int, dict | None]:
+    """Worker entry point: build and write one route in a separate process.
+
+    Only the route's own manifest records travel to the worker and back, so
+    results can be merged into the manifest in submission order.
+    """
+
+    definition, route_dir, outputs, compact, stops_catalog, instrument = task
+    with build_metrics.route_probe(definition["id"], instrument) as probe:
+        index_entry, changed = emit_route(build_route(definition), Path(route_dir), outputs, compact, stops_catalog)
+    return index_entry, outputs, changed, probe["record"]
+
+
+def _resolved(result: tuple) -> Future:
+    future: Future = Future()
+    future.set_result(result)
+    return future
+
+
+def emit_routes(
+    definitions: Iterable[dict],
+    route_dir: Path,
+    outputs: dict,
+    jobs: int = 1,
+    compact: bool = False,
+    instrument: dict | None = None,
+    stops_catalog: str | None = None,
+    reuse: Callable[[dict], dict | None] | None = None,
+) -> Iterator[tuple[dict, int]]:
+    """Build and emit routes lazily, optionally fanned out over ``jobs`` processes.
+
+    Definitions are pulled only as fast as results are consumed – at most
+    ``jobs * 4`` routes are in flight – so memory does not grow with the
+    catalog. ``reuse(definition)`` may return a cached index entry instead of
+    building the route. Results keep the order of ``definitions`` regardless
+    of which worker finishes first, so ``routeIndex`` stays deterministic.
+    """
+
+    pool = None
+    limit = jobs * 4 if jobs > 1 else 0
+    window: deque[Future] = deque()
+    instrumentation = build_metrics.active()
+
+    def take() -> tuple[dict, int]:
+        index_entry, records, changed, measurement = window.popleft().result()
+        outputs.update(records)
+        if measurement and instrumentation:
+            instrumentation.add_route(measurement)
+        return index_entry, changed
+
+    try:
+        for definition in definitions:
+            cached = reuse(definition) if reuse else None
+            if cached is not None:
+                window.append(_resolved((cached, {}, 0, None)))
+            else:
+                task = (
+                    definition,
+                    str(route_dir),
+                    {key: outputs[key] for key in route_output_keys(definition["id"]) if key in outputs},
+                    compact,
+                    stops_catalog,
+                    instrument,
+                )
+                if limit:
+                    if pool is None:
+                        load_catalog()
+                        pool = ProcessPoolExecutor(max_workers=jobs)
+                    window.append(pool.submit(_emit_definition, task))
+                else:
+                    window.append(_resolved(_emit_definition(task)))
+            while len(window) > limit:
+                yield take()
+        while window:
+            yield take()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+def extra_output_keys(route_id: str) -> list[str]:
+    # A hand-written route keeps its own JSON file; only the derived artifacts count.
+    return [key for key in route_output_keys(route_id) if key != f"data/routes/{route_id}.json"]
+
+
+def _scan_route_file(task: tuple) -> tuple[dict | None, dict, int, list[dict], str | None]:
+    """Hash, parse and index one hand-written route file (also in a ``--jobs`` worker).
+
+    Returns the manifest record, the touched output records, the number of
+    written artifacts, instrumentation records and an error message. The
+    parsed routes stay in the worker; only their index entries and spatial
+    places travel back to the parent.
+    """
+
+    path, signature, cached, base_dir, outputs, curated_ids, instrument = task
+    route_file = Path(path)
+    base_dir = Path(base_dir)
+    written = 0
+    measurements = []
+    try:
+        content = route_file.read_bytes()
+        digest = content_hash(content)
+        if cached and cached.get("sha256") == digest:
+            return {**cached, "signature": signature}, outputs, 0, [], None
+        json_data = json.loads(content)
+        del content
+        # Normalize to list of routes
+        routes_in_file = json_data if isinstance(json_data, list) else [json_data]
+        record = {
+            "signature": signature,
+            "sha256": digest,
+            "entries": [],
+            "places": [place for route_data in routes_in_file for place in route_places(route_data)],
+        }
+        for route_data in routes_in_file:
+            entry = extra_index_entry(route_data, f"data/routes/{route_file.name}", route_file.stem)
+            if entry["id"] not in curated_ids:
+                with build_metrics.route_probe(entry["id"], instrument) as probe:
+                    entry["geo"], changed = emit_geometry({**route_data, "id": entry["id"]}, base_dir / "data", outputs)
+                    written += changed
+                if probe["record"]:
+                    measurements.append(probe["record"])
+            record["entries"].append(entry)
+    except Exception as e:
+        return None, outputs, written, measurements, str(e)
+    return record, outputs, written, measurements, None
+
+
+def scan_extra_routes(
+    base_dir: Path,
+    curated_ids: Container[str],
+    manifest: BuildManifest,
+    jobs: int = 1,
+    instrument: dict | None = None,
+) -> Iterator[tuple[list[dict], int]]:
+    """Index hand-written route files that are not produced by this script.
+
+    A file whose size and mtime are unchanged since the last build in
+    ``manifest`` – and whose derived artifacts are intact – is not even read;
+    one with an unchanged content hash is not parsed. The remaining files are
+    parsed, indexed and get their GeoJSON in
+    up to ``jobs`` processes, at most ``jobs * 4`` files at a time. Files the
+    curated build just wrote (``<id>.json`` of ``curated_ids``) are skipped.
+
+    Yields the index entries and the number of written artifacts per file, in
+    file order; the file records go straight to ``manifest``.
+    """
+
+    outputs = manifest.outputs
+    route_dir = base_dir / "data" / "routes"
+    pool = None
+    limit = jobs * 4 if jobs > 1 else 0
+    window: deque[tuple[str, Future, bool]] = deque()
+    instrumentation = build_metrics.active()
+
+    def take() -> tuple[list[dict], int]:
+        name, future, parsed = window.popleft()
+        record, changed_outputs, changed, measurements, error = future.result()
+        outputs.update(changed_outputs)
+        if instrumentation:
+            for measurement in measurements:
+                instrumentation.add_route(measurement)
+        if error is not None:
+            print(f"Skipping {name}: {error}")
+            return [], changed
+        manifest.add_extra_file(name, record)
+        if parsed:
+            # The worker only saw the records of the last parse of this file; derived
+            # artifacts it did not write now (unused detail levels) go.
+            for entry in record["entries"]:
+                if entry["id"] in curated_ids:
                     continue
-                    
-                # Add to index
-                tokens = {
-                    route_data.get("name", ""),
-                    route_data.get("summary", ""),
-                }
-                tokens.update(route_data.get("tags", []))
-                tokens.update(stop.get("name", "") for stop in route_data.get("stops", []))
-                tokens.update(food.get("name", "") for food in route_data.get("food", []))
-                tokens.update(activity.get("title", "") for activity in route_data.get("activities", []))
-                tokens.update(flight.get("flightNumber", "") for flight in route_data.get("flights", []))
-                clean_tokens = sorted({token for token in tokens if token})
-                
-                route_index.append(
-                    {
-                        "id": route_data.get("id", route_file.stem),
-                        "file": f"data/routes/{route_file.name}",
-                        "name": route_data.get("name", "Unbenannte Route"),
-                        "summary": route_data.get("summary", ""),
-                        "color": route_data.get("color", "#cccccc"),
-                        "tags": route_data.get("tags", []),
-                        "meta": route_data.get("meta", {}),
-                        "metrics": route_data.get("metrics", {}),
-                        "searchTokens": clean_tokens,
-                    }
+                for key in extra_output_keys(entry["id"]):
+                    if key not in changed_outputs and outputs.pop(key, None) is not None:
+                        (base_dir / key).unlink(missing_ok=True)
+        return record["entries"], changed
+
+    try:
+        for name in sorted(route_file.name for route_file in route_dir.glob("*.json")):
+            route_file = route_dir / name
+            if route_file.stem in curated_ids:
+                continue
+            signature = file_signature(route_file)
+            cached = manifest.previous_extra_file(name)
+            keys = [key for entry in cached["entries"] for key in extra_output_keys(entry["id"])] if cached else []
+            if cached and not all(
+                outputs.get(key, {}).get("signature") == file_signature(base_dir / key) for key in keys
+            ):
+                # Someone deleted or edited a derived artifact: emit the file again.
+                cached = None
+            if cached and cached.get("signature") == signature:
+                window.append((name, _resolved((cached, {}, 0, [], None)), False))
+            else:
+                task = (
+                    str(route_file),
+                    signature,
+                    cached,
+                    str(base_dir),
+                    {key: outputs[key] for key in keys if key in outputs},
+                    curated_ids,
+                    instrument,
                 )
-                existing_ids.add(route_data.get("id"))
-                print(f"Added additional route: {route_data.get('id', route_file.name)}")
-            
-        except Exception as e:
-            print(f"Skipping {route_file.name}: {e}")
+                if limit:
+                    if pool is None:
+                        pool = ProcessPoolExecutor(max_workers=jobs)
+                    window.append((name, pool.submit(_scan_route_file, task), True))
+                else:
+                    window.append((name, _resolved(_scan_route_file(task)), True))
+            while len(window) > limit:
+                yield take()
+        while window:
+            yield take()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
 
-    poi_candidates = []
+def build_poi_overview(catalog: dict[str, dict]) -> list[dict]:
     skip_types = {"airport", "bus"}
-    for stop in STOPS.values():
-        if stop.get("type") in skip_types:
-            continue
-        if not stop.get("description"):
-            continue
-        poi_candidates.append(deepcopy(stop))
-
-    poi_path = data_dir / "poi-overview.json"
-    poi_path.write_text(
-        json.dumps({"items": poi_candidates}, indent=2, ensure_ascii=False),
-        encoding="utf-8",
-    )
+    return [
+        stop
+        for stop in catalog.values()
+        if stop.get("type") not in skip_types and stop.get("description")
+    ]
+
+
+def build_spatial_index(catalog: dict[str, dict], extra_places: Iterable[dict]) -> SpatialIndex:
+    places = catalog_places(catalog)
+    places.extend(extra_places)
+    return SpatialIndex(places)
+
+
+def build_search_index(route_index: Iterable[dict]) -> SearchIndex:
+    return SearchIndex.build((entry["id"], entry.get("searchTokens", [])) for entry in route_index)
+
+
+def public_index_entry(entry: dict) -> dict:
+    # Search texts only live in data/search-index.json; keep them out of the
+    # index that blocks first paint.
+    return {key: value for key, value in entry.items() if key != "searchTokens"}
 
+
+def build_dataset(
+    route_index: list[dict],
+    poi_count: int,
+    spatial_count: int = 0,
+    stops_catalog: dict | None = None,
+    asset_table: dict | None = None,
+) -> dict:
     data = {
-        "meta": META,
-        "transportModes": TRANSPORT_MODES,
-        "tagLibrary": TAG_LIBRARY,
-        "gallery": GALLERY,
-        "events": EVENTS,
-        "templates": TEMPLATES,
-        "routeIndex": route_index,
+        "meta": data_table("META"),
+        "transportModes": data_table("TRANSPORT_MODES"),
+        "tagLibrary": data_table("TAG_LIBRARY"),
+        "gallery": data_table("GALLERY"),
+        "events": data_table("EVENTS"),
+        "templates": data_table("TEMPLATES"),
+        "routeIndex": [public_index_entry(entry) for entry in route_index],
+        "searchIndex": {
+            "file": "data/search-index.json",
+        },
         "poiOverview": {
             "file": "data/poi-overview.json",
-            "count": len(poi_candidates),
+            "count": poi_count,
+        },
+        "spatialIndex": {
+            "file": "data/spatial-index.json",
+            "count": spatial_count,
         },
     }
-    output_path = base_dir / "travel-routes-data.json"
-    output_path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-    print(f"JSON geschrieben: {output_path}")
+    if stops_catalog:
+        data["stopsCatalog"] = stops_catalog
+    if asset_table:
+        data["assetTable"] = asset_table
+    return data
+
+
+# Platzhalter für ``routeIndex`` im Datensatz-Gerüst; Steuerzeichen kommen in
+# echten Daten nicht vor und werden von JSON eindeutig kodiert.
+_ROUTE_INDEX_MARKER = "\0routeIndex"
+
+
+def iter_dataset_json(dataset: dict, entries: Iterable[dict], compact: bool) -> Iterator[str]:
+    """``dump_json(dataset)`` with ``routeIndex`` streamed from ``entries``."""
+
+    head, tail = dump_json({**dataset, "routeIndex": _ROUTE_INDEX_MARKER}, compact).split(
+        json.dumps(_ROUTE_INDEX_MARKER), 1
+    )
+    # ``routeIndex`` is a top-level key, so its items sit two levels deep.
+    opening, separator, closing = ("[", ",", "]") if compact else ("[\n    ", ",\n    ", "\n  ]")
+    yield head
+    empty = True
+    for entry in entries:
+        text = dump_json(entry, compact)
+        yield (opening if empty else separator) + (text if compact else text.replace("\n", "\n    "))
+        empty = False
+    yield "[]" if empty else closing
+    yield tail
+
+
+def _drop_asset_routes(base_dir: Path, outputs: OutputRecords, keep: Container[str]) -> None:
+    for key in outputs.keys_with_prefix(f"{ASSET_ROUTE_DIR}/"):
+        if key not in keep:
+            outputs.pop(key)
+            (base_dir / key).unlink(missing_ok=True)
+
+
+def emit_asset_routes(
+    base_dir: Path, route_index: Iterable[dict], outputs: dict, compact: bool, spool: IndexSpool
+) -> tuple[dict, int, list[str]]:
+    """Rewrite every route file against one shared image asset table.
+
+    Route files are read back from disk, so curated and hand-written routes
+    are treated alike; the sources in ``data/routes/`` stay untouched and the
+    rewritten copies go to ``data/asset-routes/``. Index entries pointing at
+    the copies are appended to ``spool``. Returns the ``assetTable`` dataset
+    entry, the number of written artifacts and a size report.
+    """
+
+    table = AssetTable()
+    rewritten: dict[str, str] = {}
+    written = before = after = 0
+    (base_dir / ASSET_ROUTE_DIR).mkdir(parents=True, exist_ok=True)
+    for entry in route_index:
+        source = entry.get("file")
+        if source and source not in rewritten:
+            try:
+                data = json.loads((base_dir / source).read_text(encoding="utf-8"))
+            except (OSError, ValueError) as error:
+                print(f"Asset-Tabelle: {source} übersprungen ({error})")
+                rewritten[source] = source
+            else:
+                key = f"{ASSET_ROUTE_DIR}/{Path(source).name}"
+                text = dump_json(table.rewrite(data), compact)
+                before += len(dump_json(data, compact).encode("utf-8"))
+                after += len(text.encode("utf-8"))
+                written += write_artifact(base_dir / key, text, outputs, key)
+                rewritten[source] = key
+        spool.append({**entry, "file": rewritten[source]} if source else entry)
+    _drop_asset_routes(base_dir, outputs, set(rewritten.values()))
+
+    table_text = dump_json(table.to_artifact(), compact)
+    table_key = immutable_key(ASSET_TABLE_KEY, content_hash(table_text.encode("utf-8")))
+    (base_dir / table_key).parent.mkdir(parents=True, exist_ok=True)
+    written += write_artifact(base_dir / table_key, table_text, outputs, table_key)
+    after += len(table_text.encode("utf-8"))
+
+    saved = before - after
+    report = [
+        f"Asset-Tabelle: {table.references} Bildverweise auf {len(table.assets)} Einträge "
+        f"({table.conflicts} abweichende Bilder inline belassen)",
+        f"  Routen-Dateien {before:,} B → {after:,} B inkl. Tabelle, gespart {saved:,} B "
+        f"({saved / before:.1%})" if before else "  Keine Routen-Dateien gefunden.",
+    ]
+    return {"file": table_key, "count": len(table.assets)}, written, report
+
+
+def immutable_key(key: str, digest: str) -> str:
+    path = Path(key)
+    return f"{IMMUTABLE_DIR}/{path.parent.name}/{path.stem}.{digest[:12]}{path.suffix}"
+
+
+def publish_immutable(base_dir: Path, key: str, digest: str, outputs: dict) -> tuple[str, int]:
+    """Copy an artifact to its content-hashed name and return that name."""
+
+    target = immutable_key(key, digest)
+    record = outputs.get(target)
+    if record and record.get("sha256") == digest and record.get("signature") == file_signature(base_dir / target):
+        return target, 0
+    (base_dir / target).parent.mkdir(parents=True, exist_ok=True)
+    return target, write_artifact(base_dir / target, (base_dir / key).read_bytes(), outputs, target)
+
+
+def hashed_index_entry(
+    base_dir: Path, entry: dict, extra_files: Mapping[str, dict], outputs: dict
+) -> tuple[dict, int]:
+    """Point ``file`` and ``geo.file`` of an index entry at immutable copies."""
+
+    def digest_of(key: str) -> str | None:
+        if key in outputs:
+            return outputs[key]["sha256"]
+        record = extra_files.get(Path(key).name)
+        return record.get("sha256") if record and key.startswith("data/routes/") else None
+
+    hashed = dict(entry)
+    written = 0
+    digest = entry.get("file") and digest_of(entry["file"])
+    if digest:
+        hashed["file"], written = publish_immutable(base_dir, entry["file"], digest, outputs)
+    geo = entry.get("geo") or {}
+    digest = geo.get("file") and digest_of(geo["file"])
+    if digest:
+        file, changed = publish_immutable(base_dir, geo["file"], digest, outputs)
+        hashed["geo"] = {**geo, "file": file}
+        written += changed
+    return hashed, written
+
+
+def prune_immutable(base_dir: Path, outputs: OutputRecords, keep: KeySet) -> None:
+    for key in outputs.keys_with_prefix(f"{IMMUTABLE_DIR}/"):
+        if key not in keep:
+            outputs.pop(key)
+            (base_dir / key).unlink(missing_ok=True)
+
+
+def _best_decode_seconds(decode: Callable[[], object], repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def compact_size_report(base_dir: Path, keys: list[str]) -> list[str]:
+    """Compare size and decode time of indented JSON, minified JSON and CBOR.
+
+    Every JSON artifact is re-serialised in all three encodings, so the
+    columns describe exactly the same data. Only minified JSON is written;
+    CBOR stays a comparison, the page would have to decode it in JavaScript.
+    """
+
+    totals = {"JSON (indent=2)": [0, 0.0], "JSON (minifiziert)": [0, 0.0], "CBOR": [0, 0.0]}
+    for key in keys:
+        value = json.loads((base_dir / key).read_bytes())
+        pretty = json.dumps(value, indent=2, ensure_ascii=False)
+        minified = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        binary = cbor_codec.dumps(value)
+        for label, size, decode in (
+            ("JSON (indent=2)", len(pretty.encode("utf-8")), lambda: json.loads(pretty)),
+            ("JSON (minifiziert)", len(minified.encode("utf-8")), lambda: json.loads(minified)),
+            ("CBOR", len(binary), lambda: cbor_codec.loads(binary)),
+        ):
+            totals[label][0] += size
+            totals[label][1] += _best_decode_seconds(decode)
+
+    baseline = totals["JSON (indent=2)"][0] or 1
+    lines = [f"Kompaktes Profil: {len(keys)} Artefakt(e) im Vergleich"]
+    for label, (size, seconds) in totals.items():
+        lines.append(
+            f"  {label:<20}{size / 1024:>10.1f} KiB{size / baseline:>8.0%}{seconds * 1000:>10.1f} ms Dekodieren"
+        )
+    return lines
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Nur Artefakte neu schreiben, deren Eingaben sich laut Build-Manifest geändert haben.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Routen parallel in N Prozessen bauen und geänderte Routen-Dateien scannen (0 = Anzahl CPU-Kerne).",
+    )
+    parser.add_argument(
+        "--profile",
+        choices=EMIT_PROFILES,
+        default="default",
+        help="Ausgabeprofil: 'compact' schreibt minifiziertes JSON und vergleicht Größe und Dekodierzeit "
+        "von Routen und Index mit eingerücktem JSON und CBOR.",
+    )
+    parser.add_argument(
+        "--hash-names",
+        action="store_true",
+        help="Routen- und Geo-Dateien zusätzlich unter inhaltsgehashten Namen in data/immutable/ ablegen "
+        "und routeIndex darauf verweisen lassen.",
+    )
+    parser.add_argument(
+        "--shared-stops",
+        action="store_true",
+        help="Stopps einmal als inhaltsgehashten Katalog (data/immutable/stops/) schreiben; "
+        "Routen-Dateien enthalten nur noch Stopp-IDs.",
+    )
+    parser.add_argument(
+        "--asset-table",
+        action="store_true",
+        help="Identische Bildeinträge aller Routen in eine gemeinsame Asset-Tabelle auslagern, Routen-Kopien "
+        "mit Verweisen in data/asset-routes/ schreiben und die Ersparnis melden.",
+    )
+    parser.add_argument(
+        "--strict-enrichment",
+        action="store_true",
+        help="Build abbrechen, wenn eine Unterkunft, ein Restaurant, eine Aktivität oder ein Flug kein "
+        "Enrichment findet.",
+    )
+    parser.add_argument(
+        "--instrument",
+        type=Path,
+        default=None,
+        metavar="BERICHT.json",
+        help="Zeit, CPU, tracemalloc-Peak und geschriebene Bytes pro Phase und Route messen und als JSON ablegen.",
+    )
+    parser.add_argument(
+        "--no-tracemalloc",
+        dest="tracemalloc",
+        action="store_false",
+        help="Bei --instrument auf Speichermessung verzichten (deutlich schneller).",
+    )
+    parser.add_argument(
+        "--cprofile",
+        type=Path,
+        default=None,
+        metavar="ORDNER",
+        help="Bei --instrument zusätzlich pro Phase ein cProfile-Dump (<phase>.prof) schreiben.",
+    )
+    args = parser.parse_args(argv)
+    if args.cprofile and not args.instrument:
+        parser.error("--cprofile setzt --instrument voraus")
+    if args.jobs < 0:
+        parser.error("--jobs muss >= 0 sein")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+
+def run_build(
+    args: argparse.Namespace, definitions: Iterable[dict] | None = None, base_dir: Path | None = None
+) -> None:
+    """Run the whole build as a stream.
+
+    ``definitions`` may be any iterable – also a generator of 100k synthetic
+    routes – and is consumed once. Built routes are written immediately and
+    their index entries go to a JSON-lines spool and their manifest records
+    to an SQLite manifest in the cache directory, so the per-route bookkeeping
+    does not grow in memory with the number of routes.
+    """
+
+    definitions = data_table("ROUTE_DEFINITIONS") if definitions is None else definitions
+    base_dir = base_dir or Path(__file__).parent
+    data_dir = base_dir / "data"
+    route_dir = data_dir / "routes"
+    cache_dir = base_dir / CACHE_DIR_NAME
+    data_dir.mkdir(exist_ok=True)
+    route_dir.mkdir(exist_ok=True)
+    cache_dir.mkdir(exist_ok=True)
+    compact = args.profile == "compact"
+    instrument = {"memory": args.tracemalloc} if args.instrument else None
+
+    with build_metrics.phase("manifest"):
+        manifest = BuildManifest(cache_dir / MANIFEST_NAME, BUILD_SCHEMA_VERSION)
+        previous = manifest.previous
+        tables_hash = enrichment_tables_hash()
+        # A full build ignores the route fingerprints but keeps ``outputs``:
+        # only with it can stale artifacts of earlier runs be pruned.
+        manifest.reuse_routes = bool(
+            args.incremental
+            and previous.get("tables") == tables_hash
+            and previous.get("profile") == args.profile
+            and previous.get("sharedStops", False) == args.shared_stops
+        )
+        manifest.set_meta(
+            schema=BUILD_SCHEMA_VERSION, tables=tables_hash, profile=args.profile, sharedStops=args.shared_stops
+        )
+        outputs = manifest.outputs
+        written = 0
+
+        # Index entries of unchanged routes are read back from the previous
+        # build's spool by offset; its size guards against a stale file.
+        spool_path = cache_dir / ROUTE_INDEX_SPOOL
+        signature = file_signature(spool_path)
+        previous_spool = None
+        if manifest.reuse_routes and signature and signature["size"] == previous.get("routeIndexSize"):
+            previous_spool = spool_path.open("rb")
+        route_index = IndexSpool(cache_dir / f"{ROUTE_INDEX_SPOOL}.next")
+
+    def reuse(definition: dict) -> dict | None:
+        input_hash = content_hash(definition)
+        cached = manifest.previous_route(definition["id"]) if previous_spool else None
+        manifest.add_route(definition["id"], input_hash)
+        if (
+            cached
+            and cached["input"] == input_hash
+            and all(
+                outputs.get(key, {}).get("signature") == file_signature(base_dir / key)
+                for key in route_output_keys(definition["id"])
+            )
+        ):
+            # Inputs and artifact are untouched: skip enrichment, metrics and emit.
+            return read_entry(previous_spool, cached["offset"])
+        return None
+
+    stops_catalog = None
+    with build_metrics.phase("catalog"):
+        load_catalog()
+        if args.shared_stops:
+            catalog_key, stop_count, changed = emit_stops_catalog(base_dir, outputs, compact)
+            stops_catalog = {"file": catalog_key, "count": stop_count}
+            written += changed
+
+    index_ids = manifest.key_set("index_ids")
+    for join in enrichment_joins().values():
+        join.reset()
+    try:
+        with build_metrics.phase("routes"):
+            for index_entry, changed in emit_routes(
+                observed_definitions(definitions),
+                route_dir,
+                outputs,
+                args.jobs,
+                compact,
+                instrument,
+                stops_catalog and stops_catalog["file"],
+                reuse,
+            ):
+                manifest.set_offset(index_entry["id"], route_index.append(index_entry))
+                index_ids.add(index_entry["id"])
+                written += changed
+    finally:
+        if previous_spool:
+            previous_spool.close()
+
+    report = enrichment_report()
+    for line in enrichment_report_lines(report):
+        print(line)
+    if args.strict_enrichment and any(section.get("missCount") for section in report.values()):
+        raise SystemExit("Abbruch (--strict-enrichment): Einträge ohne Enrichment, siehe oben.")
+
+    curated_ids = manifest.route_ids()
+    try:
+        with build_metrics.phase("scan"):
+            # Scan for additional JSON files in the routes directory
+            for extra_entries, changed in scan_extra_routes(
+                base_dir, curated_ids, manifest, args.jobs, instrument
+            ):
+                written += changed
+                for entry in extra_entries:
+                    # Skip if already in index (from hardcoded routes)
+                    if not index_ids.add(entry["id"]):
+                        continue
+                    route_index.append(entry)
+                    print(f"Added additional route: {entry['id']}")
+    finally:
+        curated_ids.close()
+    manifest.set_meta(routeIndexSize=route_index.close().size)
+
+    with build_metrics.phase("poi"):
+        poi_candidates = build_poi_overview(load_catalog())
+        written += write_artifact(
+            data_dir / "poi-overview.json",
+            dump_json({"items": poi_candidates}, compact),
+            outputs,
+            "data/poi-overview.json",
+        )
+
+    with build_metrics.phase("spatial"):
+        spatial_index = build_spatial_index(load_catalog(), manifest.places())
+        written += write_artifact(
+            data_dir / "spatial-index.json",
+            json.dumps(spatial_index.to_artifact(), ensure_ascii=False, separators=(",", ":")),
+            outputs,
+            "data/spatial-index.json",
+        )
+
+    with build_metrics.phase("search"):
+        written += write_artifact_chunks(
+            data_dir / "search-index.json",
+            iter_dump_json(build_search_index(route_index).to_artifact(), compact=True),
+            outputs,
+            "data/search-index.json",
+        )
+
+    asset_table = None
+    temporary_spools: list[IndexSpool] = []
+    with build_metrics.phase("assets"):
+        asset_index = route_index
+        if args.asset_table:
+            asset_index = IndexSpool(cache_dir / "asset-index.jsonl")
+            temporary_spools.append(asset_index)
+            asset_table, changed, asset_report = emit_asset_routes(base_dir, route_index, outputs, compact, asset_index)
+            written += changed
+        else:
+            _drop_asset_routes(base_dir, outputs, set())
+    if args.asset_table:
+        for line in asset_report:
+            print(line)
+
+    with build_metrics.phase("immutable"):
+        public_index = asset_index
+        if args.hash_names:
+            public_index = IndexSpool(cache_dir / "public-index.jsonl")
+            temporary_spools.append(public_index)
+            for entry in asset_index:
+                hashed, changed = hashed_index_entry(base_dir, entry, manifest.extra_files, outputs)
+                public_index.append(hashed)
+                written += changed
+        keep = manifest.key_set("immutable_keep")
+        if stops_catalog:
+            keep.add(stops_catalog["file"])
+        if asset_table:
+            keep.add(asset_table["file"])
+        for entry in public_index:
+            keep.add(entry["file"])
+            if entry.get("geo"):
+                keep.add(entry["geo"]["file"])
+        prune_immutable(base_dir, outputs, keep)
+
+    with build_metrics.phase("dataset"):
+        data = build_dataset([], len(poi_candidates), len(spatial_index), stops_catalog, asset_table)
+        entries = (public_index_entry(entry) for entry in public_index)
+        output_path = base_dir / "travel-routes-data.json"
+        chunks = iter_dataset_json(data, entries, compact)
+        if write_artifact_chunks(output_path, chunks, outputs, "travel-routes-data.json"):
+            written += 1
+            print(f"JSON geschrieben: {output_path}")
+        else:
+            print(f"JSON unverändert: {output_path}")
+    for spool in temporary_spools:
+        spool.path.unlink(missing_ok=True)
+
+    if compact:
+        route_keys = [entry["file"] for entry in route_index]
+        for line in compact_size_report(base_dir, [*route_keys, "travel-routes-data.json"]):
+            print(line)
+
+    # .gz/.br-Geschwister früherer ``--precompress``-Builds; Vercel und GitHub Pages komprimieren selbst.
+    for pattern in ("*.json.gz", "*.json.br", "data/**/*.gz", "data/**/*.br"):
+        for stale in base_dir.glob(pattern):
+            outputs.pop(stale.relative_to(base_dir).as_posix(), None)
+            stale.unlink()
+
+    os.replace(route_index.path, spool_path)
+    manifest.commit()
+    # Cache-Dateien älterer Builds: JSON-Manifest und Distanzmatrizen
+    (cache_dir / "manifest.json").unlink(missing_ok=True)
+    for stale in cache_dir.glob("distances-*.f64"):
+        stale.unlink()
+    # CBOR-Zwillinge älterer ``--profile compact``-Builds samt .gz/.br und Kopien in data/immutable/
+    for pattern in ("travel-routes-data.cbor*", "data/routes/*.cbor*", f"{IMMUTABLE_DIR}/routes/*.cbor*"):
+        for stale in base_dir.glob(pattern):
+            stale.unlink()
+    print(f"{written} Artefakt(e) aktualisiert.")
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if not args.instrument:
+        run_build(args)
+        return
+    with BuildInstrumentation(track_memory=args.tracemalloc, cprofile_dir=args.cprofile) as instrumentation:
+        run_build(args)
+    instrumentation.write_report(args.instrument)
+    print(f"Messbericht geschrieben: {args.instrument}")
 
 
 if __name__ == "__main__":
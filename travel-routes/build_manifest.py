@@ -0,0 +1,275 @@
+"""Build-Manifest als SQLite-Datenbank statt als JSON-Objekt im Speicher.
+
+Das Manifest merkt sich pro Route den Eingabe-Hash und den Offset im
+Index-Spool, pro Artefakt Hash und Signatur und pro handgeschriebener
+Routen-Datei deren Index-Einträge und Orte für den räumlichen Index. Als
+``dict`` lagen diese Datensätze bis zum Schreiben am Ende des Builds im
+Speicher – rund 4,5 KB pro Route, bei 100 000 Routen fast ein halbes Gigabyte.
+
+``BuildManifest`` schreibt sie stattdessen sofort in
+``.build-cache/manifest.sqlite.next`` und liest die des letzten Builds per
+``ATTACH`` aus ``manifest.sqlite``. ``outputs`` verhält sich wie ein ``dict``
+(Artefakt-Schlüssel → Hash und Signatur), sodass ``write_artifact()`` & Co.
+nichts davon merken. Erst ``commit()`` ersetzt das alte Manifest; ein
+abgebrochener Build lässt es unangetastet.
+
+``RouteIds`` prüft „ist diese Route kuratiert?“ gegen eine Datenbank statt
+gegen ein ``frozenset`` – auch in ``--jobs``-Workern, denen nur der Pfad
+übergeben wird. Dafür landen die Routen-Ids in einer eigenen, danach nur noch
+gelesenen Datei; in ``manifest.sqlite.next`` schreibt der Build weiter.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+from collections.abc import Mapping, MutableMapping
+from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.parse import quote
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS routes (id TEXT PRIMARY KEY, input TEXT NOT NULL, offset INTEGER);
+CREATE TABLE IF NOT EXISTS outputs (key TEXT PRIMARY KEY, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS extra_files (name TEXT PRIMARY KEY, record TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS places (file TEXT NOT NULL, item TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS places_by_file ON places (file);
+"""
+# Schlüssel werden seitenweise gelesen, damit die Tabelle währenddessen geändert werden darf.
+_PAGE_SIZE = 512
+
+
+def _uri(path: Path, mode: str) -> str:
+    return f"file:{quote(str(path.resolve()))}?mode={mode}"
+
+
+def _dumps(value: object) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+class OutputRecords(MutableMapping):
+    """``dict``-like view of the ``outputs`` table: artifact key → ``{sha256, signature, …}``.
+
+    Values are copies; assign a new record instead of mutating the one returned.
+    """
+
+    def __init__(self, db: sqlite3.Connection) -> None:
+        self._db = db
+
+    def __getitem__(self, key: str) -> dict:
+        row = self._db.execute("SELECT record FROM main.outputs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __setitem__(self, key: str, record: dict) -> None:
+        self._db.execute("INSERT OR REPLACE INTO main.outputs VALUES (?, ?)", (key, _dumps(record)))
+
+    def __delitem__(self, key: str) -> None:
+        if not self._db.execute("DELETE FROM main.outputs WHERE key = ?", (key,)).rowcount:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return self._db.execute("SELECT 1 FROM main.outputs WHERE key = ?", (key,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[str]:
+        return self.keys_with_prefix("")
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM main.outputs").fetchone()[0]
+
+    def keys_with_prefix(self, prefix: str) -> Iterator[str]:
+        """Sorted keys starting with ``prefix``; safe to add or remove records meanwhile."""
+
+        last = prefix
+        while True:
+            rows = self._db.execute(
+                "SELECT key FROM main.outputs WHERE key > ? ORDER BY key LIMIT ?", (last, _PAGE_SIZE)
+            ).fetchall()
+            for (key,) in rows:
+                if not key.startswith(prefix):
+                    return
+                yield key
+            if len(rows) < _PAGE_SIZE:
+                return
+            last = rows[-1][0]
+
+
+class ExtraFileRecords(Mapping):
+    """Records of the hand-written route files indexed by the current build (without places)."""
+
+    def __init__(self, db: sqlite3.Connection) -> None:
+        self._db = db
+
+    def __getitem__(self, name: str) -> dict:
+        row = self._db.execute("SELECT record FROM main.extra_files WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        return json.loads(row[0])
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for (name,) in self._db.execute("SELECT name FROM main.extra_files ORDER BY rowid"))
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM main.extra_files").fetchone()[0]
+
+
+class KeySet:
+    """Set of strings in a temporary table, for per-route bookkeeping that must not grow in memory."""
+
+    def __init__(self, db: sqlite3.Connection, name: str) -> None:
+        self._db = db
+        self._table = f"temp.{name}"
+        db.execute(f"CREATE TEMP TABLE IF NOT EXISTS {name} (key TEXT PRIMARY KEY)")
+        db.execute(f"DELETE FROM {self._table}")
+
+    def add(self, key: str) -> bool:
+        """Add ``key``; ``True`` if it was not in the set yet."""
+
+        return self._db.execute(f"INSERT OR IGNORE INTO {self._table} VALUES (?)", (key,)).rowcount == 1
+
+    def update(self, keys: Iterable[str]) -> None:
+        self._db.executemany(f"INSERT OR IGNORE INTO {self._table} VALUES (?)", ((key,) for key in keys))
+
+    def __contains__(self, key: object) -> bool:
+        return self._db.execute(f"SELECT 1 FROM {self._table} WHERE key = ?", (key,)).fetchone() is not None
+
+
+class RouteIds:
+    """``in``-lookup of a snapshot of route ids, picklable for ``--jobs`` workers."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = str(path)
+        self._db: sqlite3.Connection | None = None
+
+    def __getstate__(self) -> dict:
+        return {"path": self.path, "_db": None}
+
+    def __contains__(self, route_id: object) -> bool:
+        if self._db is None:
+            self._db = sqlite3.connect(_uri(Path(self.path), "ro"), uri=True)
+        return self._db.execute("SELECT 1 FROM routes WHERE id = ?", (route_id,)).fetchone() is not None
+
+    def close(self) -> None:
+        """Close the lookup and delete its snapshot."""
+
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+        Path(self.path).unlink(missing_ok=True)
+
+
+class BuildManifest:
+    """Manifest of the running build, backed by SQLite, with read access to the previous one."""
+
+    def __init__(self, path: Path, schema: int) -> None:
+        self.path = path
+        self.schema = schema
+        self._next_path = path.with_name(f"{path.name}.next")
+        self._next_path.unlink(missing_ok=True)
+        self._db = sqlite3.connect(_uri(self._next_path, "rwc"), uri=True)
+        # Der Cache ist jederzeit neu aufbaubar: kein fsync, Journal nur im Speicher.
+        self._db.execute("PRAGMA synchronous = OFF")
+        self._db.execute("PRAGMA journal_mode = MEMORY")
+        self._db.executescript(_SCHEMA)
+        self.previous = self._attach_previous()
+        # Route and file records of the last build are only reused while ``reuse_routes`` holds.
+        self.reuse_routes = bool(self.previous)
+        if self.previous:
+            self._db.execute("INSERT INTO main.outputs SELECT key, record FROM previous.outputs")
+        self.outputs = OutputRecords(self._db)
+        self.extra_files = ExtraFileRecords(self._db)
+
+    def _attach_previous(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            self._db.execute("ATTACH DATABASE ? AS previous", (_uri(self.path, "ro"),))
+            meta = {key: json.loads(value) for key, value in self._db.execute("SELECT key, value FROM previous.meta")}
+        except sqlite3.DatabaseError:
+            meta = {}
+        if meta.get("schema") != self.schema:
+            if self._db.execute("SELECT 1 FROM pragma_database_list WHERE name = 'previous'").fetchone():
+                self._db.execute("DETACH DATABASE previous")
+            return {}
+        return meta
+
+    def set_meta(self, **values: object) -> None:
+        self._db.executemany(
+            "INSERT OR REPLACE INTO main.meta VALUES (?, ?)", [(key, _dumps(value)) for key, value in values.items()]
+        )
+
+    def previous_route(self, route_id: str) -> dict | None:
+        """``{input, offset}`` of a route in the last build, if its records may be reused."""
+
+        if not self.reuse_routes:
+            return None
+        row = self._db.execute("SELECT input, offset FROM previous.routes WHERE id = ?", (route_id,)).fetchone()
+        return {"input": row[0], "offset": row[1]} if row else None
+
+    def add_route(self, route_id: str, input_hash: str) -> None:
+        self._db.execute("INSERT OR REPLACE INTO main.routes (id, input) VALUES (?, ?)", (route_id, input_hash))
+
+    def set_offset(self, route_id: str, offset: int) -> None:
+        self._db.execute("UPDATE main.routes SET offset = ? WHERE id = ?", (offset, route_id))
+
+    def route_ids(self) -> RouteIds:
+        """Snapshot of the routes added so far, e.g. the curated ids for the scan."""
+
+        path = self.path.with_name(f"{self.path.stem}-routes.sqlite")
+        path.unlink(missing_ok=True)
+        self._db.commit()
+        self._db.execute("ATTACH DATABASE ? AS snapshot", (_uri(path, "rwc"),))
+        self._db.execute("CREATE TABLE snapshot.routes (id TEXT PRIMARY KEY)")
+        self._db.execute("INSERT INTO snapshot.routes SELECT id FROM main.routes")
+        self._db.commit()
+        self._db.execute("DETACH DATABASE snapshot")
+        return RouteIds(path)
+
+    def key_set(self, name: str) -> KeySet:
+        """Empty on-disk set ``name`` that lives as long as this manifest."""
+
+        return KeySet(self._db, name)
+
+    def previous_extra_file(self, name: str) -> dict | None:
+        """Record of a hand-written route file in the last build (without its places)."""
+
+        if not self.reuse_routes:
+            return None
+        row = self._db.execute("SELECT record FROM previous.extra_files WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def add_extra_file(self, name: str, record: dict) -> None:
+        """Store a file record; without ``places`` the places of the last build are carried over."""
+
+        places = record.get("places")
+        record = {key: value for key, value in record.items() if key != "places"}
+        self._db.execute("INSERT OR REPLACE INTO main.extra_files VALUES (?, ?)", (name, _dumps(record)))
+        self._db.execute("DELETE FROM main.places WHERE file = ?", (name,))
+        if places is not None:
+            self._db.executemany("INSERT INTO main.places VALUES (?, ?)", [(name, _dumps(place)) for place in places])
+        elif self.previous:
+            self._db.execute("INSERT INTO main.places SELECT file, item FROM previous.places WHERE file = ?", (name,))
+
+    def places(self) -> Iterator[dict]:
+        """Spatial-index places of all indexed files, in file order."""
+
+        cursor = self._db.execute(
+            "SELECT item FROM main.places JOIN main.extra_files ON name = file ORDER BY extra_files.rowid, places.rowid"
+        )
+        return (json.loads(item) for (item,) in cursor)
+
+    def commit(self) -> None:
+        """Replace the previous manifest with this one."""
+
+        self._db.commit()
+        self._db.close()
+        os.replace(self._next_path, self.path)
+
+    def close(self) -> None:
+        """Discard this manifest (e.g. after a failed build); the previous one stays."""
+
+        self._db.close()
+        self._next_path.unlink(missing_ok=True)
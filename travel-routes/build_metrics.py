@@ -0,0 +1,230 @@
+"""Opt-in Messungen für ``build_data.py``: Zeit, CPU, Speicher und Bytes.
+
+``BuildInstrumentation`` misst Phasen (``catalog``, ``routes``, ``scan`` …)
+und einzelne Routen: Wall-Clock, CPU-Zeit, den ``tracemalloc``-Peak und die
+Bytes, die ``write_artifact`` geschrieben hat. Innerhalb einer Route werden
+zusätzlich die Schritte (``resolve``, ``enrich``, ``metrics``, ``copy``,
+``serialize``, ``write``, ``geometry``) nach Zeit aufgeschlüsselt.
+Optional legt jede Phase ein cProfile-Dump ``<phase>.prof`` ab.
+
+Ohne aktive Instrumentierung sind ``phase()``, ``route()``, ``step()`` und
+``record_write()`` No-ops – der normale Build zahlt dafür praktisch nichts.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Iterator
+
+REPORT_VERSION = 1
+
+_ACTIVE: "BuildInstrumentation | None" = None
+
+
+class Measurement:
+    """Wall/CPU time, traced memory peak and bytes written for one scope."""
+
+    def __init__(self, name: str, track_memory: bool) -> None:
+        self.name = name
+        self.track_memory = track_memory
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.bytes_written = 0
+        self.files_written = 0
+        self.peak = 0
+        self.steps: dict[str, dict] = {}
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+        self._start_traced = tracemalloc.get_traced_memory()[0] if track_memory else 0
+
+    def observe_peak(self) -> None:
+        if self.track_memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+
+    def stop(self) -> None:
+        self.wall = time.perf_counter() - self._start_wall
+        self.cpu = time.process_time() - self._start_cpu
+        self.observe_peak()
+
+    def add_step(self, name: str, wall: float, cpu: float) -> None:
+        step = self.steps.setdefault(name, {"wallSeconds": 0.0, "cpuSeconds": 0.0, "calls": 0})
+        step["wallSeconds"] += wall
+        step["cpuSeconds"] += cpu
+        step["calls"] += 1
+
+    def as_dict(self) -> dict:
+        record = {
+            "name": self.name,
+            "wallSeconds": round(self.wall, 6),
+            "cpuSeconds": round(self.cpu, 6),
+            "bytesWritten": self.bytes_written,
+            "filesWritten": self.files_written,
+        }
+        if self.track_memory:
+            record["peakAllocatedBytes"] = max(0, self.peak - self._start_traced)
+        if self.steps:
+            record["steps"] = {
+                name: {**step, "wallSeconds": round(step["wallSeconds"], 6), "cpuSeconds": round(step["cpuSeconds"], 6)}
+                for name, step in self.steps.items()
+            }
+        return record
+
+
+class BuildInstrumentation:
+    def __init__(self, track_memory: bool = True, cprofile_dir: Path | None = None) -> None:
+        self.track_memory = track_memory
+        self.cprofile_dir = cprofile_dir
+        self.phases: list[dict] = []
+        self.routes: list[dict] = []
+        self._open: list[Measurement] = []
+        self._started_tracemalloc = False
+        self._pid = os.getpid()
+
+    def __enter__(self) -> "BuildInstrumentation":
+        global _ACTIVE
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.cprofile_dir:
+            self.cprofile_dir.mkdir(parents=True, exist_ok=True)
+        self._pid = os.getpid()
+        _ACTIVE = self
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        global _ACTIVE
+        _ACTIVE = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+
+    @contextmanager
+    def _measure(self, name: str) -> Iterator[Measurement]:
+        # A nested scope resets the tracemalloc peak; fold it into the outer
+        # scopes first so their peaks stay correct.
+        for measurement in self._open:
+            measurement.observe_peak()
+        if self.track_memory:
+            tracemalloc.reset_peak()
+        measurement = Measurement(name, self.track_memory)
+        self._open.append(measurement)
+        try:
+            yield measurement
+        finally:
+            measurement.stop()
+            self._open.pop()
+            for outer in self._open:
+                outer.observe_peak()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[Measurement]:
+        profiler = cProfile.Profile() if self.cprofile_dir else None
+        with self._measure(name) as measurement:
+            if profiler:
+                profiler.enable()
+            try:
+                yield measurement
+            finally:
+                if profiler:
+                    profiler.disable()
+        if profiler:
+            profiler.dump_stats(str(self.cprofile_dir / f"{name}.prof"))
+        self.phases.append(measurement.as_dict())
+
+    @contextmanager
+    def route(self, route_id: str) -> Iterator[Measurement]:
+        with self._measure(route_id) as measurement:
+            yield measurement
+        self.routes.append(measurement.as_dict())
+
+    def add_route(self, record: dict) -> None:
+        """Merge a route measured in a worker process."""
+
+        self.routes.append(record)
+        for measurement in self._open:
+            measurement.bytes_written += record["bytesWritten"]
+            measurement.files_written += record["filesWritten"]
+
+    def record_write(self, size: int) -> None:
+        for measurement in self._open:
+            measurement.bytes_written += size
+            measurement.files_written += 1
+
+    def record_step(self, name: str, wall: float, cpu: float) -> None:
+        if self._open:
+            self._open[-1].add_step(name, wall, cpu)
+
+    def report(self) -> dict:
+        return {
+            "version": REPORT_VERSION,
+            "tracemalloc": self.track_memory,
+            "phases": self.phases,
+            "routes": self.routes,
+            "totals": {
+                "wallSeconds": round(sum(phase["wallSeconds"] for phase in self.phases), 6),
+                "cpuSeconds": round(sum(phase["cpuSeconds"] for phase in self.phases), 6),
+                "bytesWritten": sum(phase["bytesWritten"] for phase in self.phases),
+                "peakAllocatedBytes": max((phase.get("peakAllocatedBytes", 0) for phase in self.phases), default=0),
+            },
+        }
+
+    def write_report(self, path: Path) -> None:
+        path.write_text(json.dumps(self.report(), indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+
+
+def active() -> BuildInstrumentation | None:
+    return _ACTIVE
+
+
+def phase(name: str):
+    return _ACTIVE.phase(name) if _ACTIVE is not None else nullcontext()
+
+
+def route(route_id: str):
+    return _ACTIVE.route(route_id) if _ACTIVE is not None else nullcontext()
+
+
+def record_write(size: int) -> None:
+    if _ACTIVE is not None:
+        _ACTIVE.record_write(size)
+
+
+@contextmanager
+def step(name: str) -> Iterator[None]:
+    if _ACTIVE is None:
+        yield
+        return
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        yield
+    finally:
+        _ACTIVE.record_step(name, time.perf_counter() - start_wall, time.process_time() - start_cpu)
+
+
+@contextmanager
+def route_probe(route_id: str, options: dict | None) -> Iterator[dict]:
+    """Measure one route, also inside a worker process of ``--jobs``.
+
+    In the main process the active instrumentation records the route itself.
+    A worker has none (or only a forked copy of the parent's), so a temporary
+    one is started and its record is handed back through ``probe["record"]``
+    for the parent to merge.
+    """
+
+    probe: dict = {"record": None}
+    if options is None:
+        yield probe
+    elif _ACTIVE is not None and _ACTIVE._pid == os.getpid():
+        with _ACTIVE.route(route_id):
+            yield probe
+    else:
+        with BuildInstrumentation(track_memory=options.get("memory", True)) as instrumentation:
+            with instrumentation.route(route_id):
+                yield probe
+        probe["record"] = instrumentation.routes[0]
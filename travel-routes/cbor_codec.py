@@ -0,0 +1,147 @@
+"""CBOR-Kodierung (RFC 8949) für die Build-Artefakte – ohne Zusatzpakete.
+
+Das kompakte Build-Profil vergleicht damit Größe und Dekodierzeit von Routen
+und Routen-Index mit JSON; geschrieben wird nur minifiziertes JSON. Unterstützt
+wird genau das, was JSON auch kennt: ``None``, ``bool``, ``int``, ``float``,
+``str``, Listen und Dicts mit String-Schlüsseln. Floats werden in der kürzesten
+Breite (16/32/64 Bit) geschrieben, die den Wert verlustfrei abbildet
+("preferred serialization").
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+
+_FLOAT_FORMATS = ((0xF9, ">e"), (0xFA, ">f"), (0xFB, ">d"))
+
+
+def _head(major: int, value: int) -> bytes:
+    if value < 24:
+        return bytes((major << 5 | value,))
+    if value < 0x100:
+        return bytes((major << 5 | 24, value))
+    if value < 0x10000:
+        return bytes((major << 5 | 25,)) + value.to_bytes(2, "big")
+    if value < 0x100000000:
+        return bytes((major << 5 | 26,)) + value.to_bytes(4, "big")
+    if value < 0x10000000000000000:
+        return bytes((major << 5 | 27,)) + value.to_bytes(8, "big")
+    raise ValueError(f"Integer außerhalb des CBOR-Bereichs: {value}")
+
+
+def _encode_float(value: float) -> bytes:
+    if math.isnan(value) or math.isinf(value):
+        return b"\xf9" + struct.pack(">e", value)
+    for prefix, fmt in _FLOAT_FORMATS:
+        try:
+            packed = struct.pack(fmt, value)
+        except OverflowError:
+            continue
+        if struct.unpack(fmt, packed)[0] == value:
+            return bytes((prefix,)) + packed
+    raise AssertionError("float64 must round-trip")  # pragma: no cover
+
+
+def _encode(value: object, out: bytearray) -> None:
+    if value is None:
+        out.append(0xF6)
+    elif value is True:
+        out.append(0xF5)
+    elif value is False:
+        out.append(0xF4)
+    elif isinstance(value, int):
+        out += _head(0, value) if value >= 0 else _head(1, -1 - value)
+    elif isinstance(value, float):
+        out += _encode_float(value)
+    elif isinstance(value, str):
+        encoded = value.encode("utf-8")
+        out += _head(3, len(encoded))
+        out += encoded
+    elif isinstance(value, (bytes, bytearray)):
+        out += _head(2, len(value))
+        out += value
+    elif isinstance(value, (list, tuple)):
+        out += _head(4, len(value))
+        for item in value:
+            _encode(item, out)
+    elif isinstance(value, dict):
+        out += _head(5, len(value))
+        for key, item in value.items():
+            if not isinstance(key, str):
+                raise TypeError(f"CBOR-Schlüssel müssen Strings sein, nicht {type(key).__name__}")
+            _encode(key, out)
+            _encode(item, out)
+    else:
+        raise TypeError(f"Nicht in CBOR kodierbar: {type(value).__name__}")
+
+
+def dumps(value: object) -> bytes:
+    out = bytearray()
+    _encode(value, out)
+    return bytes(out)
+
+
+class _Decoder:
+    def __init__(self, data: bytes) -> None:
+        self.data = memoryview(data)
+        self.position = 0
+
+    def _argument(self, info: int) -> int:
+        if info < 24:
+            return info
+        size = {24: 1, 25: 2, 26: 4, 27: 8}.get(info)
+        if size is None:
+            raise ValueError(f"Nicht unterstützte CBOR-Länge {info} an Position {self.position}")
+        start = self.position
+        self.position += size
+        return int.from_bytes(self.data[start : self.position], "big")
+
+    def _take(self, size: int) -> memoryview:
+        start = self.position
+        self.position += size
+        if self.position > len(self.data):
+            raise ValueError("CBOR-Daten sind abgeschnitten")
+        return self.data[start : self.position]
+
+    def decode(self) -> object:
+        initial = self.data[self.position]
+        self.position += 1
+        major, info = initial >> 5, initial & 0x1F
+        if major == 7:
+            if info == 20:
+                return False
+            if info == 21:
+                return True
+            if info in (22, 23):
+                return None
+            for prefix, fmt in _FLOAT_FORMATS:
+                if initial == prefix:
+                    return struct.unpack(fmt, self._take(struct.calcsize(fmt)))[0]
+            raise ValueError(f"Nicht unterstützter CBOR-Wert 0x{initial:02x}")
+        argument = self._argument(info)
+        if major == 0:
+            return argument
+        if major == 1:
+            return -1 - argument
+        if major == 2:
+            return bytes(self._take(argument))
+        if major == 3:
+            return str(self._take(argument), "utf-8")
+        if major == 4:
+            return [self.decode() for _ in range(argument)]
+        if major == 5:
+            result = {}
+            for _ in range(argument):
+                key = self.decode()
+                result[key] = self.decode()
+            return result
+        raise ValueError(f"Nicht unterstützter CBOR-Major-Typ {major}")
+
+
+def loads(data: bytes) -> object:
+    decoder = _Decoder(data)
+    value = decoder.decode()
+    if decoder.position != len(decoder.data):
+        raise ValueError("Überzählige Bytes nach dem CBOR-Wert")
+    return value
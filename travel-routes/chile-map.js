@@ -10,6 +10,13 @@
 /** @typedef {import('geojson').Feature} Feature */
 /** @typedef {import('geojson').Geometry} Geometry */
 
+import {
+  createSharedTableLoader,
+  hasStopReferences,
+  resolveAssetReferences,
+  resolveStopReferences as resolveStopIds,
+} from './route-references.js';
+
 const SEGMENT_SOURCE_ID = 'chile-segments';
 const SEGMENT_LAYER_ID = 'chile-segments-line';
 const SEGMENT_LAYER_DASHED_ID = 'chile-segments-line-dashed';
@@ -362,11 +369,13 @@ function resolveAssetUrl(relativePath) {
 }
 
 /**
- * Lädt JSON-Dateien immer ohne Cache, damit GitHub Pages sofort aktualisierte
- * Varianten liefert – praktisch beim Debuggen.
+ * Lädt JSON-Dateien ohne Cache, damit GitHub Pages sofort aktualisierte
+ * Varianten liefert – praktisch beim Debuggen. Inhaltsgehashte Dateien aus
+ * `data/immutable/` ändern sich nie und dürfen aus dem Browser-Cache kommen.
  */
 async function fetchJson(resource) {
-  const response = await fetch(resource, { cache: 'no-store' });
+  const immutable = /\/data\/immutable\//.test(resource);
+  const response = await fetch(resource, { cache: immutable ? 'force-cache' : 'no-store' });
   if (!response.ok) {
     throw new Error(`(${response.status}) ${response.statusText}`);
   }
@@ -390,10 +399,29 @@ async function ensureRouteDetail(id) {
   }
   const file = entry.file ?? `data/routes/${entry.id}.json`;
   const detail = await fetchJson(resolveAssetUrl(`./${file.replace(/^\.\//, '')}`));
+  await resolveStopReferences(detail);
+  // Mit `build_data.py --asset-table` stehen Bilder nur als `{ asset: "<id>" }` in der Route.
+  if (dataset.assetTable?.file) {
+    resolveAssetReferences(detail, await loadSharedTable(dataset.assetTable.file, 'assets'));
+  }
   routeCache.set(id, detail);
   return detail;
 }
 
+// Gemeinsame Tabellen (Stopp-Katalog, Asset-Tabelle) laden wir pro Datei nur einmal.
+const loadSharedTable = createSharedTableLoader((file) =>
+  fetchJson(resolveAssetUrl(`./${file.replace(/^\.\//, '')}`)),
+);
+
+// Routen aus `build_data.py --shared-stops` enthalten nur Stopp-IDs; die Stopps
+// selbst stehen einmal im gemeinsamen Katalog.
+async function resolveStopReferences(route) {
+  if (!route?.stopsCatalog || !hasStopReferences(route)) {
+    return route;
+  }
+  return resolveStopIds(route, await loadSharedTable(route.stopsCatalog, 'stops'));
+}
+
 // Für Einsteiger:innen: Beide Kartenvarianten nutzen jetzt exakt die gleichen
 // Raster-Tiles. So verschwindet die alte CARTO-Style-URL und nur noch eine
 // MapLibre-Konfiguration bleibt übrig.
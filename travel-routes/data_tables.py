@@ -0,0 +1,55 @@
+"""Datentabellen des Builds als JSON-Dateien mit binärem Cache.
+
+Stopps, Enrichments, Metadaten und die kuratierten Routen-Definitionen liegen
+in ``travel-routes/tables/*.json`` statt als Python-Literale in
+``build_data.py``. Wer Daten pflegt, ändert nur diese Dateien.
+
+``load_table()`` liest eine Tabelle erst, wenn eine Stage sie braucht. Die
+geparste Fassung landet als Pickle in ``.build-cache/tables/`` – der
+Dateiname enthält den SHA-256 der JSON-Datei, eine geänderte Datei wird also
+automatisch neu geparst. Alte Cache-Dateien derselben Tabelle werden dabei
+entfernt.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+
+CACHE_SUBDIR = "tables"
+
+
+def _cache_path(cache_dir: Path, path: Path, digest: str) -> Path:
+    return cache_dir / CACHE_SUBDIR / f"{path.stem}.{digest[:16]}.pickle"
+
+
+def _write_cache(target: Path, value: object) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    for stale in target.parent.glob(f"{target.name.split('.', 1)[0]}.*.pickle"):
+        if stale != target:
+            stale.unlink(missing_ok=True)
+    temporary = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+    temporary.write_bytes(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    os.replace(temporary, target)
+
+
+def load_table(path: Path, cache_dir: Path | None = None) -> object:
+    """Parsed content of a JSON table, via the pickle cache when its hash is known."""
+
+    raw = path.read_bytes()
+    if cache_dir is None:
+        return json.loads(raw)
+    cached = _cache_path(cache_dir, path, hashlib.sha256(raw).hexdigest())
+    try:
+        return pickle.loads(cached.read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+    value = json.loads(raw)
+    try:
+        _write_cache(cached, value)
+    except OSError:
+        pass  # Ein schreibgeschützter Checkout baut trotzdem, nur ohne Cache.
+    return value
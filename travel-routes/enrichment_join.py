@@ -0,0 +1,116 @@
+"""Kompilierte Joins zwischen Routen-Einträgen und Enrichment-Tabellen.
+
+Unterkünfte, Restaurants, Aktivitäten, Flüge und Segmente werden über
+Freitext-Schlüssel (Name, Titel, ``(from, to, mode)``) mit ihren Enrichments
+verbunden. ``EnrichmentJoin`` normalisiert diese Schlüssel (Unicode-NFKC,
+Groß-/Kleinschreibung, Leerraum), sodass „Hotel  casa Higueras“ denselben
+Eintrag trifft wie „Hotel Casa Higueras“.
+
+Jedes Enrichment wird einmal zu einem Merge-Plan kompiliert: ein Tupel aus
+``(Schlüssel, Wert, verschachtelter Plan)``, dessen Werte eingefroren und
+geteilt sind. Beim Anwenden entfällt so die rekursive Typprüfung von
+``deep_merge`` ebenso wie jedes ``deepcopy``.
+
+``observe`` zählt Treffer und Fehlgriffe, ohne etwas zu verändern. Daraus
+entsteht der Bericht über Einträge ohne Enrichment und über Enrichments, die
+keine Route mehr verwendet.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from typing import Callable, Iterable
+
+from frozen_data import FrozenDict, freeze
+
+MergePlan = tuple[tuple[str, object, "MergePlan | None"], ...]
+# Misses are counted in full, but only this many are kept as examples for the report.
+MISS_EXAMPLES = 50
+
+
+def normalize_key(value: object) -> object:
+    """Case-, whitespace- and Unicode-insensitive form of a join key (also inside tuples)."""
+
+    if isinstance(value, tuple):
+        return tuple(normalize_key(part) for part in value)
+    if isinstance(value, str):
+        return " ".join(unicodedata.normalize("NFKC", value).casefold().split())
+    return value
+
+
+def compile_plan(enrichment: dict) -> MergePlan:
+    """Merge plan of an enrichment: frozen values plus plans for nested dicts."""
+
+    return tuple(
+        (key, value, compile_plan(value) if isinstance(value, dict) else None)
+        for key, value in freeze(enrichment).items()
+    )
+
+
+def apply_plan(target: dict, plan: MergePlan) -> dict:
+    """``deep_merge`` with a precompiled plan; shared sub-dicts are copied before writing."""
+
+    for key, value, nested in plan:
+        current = target.get(key)
+        if nested is not None and isinstance(current, dict):
+            if isinstance(current, FrozenDict):
+                current = target[key] = dict(current)
+            apply_plan(current, nested)
+        else:
+            target[key] = value
+    return target
+
+
+class EnrichmentJoin:
+    """One enrichment table, indexed by normalized key."""
+
+    def __init__(self, name: str, table: dict, key: Callable[[dict], object], required: bool = True) -> None:
+        self.name = name
+        self.table = table
+        self.key = key
+        # Required joins expect an enrichment for every record; misses are reported.
+        self.required = required
+        self._plans: dict[object, MergePlan] = {}
+        self._names: dict[object, object] = {}
+        for raw_key, enrichment in table.items():
+            normalized = normalize_key(raw_key)
+            self._plans[normalized] = compile_plan(enrichment)
+            self._names[normalized] = raw_key
+        self.reset()
+
+    def reset(self) -> None:
+        self.hits: set[object] = set()
+        self.misses: list[tuple[str, object]] = []
+        self.miss_count = 0
+
+    def plan(self, record: dict) -> MergePlan | None:
+        return self._plans.get(normalize_key(self.key(record)))
+
+    def apply(self, records: Iterable[dict]) -> None:
+        for record in records:
+            plan = self.plan(record)
+            if plan is not None:
+                apply_plan(record, plan)
+
+    def observe(self, records: Iterable[dict], owner: str) -> None:
+        for record in records:
+            if self.plan(record) is None:
+                self.miss_count += 1
+                if len(self.misses) < MISS_EXAMPLES:
+                    self.misses.append((owner, self.key(record)))
+            else:
+                self.hits.add(normalize_key(self.key(record)))
+
+    def unused(self) -> list[object]:
+        return [raw_key for normalized, raw_key in self._names.items() if normalized not in self.hits]
+
+    def report(self) -> dict:
+        report = {"hits": len(self.hits), "unused": [_label(key) for key in self.unused()]}
+        if self.required:
+            report["missCount"] = self.miss_count
+            report["misses"] = [{"route": owner, "key": _label(key)} for owner, key in self.misses]
+        return report
+
+
+def _label(key: object) -> str:
+    return "/".join(map(str, key)) if isinstance(key, tuple) else str(key)
@@ -0,0 +1,70 @@
+"""Unveränderliche, gemeinsam genutzte Daten für den Build.
+
+Der Stopp-Katalog und die Enrichment-Tabellen werden einmal pro Prozess in
+``FrozenDict``/``FrozenList`` umgewandelt. Routen verweisen danach auf
+dieselben Objekte, statt jeden Stopp und jedes Enrichment per ``deepcopy``
+zu duplizieren – Speicher und Laufzeit wachsen mit den eindeutigen Daten,
+nicht mit Routen × Stopps.
+
+Beide Typen sind echte ``dict``/``list``-Unterklassen: ``json.dumps``,
+``isinstance``-Prüfungen und Vergleiche verhalten sich wie gewohnt.
+Schreibzugriffe werfen ``TypeError``; wer etwas routenspezifisch ändern will,
+legt eine flache Kopie an (``dict(stop)`` bzw. ``overlay()``) – verschachtelte
+Werte bleiben geteilt (Copy-on-Write). ``deepcopy`` liefert das Objekt selbst
+zurück, weil es sich ohnehin nicht ändern kann.
+"""
+
+from __future__ import annotations
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} ist schreibgeschützt – vorher mit dict()/list() kopieren")
+
+
+class FrozenDict(dict):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "FrozenDict":
+        return self
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(list):
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = clear = extend = insert = pop = remove = reverse = sort = _readonly
+
+    def __copy__(self) -> "FrozenList":
+        return self
+
+    def __deepcopy__(self, memo: dict) -> "FrozenList":
+        return self
+
+    def __reduce__(self):
+        return (FrozenList, (list(self),))
+
+
+def freeze(value: object) -> object:
+    """Recursively convert dicts and lists into their frozen counterparts."""
+
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def overlay(base: dict, changes: dict) -> dict:
+    """Route-specific view of a shared record: a flat copy with ``changes`` applied."""
+
+    return {**base, **changes}
+
@@ -0,0 +1,61 @@
+"""Routen-Index als JSON-Lines-Datei statt als Liste im Speicher.
+
+Bei sehr großen Katalogen (100 000 generierte Varianten) wäre schon der
+``routeIndex`` allein zu groß für einen kleinen CI-Runner. ``IndexSpool``
+hängt jeden Eintrag sofort an eine Datei an; Stages, die alle Einträge
+brauchen (Suchindex, inhaltsgehashte Namen, Datensatz), lesen die Datei
+Zeile für Zeile erneut. Der Speicherbedarf hängt damit von einem Eintrag ab,
+nicht von der Zahl der Routen.
+
+``append`` liefert den Byte-Offset der Zeile. Das Build-Manifest merkt sich
+ihn pro Route, damit der nächste inkrementelle Build unveränderte Einträge
+mit ``read_entry`` gezielt aus der alten Datei holen kann.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+
+class IndexSpool:
+    """Append-only JSON-lines file of index entries that can be iterated repeatedly."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.count = 0
+        self.size = 0
+        self._file: BinaryIO | None = path.open("wb")
+
+    def append(self, entry: dict) -> int:
+        if self._file is None:
+            raise ValueError(f"{self.path.name} ist bereits geschlossen")
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        offset = self.size
+        self._file.write(line)
+        self.size += len(line)
+        self.count += 1
+        return offset
+
+    def close(self) -> "IndexSpool":
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return self
+
+    def __iter__(self) -> Iterator[dict]:
+        self.close()
+        with self.path.open("rb") as handle:
+            for line in handle:
+                yield json.loads(line)
+
+    def __len__(self) -> int:
+        return self.count
+
+
+def read_entry(handle: BinaryIO, offset: int) -> dict:
+    """Entry at ``offset`` of a spool file opened in binary mode."""
+
+    handle.seek(offset)
+    return json.loads(handle.readline())
@@ -0,0 +1,215 @@
+"""Kompilierte JSON-Pfad-Selektoren für Routen-Dokumente.
+
+Statt jedes Routen-Dokument rekursiv komplett zu durchlaufen und Bilder oder
+Suchbegriffe per Heuristik zu erkennen, beschreiben Build und Skripte die
+gesuchten Stellen als Pfade::
+
+    days[*].hotels[*].images[*]     # jedes Bild jedes Hotels jedes Tages
+    days[*].mobilityOptions.*.images  # ``*`` = jeder Wert eines Objekts
+    stops[0].name                   # ``[n]`` = ein bestimmter Listeneintrag
+
+``Selector`` fasst mehrere Pfade zu einem Präfixbaum zusammen und kompiliert
+jeden Knoten einmal zu einer spezialisierten Funktion (Schlüssel-Lookup,
+Listen-Schleife, Verteiler). Eine Abfrage besucht nur Knoten, die auf einem
+der Pfade liegen, und liefert die Treffer in Dokumentreihenfolge als
+``(Pfad, Wert)``; der Pfad ist ein Tupel aus Schlüsseln und Listenindizes
+(``json_pointer()`` macht daraus einen RFC-6901-Pointer).
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable
+
+JsonPath = tuple
+Visitor = Callable[[object, JsonPath, list], None]
+
+# Listen mit Bildeinträgen (``url`` plus Bildunterschrift/Quelle/Lizenz) in Routen-Dokumenten.
+ROUTE_IMAGE_LISTS = (
+    "stops[*].photos",
+    "lodging[*].images",
+    "food[*].images",
+    "activities[*].images",
+    "activities[*].restaurants[*].images",
+    "days[*].station.images",
+    "days[*].arrival.segments[*].images",
+    "days[*].arrival.mapPoints[*].images",
+    "days[*].hotels[*].images",
+    "days[*].activities[*].images",
+    "days[*].activities[*].restaurants[*].images",
+    "days[*].mobilityOptions.*.images",
+)
+
+_TOKEN = re.compile(r"\.?([A-Za-z_][\w-]*)|\[\*\]|\[(\d+)\]|\.?(\*)")
+_MISSING = object()
+
+
+def parse(pattern: str) -> tuple[tuple, ...]:
+    """Steps of a pattern: ``("key", name)``, ``("index", n)``, ``("items",)`` or ``("values",)``."""
+
+    steps = []
+    position = 0
+    while position < len(pattern):
+        match = _TOKEN.match(pattern, position)
+        # Schlüssel und ``*`` stehen am Anfang ohne Punkt, danach immer mit (``a[*].b``, nicht ``a[*]b``).
+        if match is None or (not match.group().startswith("[") and match.group().startswith(".") != (position > 0)):
+            raise ValueError(f"Ungültiger Selektor {pattern!r} an Position {position}")
+        key, index, values = match.groups()
+        if key is not None:
+            steps.append(("key", key))
+        elif index is not None:
+            steps.append(("index", int(index)))
+        elif values is not None:
+            steps.append(("values",))
+        else:
+            steps.append(("items",))
+        position = match.end()
+    if not steps:
+        raise ValueError("Leerer Selektor")
+    return tuple(steps)
+
+
+def json_pointer(path: JsonPath) -> str:
+    """RFC 6901 pointer for a path of keys and list indices."""
+
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in path)
+
+
+def replace_paths(document: object, replacements: list[tuple[JsonPath, object]]) -> object:
+    """Copy of ``document`` with each path set to its new value.
+
+    Only the containers along the paths are copied; everything else stays
+    shared with ``document``, which itself is never modified.
+    """
+
+    if not replacements:
+        return document
+    copies: dict[JsonPath, object] = {(): _shallow_copy(document)}
+    for path, value in replacements:
+        node = copies[()]
+        for depth in range(1, len(path)):
+            prefix = path[:depth]
+            child = copies.get(prefix)
+            if child is None:
+                child = copies[prefix] = _shallow_copy(node[path[depth - 1]])
+                node[path[depth - 1]] = child
+            node = child
+        node[path[-1]] = value
+    return copies[()]
+
+
+def _shallow_copy(value: object) -> object:
+    return dict(value) if isinstance(value, dict) else list(value)
+
+
+class _Trie:
+    __slots__ = ("terminal", "children")
+
+    def __init__(self) -> None:
+        self.terminal = False
+        self.children: dict[tuple, _Trie] = {}
+
+
+def _emit(node: object, path: JsonPath, out: list) -> None:
+    out.append((path, node))
+
+
+def _key_visitor(key: str, then: Visitor) -> Visitor:
+    def visit(node: object, path: JsonPath, out: list) -> None:
+        if isinstance(node, dict):
+            child = node.get(key, _MISSING)
+            if child is not _MISSING:
+                then(child, path + (key,), out)
+
+    return visit
+
+
+def _items_visitor(then: Visitor) -> Visitor:
+    def visit(node: object, path: JsonPath, out: list) -> None:
+        if isinstance(node, list):
+            for index, item in enumerate(node):
+                then(item, path + (index,), out)
+
+    return visit
+
+
+def _dispatch_visitor(keys: dict, values: Visitor | None, indices: dict, items: Visitor | None) -> Visitor:
+    # Mehrere Schritte ab demselben Knoten: einmal in Dokumentreihenfolge iterieren, nur Treffer betreten.
+    def visit(node: object, path: JsonPath, out: list) -> None:
+        if isinstance(node, dict) and (keys or values):
+            for key, child in node.items():
+                then = keys.get(key)
+                if then is not None:
+                    then(child, path + (key,), out)
+                if values is not None:
+                    values(child, path + (key,), out)
+        elif isinstance(node, list) and (indices or items):
+            for index, child in enumerate(node):
+                then = indices.get(index)
+                if then is not None:
+                    then(child, path + (index,), out)
+                if items is not None:
+                    items(child, path + (index,), out)
+
+    return visit
+
+
+def _compile(trie: _Trie) -> Visitor:
+    keys: dict[str, Visitor] = {}
+    indices: dict[int, Visitor] = {}
+    values = items = None
+    for step, child in trie.children.items():
+        then = _compile(child)
+        if step[0] == "key":
+            keys[step[1]] = then
+        elif step[0] == "index":
+            indices[step[1]] = then
+        elif step[0] == "values":
+            values = then
+        else:
+            items = then
+
+    if not trie.children:
+        return _emit
+    if len(trie.children) == 1 and keys:
+        ((key, then),) = keys.items()
+        descend = _key_visitor(key, then)
+    elif len(trie.children) == 1 and items is not None:
+        descend = _items_visitor(items)
+    else:
+        descend = _dispatch_visitor(keys, values, indices, items)
+    if not trie.terminal:
+        return descend
+
+    def emit_and_descend(node: object, path: JsonPath, out: list) -> None:
+        out.append((path, node))
+        descend(node, path, out)
+
+    return emit_and_descend
+
+
+class Selector:
+    """One or more patterns compiled into a single traversal."""
+
+    def __init__(self, *patterns: str) -> None:
+        self.patterns = patterns
+        root = _Trie()
+        for pattern in patterns:
+            trie = root
+            for step in parse(pattern):
+                trie = trie.children.setdefault(step, _Trie())
+            trie.terminal = True
+        self._visit = _compile(root)
+
+    def matches(self, document: object) -> list[tuple[JsonPath, object]]:
+        """``(path, value)`` of every match, in document order."""
+
+        out: list[tuple[JsonPath, object]] = []
+        self._visit(document, (), out)
+        return out
+
+    def values(self, document: object) -> list[object]:
+        return [value for _, value in self.matches(document)]
+
+    def __repr__(self) -> str:
+        return f"Selector({', '.join(map(repr, self.patterns))})"
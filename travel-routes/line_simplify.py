@@ -0,0 +1,109 @@
+"""Detailstufen (Level of Detail) für ``mapLayers.dailySegments``.
+
+Pro Zoom-Band wird jede LineString-Geometrie mit Douglas-Peucker vereinfacht
+und anschließend auf so viele Nachkommastellen gerundet, wie ein Pixel am
+oberen Ende des Bands braucht. Die Toleranz entspricht einem Pixel einer
+256-px-Kachel (``360° / (256 · 2^zoom)``) und wird direkt in Grad gemessen –
+für Linien auf dem Bildschirm ist diese planare Näherung ausreichend.
+
+Start- und Endpunkt bleiben unverändert, damit Linien exakt an den
+Stopp-Markern enden. Ergeben zwei benachbarte Bänder dieselben Koordinaten
+(etwa bei den heutigen Zwei-Punkt-Linien), werden sie zusammengelegt – es
+entstehen nur Dateien für Stufen, die wirklich mehr Details liefern.
+"""
+
+from __future__ import annotations
+
+from math import ceil, log10
+
+ARTIFACT_VERSION = 1
+MAX_ZOOM = 24
+# (minZoom, maxZoom) – das erste Band ist die Übersicht im Haupt-Artefakt.
+ZOOM_BANDS: list[tuple[int, int]] = [(0, 5), (6, 9), (10, 13), (14, MAX_ZOOM)]
+FULL_PRECISION_DECIMALS = 6
+
+
+def pixel_degrees(zoom: int) -> float:
+    return 360 / (256 * 2**zoom)
+
+
+def band_tolerance(max_zoom: int) -> float:
+    return 0.0 if max_zoom >= MAX_ZOOM else pixel_degrees(max_zoom)
+
+
+def band_decimals(max_zoom: int) -> int:
+    if max_zoom >= MAX_ZOOM:
+        return FULL_PRECISION_DECIMALS
+    return max(0, ceil(-log10(pixel_degrees(max_zoom) / 2)))
+
+
+def _perpendicular_distance(point: list[float], start: list[float], end: list[float]) -> float:
+    dx = end[0] - start[0]
+    dy = end[1] - start[1]
+    if dx == 0 and dy == 0:
+        return ((point[0] - start[0]) ** 2 + (point[1] - start[1]) ** 2) ** 0.5
+    return abs(dy * point[0] - dx * point[1] + end[0] * start[1] - end[1] * start[0]) / (dx * dx + dy * dy) ** 0.5
+
+
+def simplify_douglas_peucker(coordinates: list[list[float]], tolerance: float) -> list[list[float]]:
+    """Iterative Douglas-Peucker; endpoints are always kept."""
+
+    if tolerance <= 0 or len(coordinates) <= 2:
+        return [list(point) for point in coordinates]
+    keep = [False] * len(coordinates)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(coordinates) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_distance = 0.0
+        index = first
+        for position in range(first + 1, last):
+            distance = _perpendicular_distance(coordinates[position], coordinates[first], coordinates[last])
+            if distance > max_distance:
+                max_distance = distance
+                index = position
+        if max_distance > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [list(point) for point, kept in zip(coordinates, keep) if kept]
+
+
+def quantize(coordinates: list[list[float]], decimals: int) -> list[list[float]]:
+    """Round interior vertices and drop duplicates created by rounding.
+
+    The endpoints keep their original precision.
+    """
+
+    if len(coordinates) <= 2:
+        return [list(point) for point in coordinates]
+    result: list[list[float]] = [list(coordinates[0])]
+    for point in coordinates[1:-1]:
+        rounded = [round(point[0], decimals), round(point[1], decimals)]
+        if result[-1] != rounded:
+            result.append(rounded)
+    if result[-1] != list(coordinates[-1]):
+        result.append(list(coordinates[-1]))
+    return result
+
+
+def simplify_line(coordinates: list[list[float]], max_zoom: int) -> list[list[float]]:
+    return quantize(simplify_douglas_peucker(coordinates, band_tolerance(max_zoom)), band_decimals(max_zoom))
+
+
+def build_detail_levels(lines: dict[str, list[list[float]]]) -> list[dict]:
+    """Simplify ``{feature_id: coordinates}`` for every zoom band.
+
+    Returns ``[{"minZoom", "maxZoom", "geometries": {id: coordinates}}]``;
+    bands without additional detail are merged into the previous band.
+    """
+
+    levels: list[dict] = []
+    for min_zoom, max_zoom in ZOOM_BANDS:
+        geometries = {feature_id: simplify_line(coordinates, max_zoom) for feature_id, coordinates in lines.items()}
+        if levels and levels[-1]["geometries"] == geometries:
+            levels[-1]["maxZoom"] = max_zoom
+            continue
+        levels.append({"minZoom": min_zoom, "maxZoom": max_zoom, "geometries": geometries})
+    return levels
+
@@ -0,0 +1,103 @@
+/**
+ * Verweise auf gemeinsame Tabellen in Routen-Dateien auflösen.
+ * ------------------------------------------------------------
+ * Mit `build_data.py --shared-stops` stehen die Stopps einmal in einem
+ * inhaltsgehashten Katalog, Routen-Dateien listen dann nur Stopp-IDs. Mit
+ * `--asset-table` stehen Bilder unter `images`/`photos` nur als
+ * `{ asset: "<id>" }` in der Route, die Einträge liefert die Asset-Tabelle.
+ * Dieses Modul teilen sich `travel-routes.js`, `chile-map.js` und
+ * `src/lib/data/chile-travel/server.ts`: Die Browser-Skripte laden die
+ * Tabellen per `fetch`, der Server liest sie von der Festplatte – eingesetzt
+ * wird überall gleich.
+ */
+
+/**
+ * Lädt gemeinsame Tabellen (Stopp-Katalog, Asset-Tabelle) einmal pro Datei und
+ * liefert daraus das Feld `field`. Fehlgeschlagene Abrufe werden nicht gecacht;
+ * bis zum nächsten Versuch gibt es eine leere Tabelle, unbekannte Verweise
+ * bleiben dann als Platzhalter stehen.
+ *
+ * @param {(file: string) => Promise<Record<string, any>>} fetchTable
+ * @param {Map<string, Promise<Record<string, any>>>} [cache]
+ * @returns {(file: string, field: string) => Promise<Record<string, any>>}
+ */
+export function createSharedTableLoader(fetchTable, cache = new Map()) {
+  return function loadSharedTable(file, field) {
+    if (!cache.has(file)) {
+      const pending = fetchTable(file).catch((error) => {
+        console.warn(`Konnte ${file} nicht laden`, error);
+        cache.delete(file);
+        return {};
+      });
+      cache.set(file, pending);
+    }
+    return cache.get(file).then((table) => table?.[field] ?? {});
+  };
+}
+
+/**
+ * @param {{ stops?: any } | null | undefined} route
+ * @returns {boolean}
+ */
+export function hasStopReferences(route) {
+  return Array.isArray(route?.stops) && route.stops.some((stop) => typeof stop === 'string');
+}
+
+/**
+ * Ersetzt Stopp-IDs durch die Einträge aus `catalog`. Unbekannte IDs bleiben als
+ * Platzhalter `{ id }` erhalten, statt die Route zu verwerfen.
+ *
+ * @template {{ stops?: any, stopsCatalog?: any }} T
+ * @param {T} route
+ * @param {Record<string, any> | null | undefined} catalog
+ * @returns {T}
+ */
+export function resolveStopReferences(route, catalog) {
+  if (!hasStopReferences(route)) return route;
+  route.stops = route.stops.map((stop) => (typeof stop === 'string' ? catalog?.[stop] ?? { id: stop } : stop));
+  delete route.stopsCatalog;
+  return route;
+}
+
+export const IMAGE_CONTAINERS = new Set(['images', 'photos']);
+
+/**
+ * @param {unknown} value
+ * @returns {value is { asset: string }}
+ */
+export function isAssetReference(value) {
+  return (
+    typeof value === 'object' &&
+    value !== null &&
+    typeof (/** @type {{ asset?: unknown }} */ (value).asset) === 'string' &&
+    Object.keys(value).length === 1
+  );
+}
+
+/**
+ * Setzt in allen `images`-/`photos`-Listen die Einträge aus `assets` ein (in
+ * place). Unbekannte Verweise bleiben stehen.
+ *
+ * @template T
+ * @param {T} value
+ * @param {Record<string, any> | null | undefined} assets
+ * @returns {T}
+ */
+export function resolveAssetReferences(value, assets) {
+  if (!assets) return value;
+  if (Array.isArray(value)) {
+    value.forEach((item) => resolveAssetReferences(item, assets));
+  } else if (typeof value === 'object' && value !== null) {
+    const record = /** @type {Record<string, unknown>} */ (value);
+    for (const [key, item] of Object.entries(record)) {
+      if (IMAGE_CONTAINERS.has(key) && Array.isArray(item)) {
+        record[key] = item.map((entry) =>
+          isAssetReference(entry) ? assets[entry.asset] ?? entry : resolveAssetReferences(entry, assets),
+        );
+      } else {
+        resolveAssetReferences(item, assets);
+      }
+    }
+  }
+  return value;
+}
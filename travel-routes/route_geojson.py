@@ -0,0 +1,297 @@
+"""Fertige GeoJSON-Collections und Bounding-Boxes pro Route und pro Tag.
+
+Spiegelt ``src/lib/travel/map-data.ts`` (``buildSegmentCollection``,
+``buildStopCollection``) und ``map-bounds.ts`` (``calculateBoundingBox``) auf
+Build-Ebene. Farben, Labels und Dash-Arrays sind bereits aus
+``TRANSPORT_MODES`` aufgelöst – der Client reicht die Daten nur an MapLibre
+weiter. Änderungen an den Feature-Properties bitte in beiden Dateien nachziehen.
+"""
+
+from __future__ import annotations
+
+import math
+
+ARTIFACT_VERSION = 1
+DEFAULT_MODE = {"color": "#2563eb", "label": "Segment"}
+
+
+def _number(value: float) -> float | int:
+    return int(value) if float(value).is_integer() else value
+
+
+def parse_dash_array(value: str | None) -> list[float] | None:
+    if not value:
+        return None
+    parts = []
+    for part in str(value).split():
+        try:
+            number = float(part)
+        except ValueError:
+            continue
+        if math.isfinite(number) and number > 0:
+            parts.append(_number(number))
+    return parts if len(parts) >= 2 else None
+
+
+def resolve_mode_appearance(mode: str | None, transport_modes: dict) -> dict:
+    if not mode:
+        return dict(DEFAULT_MODE)
+    transport = transport_modes.get(mode)
+    if not transport:
+        return {"color": DEFAULT_MODE["color"], "label": mode}
+    appearance = {
+        "color": transport.get("color") or DEFAULT_MODE["color"],
+        "label": transport.get("label") or mode,
+    }
+    dash_array = parse_dash_array(transport.get("dashArray"))
+    if dash_array:
+        appearance["dashArray"] = dash_array
+    return appearance
+
+
+def _is_finite(value: object) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def normalize_coordinate(value: object) -> list[float] | None:
+    """Return ``[lng, lat]`` for ``[lng, lat]`` lists or ``{"lat", "lng"}`` dicts."""
+
+    if isinstance(value, (list, tuple)) and len(value) == 2:
+        lng, lat = value
+        if _is_finite(lng) and _is_finite(lat):
+            return [lng, lat]
+    if isinstance(value, dict) and _is_finite(value.get("lng")) and _is_finite(value.get("lat")):
+        return [value["lng"], value["lat"]]
+    return None
+
+
+def _line_coordinates(start: object, end: object) -> list[list[float]] | None:
+    start = normalize_coordinate(start)
+    end = normalize_coordinate(end)
+    if not start or not end:
+        return None
+    return [start, end]
+
+
+def _segment_feature(geometry: dict, appearance: dict, feature_id: str, mode: str, order: int, day_id: str | None) -> dict:
+    properties = {"id": feature_id, "mode": mode, "order": order, **appearance}
+    feature = {"type": "Feature", "geometry": geometry, "properties": properties}
+    return feature if day_id is None else {**feature, "_day": day_id}
+
+
+def _collection(features: list[dict]) -> dict:
+    return {"type": "FeatureCollection", "features": features}
+
+
+def _segment_features(route: dict, transport_modes: dict) -> list[dict]:
+    features: list[dict] = []
+    order = 0
+
+    for index, segment in enumerate((route.get("mapLayers") or {}).get("dailySegments") or []):
+        geometry = segment.get("geometry")
+        if not geometry or geometry.get("type") != "LineString":
+            continue
+        day_id = segment.get("dayId") or f"day-{index + 1}"
+        appearance = resolve_mode_appearance(segment.get("mode"), transport_modes)
+        features.append(_segment_feature(geometry, appearance, day_id, segment.get("mode") or "segment", order, day_id))
+        order += 1
+
+    if not features and isinstance(route.get("segments"), list) and isinstance(route.get("stops"), list):
+        stop_index = {stop.get("id"): stop for stop in route["stops"]}
+        for index, segment in enumerate(route["segments"]):
+            coordinates = _line_coordinates(
+                (stop_index.get(segment.get("from")) or {}).get("coordinates"),
+                (stop_index.get(segment.get("to")) or {}).get("coordinates"),
+            )
+            if not coordinates:
+                continue
+            appearance = resolve_mode_appearance(segment.get("mode"), transport_modes)
+            features.append(
+                _segment_feature(
+                    {"type": "LineString", "coordinates": coordinates},
+                    appearance,
+                    segment.get("id") or f"segment-{index + 1}",
+                    segment.get("mode") or "segment",
+                    order,
+                    None,
+                )
+            )
+            order += 1
+
+    if not features and isinstance(route.get("days"), list):
+        for day in route["days"]:
+            for segment_index, segment in enumerate((day.get("arrival") or {}).get("segments") or []):
+                coordinates = _line_coordinates(
+                    (segment.get("from") or {}).get("coordinates"),
+                    (segment.get("to") or {}).get("coordinates"),
+                )
+                if not coordinates:
+                    continue
+                appearance = resolve_mode_appearance(segment.get("mode"), transport_modes)
+                features.append(
+                    _segment_feature(
+                        {"type": "LineString", "coordinates": coordinates},
+                        appearance,
+                        f"{day.get('id')}-segment-{segment_index + 1}",
+                        segment.get("mode") or "segment",
+                        order,
+                        day.get("id"),
+                    )
+                )
+                order += 1
+    return features
+
+
+def _primary_image(images: object) -> dict:
+    if isinstance(images, list):
+        for image in images:
+            if isinstance(image, dict) and isinstance(image.get("url"), str) and image["url"].strip():
+                return image
+    return {}
+
+
+def _stop_feature(coordinate: list[float], properties: dict, day_id: str | None) -> dict:
+    feature = {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": coordinate},
+        # ``undefined`` properties disappear in JSON on the client as well.
+        "properties": {key: value for key, value in properties.items() if value is not None},
+    }
+    return feature if day_id is None else {**feature, "_day": day_id}
+
+
+def _stop_features(route: dict) -> list[dict]:
+    features: list[dict] = []
+    if isinstance(route.get("stops"), list) and route["stops"]:
+        for index, stop in enumerate(route["stops"]):
+            coordinate = normalize_coordinate(stop.get("coordinates"))
+            if not coordinate:
+                continue
+            hero = _primary_image(stop.get("photos"))
+            name = stop.get("name") or stop.get("city")
+            features.append(
+                _stop_feature(
+                    coordinate,
+                    {
+                        "id": stop.get("id"),
+                        "name": name or f"Stop {index + 1}",
+                        "order": index,
+                        "label": str(index + 1),
+                        "title": name or stop.get("id"),
+                        "subtitle": stop.get("city") or stop.get("type"),
+                        "type": stop.get("type"),
+                        "city": stop.get("city"),
+                        "description": stop.get("description"),
+                        "photoUrl": hero.get("url"),
+                        "photoCaption": hero.get("caption"),
+                        "photoCredit": hero.get("credit"),
+                    },
+                    None,
+                )
+            )
+    elif isinstance(route.get("days"), list):
+        for index, day in enumerate(route["days"]):
+            station = day.get("station") or {}
+            coordinate = normalize_coordinate(station.get("coordinates"))
+            if coordinate:
+                hero = _primary_image(station.get("images"))
+                features.append(
+                    _stop_feature(
+                        coordinate,
+                        {
+                            "id": f"{day.get('id')}-station",
+                            "name": station.get("name") or f"Station {index + 1}",
+                            "order": index,
+                            "label": str(index + 1),
+                            "title": station.get("name") or f"Station {index + 1}",
+                            "subtitle": day.get("date"),
+                            "type": "station",
+                            "city": station.get("name"),
+                            "description": station.get("description"),
+                            "photoUrl": hero.get("url"),
+                            "photoCaption": hero.get("caption"),
+                            "photoCredit": hero.get("credit"),
+                        },
+                        day.get("id"),
+                    )
+                )
+            for point_index, point in enumerate((day.get("arrival") or {}).get("mapPoints") or []):
+                point_coordinate = normalize_coordinate(point.get("coordinates"))
+                if not point_coordinate:
+                    continue
+                hero = _primary_image(point.get("images"))
+                features.append(
+                    _stop_feature(
+                        point_coordinate,
+                        {
+                            "id": point.get("id"),
+                            "name": point.get("name") or point.get("id"),
+                            "order": index + point_index / 10 + 0.01,
+                            "label": str(index + 1),
+                            "title": point.get("name") or point.get("id"),
+                            "subtitle": point.get("type"),
+                            "type": point.get("type"),
+                            "description": point.get("description"),
+                            "photoUrl": hero.get("url"),
+                            "photoCaption": hero.get("caption"),
+                            "photoCredit": hero.get("credit"),
+                        },
+                        day.get("id"),
+                    )
+                )
+    return features
+
+
+def calculate_bounding_box(coordinates: list[list[float]]) -> list[list[float]] | None:
+    valid = [coordinate for coordinate in coordinates if normalize_coordinate(coordinate)]
+    if not valid:
+        return None
+    lngs = [coordinate[0] for coordinate in valid]
+    lats = [coordinate[1] for coordinate in valid]
+    return [[min(lngs), min(lats)], [max(lngs), max(lats)]]
+
+
+def _feature_coordinates(features: list[dict]) -> list[list[float]]:
+    coordinates: list[list[float]] = []
+    for feature in features:
+        geometry = feature["geometry"]
+        if geometry["type"] == "LineString":
+            coordinates.extend(geometry["coordinates"])
+        elif geometry["type"] == "Point":
+            coordinates.append(geometry["coordinates"])
+    return coordinates
+
+
+def _strip_day(features: list[dict]) -> list[dict]:
+    return [{key: value for key, value in feature.items() if key != "_day"} for feature in features]
+
+
+def build_route_geometry(route: dict, transport_modes: dict) -> dict:
+    """Route-wide and per-day collections plus their bounding boxes."""
+
+    segments = _segment_features(route, transport_modes)
+    stops = _stop_features(route)
+
+    days: dict[str, dict] = {}
+    for day in route.get("days") or []:
+        day_id = day.get("id")
+        if not day_id:
+            continue
+        day_segments = _strip_day([feature for feature in segments if feature.get("_day") == day_id])
+        day_stops = _strip_day([feature for feature in stops if feature.get("_day") == day_id])
+        days[day_id] = {
+            "segments": _collection(day_segments),
+            "stops": _collection(day_stops),
+            "bounds": calculate_bounding_box(_feature_coordinates(day_segments + day_stops)),
+        }
+
+    segments = _strip_day(segments)
+    stops = _strip_day(stops)
+    return {
+        "version": ARTIFACT_VERSION,
+        "routeId": route.get("id"),
+        "segments": _collection(segments),
+        "stops": _collection(stops),
+        "bounds": calculate_bounding_box(_feature_coordinates(segments + stops)),
+        "days": days,
+    }
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""Benchmark der ``build_data.py``-Pipeline mit synthetischen Routen.
+
+Für jede Größe (Standard: 10, 1 000 und 50 000 Routen) erzeugt
+``synthetic_routes.py`` eine Mischung aus Legacy- und 2026-Routen in einem
+temporären Ordner. Danach laufen dieselben Stages wie in ``main()`` und jede
+Phase wird einzeln gestoppt:
+
+``catalog`` → ``resolve`` → ``enrich`` → ``metrics`` → ``emit`` → ``scan``
+→ ``spatial`` → ``search`` → ``dataset``
+
+``--memory`` lässt stattdessen den kompletten, streamenden ``run_build()`` über
+die synthetischen Routen laufen und meldet den ``tracemalloc``-Peak pro Größe.
+Manifest und Index-Einträge liegen auf der Platte; was noch mitwächst, sind
+KD-Baum und Suchindex. Die synthetischen Tabellen entstehen vor der Messung.
+
+Baselines liegen in ``scripts/bench_baselines.json``. ``--save-baseline``
+überschreibt sie, ``--max-regression 1.5`` lässt den Lauf fehlschlagen, sobald
+eine Phase mehr als 1,5-mal so lange braucht wie ihre Baseline. Zeiten hängen
+von der Maschine ab – Baselines nur mit Läufen auf derselben Maschine
+vergleichen.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(SCRIPT_DIR))
+
+import synthetic_routes  # noqa: E402
+from synthetic_routes import build_data  # noqa: E402
+
+PHASES = ("catalog", "resolve", "enrich", "metrics", "emit", "scan", "spatial", "search", "dataset")
+DEFAULT_SIZES = (10, 1_000, 50_000)
+BASELINE_PATH = SCRIPT_DIR / "bench_baselines.json"
+# Unterhalb dieser Dauer ist Rauschen größer als jede Regression.
+MIN_COMPARABLE_SECONDS = 0.05
+
+
+@contextmanager
+def synthetic_build_tables(tables: dict) -> Iterator[None]:
+    """Temporarily point ``build_data`` at the synthetic stop catalog."""
+
+    names = ("STOPS", "STOP_ENRICHMENTS", "SEGMENT_SPECIFICS", "_CATALOG")
+    saved = {name: getattr(build_data, name) for name in names}
+    build_data.STOPS = tables["stops"]
+    build_data.STOP_ENRICHMENTS = tables["stopEnrichments"]
+    build_data.SEGMENT_SPECIFICS = {**build_data.SEGMENT_SPECIFICS, **tables["segmentSpecifics"]}
+    build_data._CATALOG = None
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(build_data, name, value)
+
+
+class PhaseTimer:
+    def __init__(self) -> None:
+        self.seconds = {phase: 0.0 for phase in PHASES}
+
+    def run(self, phase: str, function: Callable, *args):
+        started = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.seconds[phase] += time.perf_counter() - started
+
+
+def prepare_size(route_count: int, stop_count: int, day_share: float, seed: int, workdir: Path) -> dict:
+    """Write the 2026 routes for one size and create its synthetic tables."""
+
+    day_count = round(route_count * day_share)
+    base_dir = workdir / f"n{route_count}"
+    route_dir = base_dir / "data" / "routes"
+    route_dir.mkdir(parents=True)
+
+    started = time.perf_counter()
+    templates = synthetic_routes.day_route_templates()
+    synthetic_routes.write_day_routes(synthetic_routes.synthetic_day_routes(day_count, templates, seed), route_dir)
+    return {
+        "baseDir": base_dir,
+        "legacyCount": route_count - day_count,
+        "dayCount": day_count,
+        "tables": synthetic_routes.synthetic_tables(stop_count, seed, route_count - day_count),
+        "setupSeconds": time.perf_counter() - started,
+    }
+
+
+def measure_memory(route_count: int, stop_count: int, day_share: float, seed: int, workdir: Path) -> dict:
+    """Run the streaming ``run_build()`` on synthetic routes and return its memory peak."""
+
+    prepared = prepare_size(route_count, stop_count, day_share, seed, workdir)
+    tables = prepared["tables"]
+    definitions = synthetic_routes.synthetic_definitions(prepared["legacyCount"], tables, seed)
+    started = time.perf_counter()
+    tracemalloc.start()
+    try:
+        with synthetic_build_tables(tables), contextlib.redirect_stdout(io.StringIO()):
+            build_data.run_build(build_data.parse_args([]), definitions, prepared["baseDir"])
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "routes": route_count,
+        "peakMiB": round(peak / 2**20, 2),
+        "retainedMiB": round(current / 2**20, 2),
+        "totalSeconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def run_size(route_count: int, stop_count: int, day_share: float, seed: int, workdir: Path) -> dict:
+    """Build ``route_count`` synthetic routes and return per-phase seconds."""
+
+    prepared = prepare_size(route_count, stop_count, day_share, seed, workdir)
+    day_count = prepared["dayCount"]
+    legacy_count = prepared["legacyCount"]
+    tables = prepared["tables"]
+    setup_seconds = prepared["setupSeconds"]
+    base_dir = prepared["baseDir"]
+    data_dir = base_dir / "data"
+    route_dir = data_dir / "routes"
+
+    timer = PhaseTimer()
+    cache_dir = base_dir / build_data.CACHE_DIR_NAME
+    cache_dir.mkdir(exist_ok=True)
+    manifest = build_data.BuildManifest(cache_dir / build_data.MANIFEST_NAME, build_data.BUILD_SCHEMA_VERSION)
+    outputs = manifest.outputs
+    route_index: list[dict] = []
+    curated_ids: set[str] = set()
+    with synthetic_build_tables(tables):
+        catalog = timer.run("catalog", build_data.load_catalog)
+        for definition in synthetic_routes.synthetic_definitions(legacy_count, tables, seed):
+            route = timer.run("resolve", build_data.resolve_route, definition)
+            timer.run("enrich", build_data.enrich_route, route)
+            timer.run("metrics", build_data.compute_route_metrics, route)
+            index_entry, _ = timer.run("emit", build_data.emit_route, route, route_dir, outputs)
+            route_index.append(index_entry)
+            curated_ids.add(definition["id"])
+
+        extra_files = build_data.scan_extra_routes(base_dir, frozenset(curated_ids), manifest)
+        route_index.extend(timer.run("scan", lambda: [entry for entries, _ in extra_files for entry in entries]))
+
+        spatial_index = timer.run("spatial", build_data.build_spatial_index, catalog, manifest.places())
+        timer.run(
+            "search",
+            lambda: build_data.write_artifact(
+                data_dir / "search-index.json",
+                json.dumps(build_data.build_search_index(route_index).to_artifact(), separators=(",", ":")),
+                outputs,
+                "data/search-index.json",
+            ),
+        )
+        timer.run(
+            "dataset",
+            lambda: build_data.write_artifact(
+                base_dir / "travel-routes-data.json",
+                build_data.dump_json(build_data.build_dataset(route_index, 0, len(spatial_index))),
+                outputs,
+                "travel-routes-data.json",
+            ),
+        )
+    manifest.close()
+
+    return {
+        "routes": route_count,
+        "legacyRoutes": legacy_count,
+        "dayRoutes": day_count,
+        "stops": stop_count,
+        "setupSeconds": round(setup_seconds, 4),
+        "phases": {phase: round(seconds, 4) for phase, seconds in timer.seconds.items()},
+        "totalSeconds": round(sum(timer.seconds.values()), 4),
+    }
+
+
+def load_baselines(path: Path = BASELINE_PATH) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return {}
+
+
+def compare(result: dict, baseline: dict | None, max_regression: float | None) -> tuple[list[str], bool]:
+    lines = [f"{result['routes']} Routen ({result['legacyRoutes']} Legacy, {result['dayRoutes']} 2026), {result['stops']} Stopps"]
+    failed = False
+    for phase in PHASES:
+        seconds = result["phases"][phase]
+        line = f"  {phase:<9}{seconds:>10.3f} s"
+        reference = (baseline or {}).get("phases", {}).get(phase)
+        if reference:
+            ratio = seconds / reference
+            line += f"   Baseline {reference:>9.3f} s  ×{ratio:.2f}"
+            if max_regression and ratio > max_regression and seconds >= MIN_COMPARABLE_SECONDS:
+                line += "  REGRESSION"
+                failed = True
+        lines.append(line)
+    lines.append(f"  {'gesamt':<9}{result['totalSeconds']:>10.3f} s")
+    return lines, failed
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(part) for part in value.split(",") if part],
+        default=list(DEFAULT_SIZES),
+        help="Kommagetrennte Routenzahlen (Standard: 10,1000,50000).",
+    )
+    parser.add_argument("--stops", type=int, default=500, help="Größe des synthetischen Stopp-Katalogs.")
+    parser.add_argument("--day-share", type=float, default=0.5, help="Anteil der Routen im 2026-Schema (0–1).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnisse als neue Baseline speichern.")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=None,
+        metavar="FAKTOR",
+        help="Mit Exit-Code 1 abbrechen, wenn eine Phase langsamer als FAKTOR × Baseline ist.",
+    )
+    parser.add_argument("--json", type=Path, default=None, help="Ergebnisse zusätzlich als JSON schreiben.")
+    parser.add_argument("--keep", action="store_true", help="Temporäre Build-Ordner nicht löschen.")
+    parser.add_argument(
+        "--memory",
+        action="store_true",
+        help="Kompletten Build pro Größe laufen lassen und den tracemalloc-Peak statt Phasenzeiten melden.",
+    )
+    args = parser.parse_args(argv)
+    if args.memory and (args.save_baseline or args.max_regression):
+        parser.error("--memory misst nur Speicher; Baselines gelten für Phasenzeiten")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    baselines = load_baselines()
+    workdir = Path(tempfile.mkdtemp(prefix="travel-routes-bench-"))
+    results = []
+    failed = False
+    try:
+        for size in args.sizes:
+            if args.memory:
+                result = measure_memory(size, args.stops, args.day_share, args.seed, workdir)
+                print(
+                    f"{size} Routen: Speicher-Peak {result['peakMiB']:.1f} MiB, "
+                    f"nach dem Build {result['retainedMiB']:.1f} MiB ({result['totalSeconds']:.1f} s)"
+                )
+            else:
+                result = run_size(size, args.stops, args.day_share, args.seed, workdir)
+                lines, regressed = compare(result, baselines.get("sizes", {}).get(str(size)), args.max_regression)
+                failed = failed or regressed
+                print("\n".join(lines))
+            results.append(result)
+            if not args.keep:
+                shutil.rmtree(workdir / f"n{size}", ignore_errors=True)
+    finally:
+        if args.keep:
+            print(f"Build-Ordner: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "sizes": {str(result["routes"]): result for result in results},
+    }
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        merged = {**baselines, **report, "sizes": {**baselines.get("sizes", {}), **report["sizes"]}}
+        BASELINE_PATH.write_text(json.dumps(merged, indent=2) + "\n", encoding="utf-8")
+        print(f"Baseline gespeichert: {BASELINE_PATH}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
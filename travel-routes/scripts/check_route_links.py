@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""Prüft, ob Links und Bild-URLs der Routen und Datentabellen noch erreichbar sind.
+
+Gesammelt werden alle http(s)-Werte der Felder ``website``, ``bookingUrl``,
+``url``, ``image`` und ``sourceUrl`` aus ``data/routes/*.json`` und
+``tables/*.json`` (Stopps, Galerie, Enrichments). Jede URL wird nur einmal
+geprüft, egal wie viele Dateien sie verwenden.
+
+Die Prüfung läuft mit ``asyncio`` und ohne Zusatzpakete: Pro Host gibt es einen
+Pool aus Keep-alive-Verbindungen und höchstens ``--per-host`` gleichzeitige
+Anfragen. Zuerst kommt ``HEAD``; antwortet der Server mit einem Fehler (viele
+CDNs kennen kein ``HEAD``), folgt ein ``GET`` mit ``Range: bytes=0-0``.
+Weiterleitungen werden bis zu ``MAX_REDIRECTS``-mal verfolgt.
+
+Erreichbare URLs landen mit Zeitstempel in ``.build-cache/link-check.json`` und
+werden erst nach ``--ttl-hours`` erneut geprüft; fehlerhafte URLs werden bei
+jedem Lauf neu geprüft. ``--url`` prüft einzelne Adressen (auch ``http://``,
+etwa gegen einen lokalen Test-Server), ``--report`` schreibt die Ergebnisse mit
+allen Fundstellen (Datei und JSON-Pointer) als JSON, ``--strict`` endet bei
+defekten Links mit Exit-Code 1.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import ssl
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator
+from urllib.parse import quote, urljoin, urlsplit
+
+TRAVEL_ROUTES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TRAVEL_ROUTES_DIR))
+
+from json_select import json_pointer  # noqa: E402
+
+SOURCES = (TRAVEL_ROUTES_DIR / "data" / "routes", TRAVEL_ROUTES_DIR / "tables")
+CACHE_PATH = TRAVEL_ROUTES_DIR / ".build-cache" / "link-check.json"
+CACHE_VERSION = 1
+REPORT_VERSION = 1
+URL_FIELDS = frozenset(("website", "bookingUrl", "url", "image", "sourceUrl"))
+USER_AGENT = "travel-routes-link-check/1.0"
+MAX_REDIRECTS = 5
+REDIRECT_STATUSES = frozenset((301, 302, 303, 307, 308))
+# GET-Antworten bis zu dieser Größe werden gelesen, damit die Verbindung wiederverwendbar bleibt.
+MAX_DRAIN_BYTES = 64 * 1024
+# Zeichen, die im Pfad stehen bleiben dürfen; bereits kodierte Sequenzen (%xx) bleiben unverändert.
+_SAFE_TARGET = "/%?=&:+,;@!$'()*~[]"
+
+
+def url_fields(document: object, path: tuple = ()) -> Iterator[tuple[tuple, str]]:
+    """``(path, url)`` of every http(s) URL in a link or image field."""
+
+    if isinstance(document, dict):
+        for key, value in document.items():
+            if key in URL_FIELDS and isinstance(value, str) and value.startswith(("http://", "https://")):
+                yield path + (key,), value
+            elif isinstance(value, (dict, list)):
+                yield from url_fields(value, path + (key,))
+    elif isinstance(document, list):
+        for index, item in enumerate(document):
+            if isinstance(item, (dict, list)):
+                yield from url_fields(item, path + (index,))
+
+
+def file_key(path: Path) -> str:
+    """Report key: path relative to ``travel-routes/`` where possible."""
+
+    try:
+        return path.relative_to(TRAVEL_ROUTES_DIR).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def source_files(sources: Iterable[Path]) -> list[Path]:
+    files = []
+    for source in sources:
+        files.extend(sorted(source.rglob("*.json")) if source.is_dir() else [source])
+    return files
+
+
+def collect_urls(files: Iterable[Path]) -> dict[str, list[str]]:
+    """Every distinct URL with its usages (``file#pointer``)."""
+
+    usages: dict[str, list[str]] = {}
+    for path in files:
+        try:
+            data = json.loads(path.read_bytes())
+        except json.JSONDecodeError as error:
+            print(f"Skipping {file_key(path)}: {error}", file=sys.stderr)
+            continue
+        for pointer, url in url_fields(data):
+            usages.setdefault(url, []).append(f"{file_key(path)}#{json_pointer(pointer)}")
+    return usages
+
+
+class HostPool:
+    """Idle keep-alive connections and the request limit of one origin."""
+
+    def __init__(self, limit: int) -> None:
+        self.idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self.slots = asyncio.Semaphore(limit)
+
+
+class LinkChecker:
+    """Checks URLs concurrently over pooled connections; create and use inside one event loop."""
+
+    def __init__(
+        self,
+        per_host: int = 4,
+        concurrency: int = 64,
+        timeout: float = 10.0,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> None:
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self.limit = asyncio.Semaphore(concurrency)
+        self.pools: dict[tuple[str, str, int], HostPool] = {}
+        self.requests = 0
+        self.connections = 0
+
+    async def check_all(self, urls: Iterable[str]) -> dict[str, dict]:
+        urls = list(urls)
+        try:
+            results = await asyncio.gather(*(self.check(url) for url in urls))
+        finally:
+            await self.close()
+        return dict(zip(urls, results))
+
+    async def check(self, url: str) -> dict:
+        """``{ok, status, reason}`` for one URL; never raises for network errors."""
+
+        async with self.limit:
+            try:
+                status = await self._follow(url, "HEAD")
+                if status >= 400:
+                    status = await self._follow(url, "GET")
+            except asyncio.TimeoutError:
+                return {"ok": False, "status": None, "reason": "timeout"}
+            except (OSError, EOFError, ValueError) as error:
+                return {"ok": False, "status": None, "reason": f"{type(error).__name__}: {error}"}
+        ok = status < 400
+        return {"ok": ok, "status": status, "reason": None if ok else f"HTTP {status}"}
+
+    async def close(self) -> None:
+        for pool in self.pools.values():
+            for _, writer in pool.idle:
+                writer.close()
+            pool.idle.clear()
+
+    async def _follow(self, url: str, method: str) -> int:
+        for _ in range(MAX_REDIRECTS + 1):
+            status, location = await self._request(url, method)
+            if status not in REDIRECT_STATUSES or not location:
+                return status
+            url = urljoin(url, location)
+        raise ValueError(f"mehr als {MAX_REDIRECTS} Weiterleitungen")
+
+    async def _request(self, url: str, method: str) -> tuple[int, str | None]:
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"keine http(s)-URL: {url}")
+        origin = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        pool = self.pools.get(origin)
+        if pool is None:
+            pool = self.pools[origin] = HostPool(self.per_host)
+        target = quote(parts.path or "/", safe=_SAFE_TARGET)
+        if parts.query:
+            target += "?" + quote(parts.query, safe=_SAFE_TARGET)
+        host = parts.netloc.rpartition("@")[2]
+
+        async with pool.slots:
+            while True:
+                reused = bool(pool.idle)
+                if reused:
+                    reader, writer = pool.idle.pop()
+                else:
+                    reader, writer = await asyncio.wait_for(self._connect(origin), self.timeout)
+                try:
+                    status, headers, reusable = await asyncio.wait_for(
+                        self._exchange(reader, writer, method, target, host), self.timeout
+                    )
+                except asyncio.TimeoutError:
+                    # Vor OSError prüfen: Seit Python 3.11 ist asyncio.TimeoutError ein OSError.
+                    writer.close()
+                    raise
+                except (OSError, EOFError):
+                    writer.close()
+                    if reused:
+                        continue  # Der Server hat die Keep-alive-Verbindung geschlossen – neu verbinden.
+                    raise
+                if reusable:
+                    pool.idle.append((reader, writer))
+                else:
+                    writer.close()
+                return status, headers.get("location")
+
+    async def _connect(self, origin: tuple[str, str, int]) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        scheme, host, port = origin
+        self.connections += 1
+        return await asyncio.open_connection(host, port, ssl=self.ssl_context if scheme == "https" else None)
+
+    async def _exchange(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, method: str, target: str, host: str
+    ) -> tuple[int, dict[str, str], bool]:
+        self.requests += 1
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host}", f"User-Agent: {USER_AGENT}", "Accept: */*"]
+        if method == "GET":
+            lines.append("Range: bytes=0-0")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Verbindung ohne Antwort geschlossen")
+        version, _, rest = status_line.decode("latin-1").partition(" ")
+        status = int(rest[:3])
+        headers: dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        reusable = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if method == "HEAD" or status in (204, 304) or status < 200:
+            return status, headers, reusable
+        length = headers.get("content-length")
+        if length is not None and length.isdigit() and int(length) <= MAX_DRAIN_BYTES:
+            await reader.readexactly(int(length))
+        else:
+            reusable = False  # Chunked oder groß: lieber neu verbinden, als den Body herunterzuladen.
+        return status, headers, reusable
+
+
+def load_cache(path: Path) -> dict:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    return cache.get("urls", {}) if cache.get("version") == CACHE_VERSION else {}
+
+
+def save_cache(path: Path, entries: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    payload = json.dumps({"version": CACHE_VERSION, "urls": entries}, ensure_ascii=False, sort_keys=True)
+    temporary.write_text(payload, encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def fresh_results(cached: dict, urls: Iterable[str], ttl_seconds: float, now: float) -> dict[str, dict]:
+    """Cached results still within the TTL; only reachable URLs are reused."""
+
+    return {
+        url: cached[url]
+        for url in urls
+        if url in cached and cached[url].get("ok") and now - cached[url].get("checkedAt", 0) < ttl_seconds
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "sources", nargs="*", type=Path, help="JSON-Dateien oder Ordner (Standard: Routen und Tabellen)"
+    )
+    parser.add_argument("--url", action="append", default=[], help="Einzelne URL prüfen (mehrfach möglich)")
+    parser.add_argument("--per-host", type=int, default=4, help="Gleichzeitige Anfragen pro Host")
+    parser.add_argument("--concurrency", type=int, default=64, help="Gleichzeitige Anfragen insgesamt")
+    parser.add_argument("--timeout", type=float, default=10.0, help="Timeout pro Anfrage in Sekunden")
+    parser.add_argument("--ttl-hours", type=float, default=168.0, help="Erreichbare URLs so lange nicht erneut prüfen")
+    parser.add_argument("--no-cache", action="store_true", help="Cache weder lesen noch schreiben")
+    parser.add_argument("--report", metavar="BERICHT.json", help="Ergebnisse als JSON schreiben ('-' für stdout)")
+    parser.add_argument("--strict", action="store_true", help="Mit Exit-Code 1 enden, wenn Links defekt sind")
+    args = parser.parse_args(argv)
+    if args.per_host < 1 or args.concurrency < 1:
+        parser.error("--per-host und --concurrency müssen >= 1 sein")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    sources = args.sources or ([] if args.url else list(SOURCES))
+    files = source_files(sources)
+    usages = collect_urls(files)
+    for url in args.url:
+        usages.setdefault(url, []).append("--url")
+
+    now = time.time()
+    cached = {} if args.no_cache else load_cache(CACHE_PATH)
+    results = fresh_results(cached, usages, args.ttl_hours * 3600, now)
+    pending = [url for url in usages if url not in results]
+
+    async def run() -> LinkChecker:
+        checker = LinkChecker(args.per_host, args.concurrency, args.timeout)
+        for url, result in (await checker.check_all(pending)).items():
+            results[url] = {**result, "checkedAt": now}
+        return checker
+
+    started = time.perf_counter()
+    checker = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+    if not args.no_cache:
+        ttl_seconds = args.ttl_hours * 3600
+        keep = {url: entry for url, entry in cached.items() if now - entry.get("checkedAt", 0) < ttl_seconds}
+        save_cache(CACHE_PATH, {**keep, **results})
+
+    out = sys.stderr if args.report == "-" else sys.stdout
+    broken = sorted(url for url in usages if not results[url]["ok"])
+    for url in broken:
+        print(f"{results[url]['reason']}: {url}", file=out)
+        for usage in usages[url][:3]:
+            print(f"  {usage}", file=out)
+        if len(usages[url]) > 3:
+            print(f"  … und {len(usages[url]) - 3} weitere", file=out)
+    print(
+        f"{len(usages)} URL(s) aus {len(files)} Datei(en): {len(usages) - len(pending)} aus dem Cache, "
+        f"{len(pending)} geprüft in {elapsed:.1f} s ({checker.requests} Anfragen über {checker.connections} "
+        f"Verbindungen), {len(broken)} defekt.",
+        file=out,
+    )
+
+    if args.report:
+        report = {
+            "version": REPORT_VERSION,
+            "urls": [{"url": url, **results[url], "usages": usages[url]} for url in sorted(usages)],
+        }
+        text = json.dumps(report, ensure_ascii=False, indent=2) + "\n"
+        if args.report == "-":
+            sys.stdout.write(text)
+        else:
+            Path(args.report).write_text(text, encoding="utf-8")
+    return 1 if args.strict and broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
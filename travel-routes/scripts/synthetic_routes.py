@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""Synthetische Routen für Benchmarks von ``build_data.py``.
+
+Erzeugt beliebig viele Routen in beiden Schemata, abgeleitet aus den echten
+Daten, damit Form und Trefferquoten der Enrichments realistisch bleiben:
+
+* Legacy (``stops``/``segments``): Klone der ``ROUTE_DEFINITIONS`` über einem
+  synthetischen Stopp-Katalog. Jeder synthetische Stopp kopiert einen echten
+  Stopp samt seinem ``STOP_ENRICHMENTS``-Eintrag (falls vorhanden); Lodging,
+  Food, Activities und Flüge behalten ihre Namen und treffen die Tabellen
+  daher so oft wie im Original. ``SEGMENT_SPECIFICS`` werden mit derselben
+  Quote wie bei den echten Routen für die neuen Stopp-Paare angelegt.
+* 2026 (``days[]``): Klone der handgeschriebenen Tagesrouten mit verschobenen
+  Koordinaten und verdichteten ``mapLayers.dailySegments``-Linien.
+
+Alles ist über ``seed`` reproduzierbar.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from copy import deepcopy
+from pathlib import Path
+from typing import Iterable, Iterator
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+import build_data  # noqa: E402
+
+# Grob das chilenische Festland – synthetische Koordinaten bleiben plausibel.
+LAT_RANGE = (-54.0, -18.0)
+LNG_RANGE = (-75.0, -67.0)
+LINE_POINTS = 48
+
+
+def _jitter(rng: random.Random, lat: float, lng: float, spread: float = 0.5) -> tuple[float, float]:
+    lat = min(max(lat + rng.uniform(-spread, spread), LAT_RANGE[0]), LAT_RANGE[1])
+    lng = min(max(lng + rng.uniform(-spread, spread), LNG_RANGE[0]), LNG_RANGE[1])
+    return round(lat, 5), round(lng, 5)
+
+
+def synthetic_tables(stop_count: int, seed: int = 0, route_count: int = 0) -> dict:
+    """Synthetic ``STOPS``/``STOP_ENRICHMENTS``/``SEGMENT_SPECIFICS`` with the real enrichment hit rates.
+
+    The segment specifics cover the first ``route_count`` routes of
+    ``synthetic_definitions()`` with the same ``seed``, so the tables are
+    complete before a build compiles its joins.
+    """
+
+    rng = random.Random(seed)
+    templates = list(build_data.STOPS.values())
+    stops: dict[str, dict] = {}
+    enrichments: dict[str, dict] = {}
+    for index in range(stop_count):
+        template = templates[index % len(templates)]
+        stop_id = f"syn-stop-{index:05d}"
+        stop = deepcopy(template)
+        stop["id"] = stop_id
+        stop["name"] = f"{template.get('name', 'Stop')} #{index}"
+        lat, lng = _jitter(rng, template["coordinates"]["lat"], template["coordinates"]["lng"])
+        stop["coordinates"] = {"lat": lat, "lng": lng}
+        stops[stop_id] = stop
+        if template["id"] in build_data.STOP_ENRICHMENTS:
+            enrichments[stop_id] = deepcopy(build_data.STOP_ENRICHMENTS[template["id"]])
+    return {
+        "stops": stops,
+        "stopEnrichments": enrichments,
+        "segmentSpecifics": _segment_specifics(route_count, list(stops), seed),
+    }
+
+
+def _specifics_hit_rate() -> float:
+    segments = [segment for definition in build_data.ROUTE_DEFINITIONS for segment in definition.get("segments", [])]
+    hits = sum(
+        1 for segment in segments if (segment["from"], segment["to"], segment["mode"]) in build_data.SEGMENT_SPECIFICS
+    )
+    return hits / len(segments) if segments else 0.0
+
+
+def _stop_mappings(count: int, stop_ids: list[str], seed: int) -> Iterator[tuple[dict, dict[str, str]]]:
+    """``(template, real → synthetic stop id)`` of each of the first ``count`` legacy routes."""
+
+    rng = random.Random(seed + 1)
+    for index in range(count):
+        template = build_data.ROUTE_DEFINITIONS[index % len(build_data.ROUTE_DEFINITIONS)]
+        yield template, dict(zip(template["stops"], rng.sample(stop_ids, min(len(template["stops"]), len(stop_ids)))))
+
+
+def _segment_specifics(route_count: int, stop_ids: list[str], seed: int) -> dict[tuple[str, str, str], dict]:
+    rng = random.Random(seed + 3)
+    specifics = list(build_data.SEGMENT_SPECIFICS.values())
+    hit_rate = _specifics_hit_rate()
+    table: dict[tuple[str, str, str], dict] = {}
+    if not specifics:
+        return table
+    for template, mapping in _stop_mappings(route_count, stop_ids, seed):
+        for segment in template.get("segments", []):
+            if rng.random() < hit_rate:
+                key = (mapping.get(segment["from"], segment["from"]), mapping.get(segment["to"], segment["to"]))
+                table[(*key, segment["mode"])] = deepcopy(rng.choice(specifics))
+    return table
+
+
+def synthetic_definitions(count: int, tables: dict, seed: int = 0) -> Iterator[dict]:
+    """Yield legacy route definitions over ``tables["stops"]``, one at a time.
+
+    ``tables`` should come from ``synthetic_tables()`` with the same ``seed``
+    and a ``route_count`` of at least ``count``; only then do the routes hit
+    its segment specifics.
+    """
+
+    for index, (template, mapping) in enumerate(_stop_mappings(count, list(tables["stops"]), seed)):
+        definition = deepcopy(template)
+        definition["id"] = f"syn-legacy-{index:05d}"
+        definition["name"] = f"{template['name']} (synthetisch {index})"
+        definition["stops"] = [mapping[stop_id] for stop_id in template["stops"] if stop_id in mapping]
+        for segment in definition.get("segments", []):
+            segment["from"] = mapping.get(segment["from"], segment["from"])
+            segment["to"] = mapping.get(segment["to"], segment["to"])
+        for flight in definition.get("flights", []):
+            flight["fromStopId"] = mapping.get(flight["fromStopId"], flight["fromStopId"])
+            flight["toStopId"] = mapping.get(flight["toStopId"], flight["toStopId"])
+        yield definition
+
+
+def day_route_templates(route_dir: Path = BASE_DIR / "data" / "routes") -> list[dict]:
+    templates = []
+    for path in sorted(route_dir.glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        for route in data if isinstance(data, list) else [data]:
+            if isinstance(route, dict) and route.get("days"):
+                templates.append(route)
+    return templates
+
+
+def _densify(rng: random.Random, coordinates: list[list[float]]) -> list[list[float]]:
+    if len(coordinates) < 2:
+        return coordinates
+    (start_lng, start_lat), (end_lng, end_lat) = coordinates[0], coordinates[-1]
+    line = [coordinates[0]]
+    for step in range(1, LINE_POINTS - 1):
+        t = step / (LINE_POINTS - 1)
+        line.append(
+            [
+                round(start_lng + (end_lng - start_lng) * t + rng.uniform(-0.02, 0.02), 6),
+                round(start_lat + (end_lat - start_lat) * t + rng.uniform(-0.02, 0.02), 6),
+            ]
+        )
+    line.append(coordinates[-1])
+    return line
+
+
+def synthetic_day_routes(count: int, templates: list[dict], seed: int = 0) -> Iterator[dict]:
+    """Yield 2026 ``days[]`` routes cloned from ``templates`` with shifted coordinates."""
+
+    rng = random.Random(seed + 2)
+    for index in range(count):
+        template = templates[index % len(templates)]
+        route = deepcopy(template)
+        route["id"] = f"syn-days-{index:05d}"
+        route["name"] = f"{template.get('name', 'Route')} (synthetisch {index})"
+        route.pop("source", None)
+        d_lat, d_lng = rng.uniform(-0.3, 0.3), rng.uniform(-0.3, 0.3)
+        for day in route["days"]:
+            coords = (day.get("station") or {}).get("coordinates")
+            if coords and "lat" in coords and "lng" in coords:
+                coords["lat"] = round(coords["lat"] + d_lat, 5)
+                coords["lng"] = round(coords["lng"] + d_lng, 5)
+        for segment in (route.get("mapLayers") or {}).get("dailySegments", []):
+            geometry = segment.get("geometry") or {}
+            if geometry.get("type") == "LineString":
+                shifted = [[lng + d_lng, lat + d_lat] for lng, lat in geometry["coordinates"]]
+                geometry["coordinates"] = _densify(rng, shifted)
+        yield route
+
+
+def write_day_routes(routes: Iterable[dict], route_dir: Path) -> int:
+    route_dir.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for route in routes:
+        (route_dir / f"{route['id']}.json").write_text(
+            json.dumps(route, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+        written += 1
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Synthetische Routen-Dateien (2026-Schema) erzeugen.")
+    parser.add_argument("count", type=int, help="Anzahl Routen")
+    parser.add_argument("target", type=Path, help="Zielordner")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_day_routes(synthetic_day_routes(args.count, day_route_templates(), args.seed), args.target)
+    print(f"{args.count} Routen nach {args.target} geschrieben.")
+
+
+if __name__ == "__main__":
+    main()
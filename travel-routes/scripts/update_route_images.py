@@ -1,19 +1,48 @@
 #!/usr/bin/env python3
-"""Update route JSON image URLs.
+"""Ersetzt Bild-URLs der Routen-Dateien, die nicht von Wikimedia Commons stammen.
 
-This script scans all JSON files under `travel-routes/data/routes`.
-For each image entry (in various sections), if the `url` does not contain
-`commons.wikimedia.org` or `upload.wikimedia.org`, it replaces it with a
-placeholder Wikimedia Commons image and updates `caption`, `source`, and
-`license` fields.
-It also ensures that each image list has at least one entry; if empty,
-it adds a generic placeholder.
+Betroffen sind ``days[].station``, ``days[].arrival.segments[]``/``mapPoints[]``
+sowie ``stops[]``, ``lodging[]`` und ``food[]``. ``meta.highlightImages`` bleibt
+unverändert: Die Einträge verweisen per ``image`` statt ``url`` auf ihr Bild und
+sind keine Bildeinträge im Sinne dieses Skripts.
 
-The placeholder image used is a public domain PNG from Wikimedia Commons.
+Einträge der ``images``-/``photos``-Listen dieser Abschnitte mit fremder URL
+werden durch einen gemeinfreien Platzhalter von Wikimedia Commons ersetzt; die
+ursprüngliche Bildunterschrift bleibt erhalten. Leere ``images``-Listen bekommen
+den Platzhalter als einzigen Eintrag.
+
+Ein kompilierter Selektor (``json_select.py``) besucht pro Datei nur diese
+Listen, statt das ganze Dokument zu durchlaufen. Der Lauf sammelt die
+Ersetzungen als JSON Patch (RFC 6902) und schreibt die Datei nur, wenn sich
+ihre Bytes tatsächlich ändern – atomar über eine temporäre Datei.
+``--dry-run`` gibt die Patches pro Datei als JSON auf stdout aus, ohne etwas
+zu schreiben; mit ``--jobs`` laufen die Dateien parallel.
 """
+
+from __future__ import annotations
+
+import argparse
 import json
 import os
-import pathlib
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+TRAVEL_ROUTES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TRAVEL_ROUTES_DIR))
+
+from json_select import Selector, json_pointer  # noqa: E402
+
+ROUTES_DIR = TRAVEL_ROUTES_DIR / "data" / "routes"
+# Bildlisten der bearbeiteten Abschnitte; leere ``photos``-Listen bleiben leer.
+IMAGE_LISTS = Selector(
+    "days[*].station.images",
+    "days[*].arrival.segments[*].images",
+    "days[*].arrival.mapPoints[*].images",
+    "stops[*].photos",
+    "lodging[*].images",
+    "food[*].images",
+)
 
 PLACEHOLDER = {
     "url": "https://upload.wikimedia.org/wikipedia/commons/thumb/4/47/PNG_transparency_demonstration_1.png/800px-PNG_transparency_demonstration_1.png",
@@ -22,113 +51,121 @@ PLACEHOLDER = {
     "license": "CC0"
 }
 
+
 def is_wikimedia(url: str) -> bool:
     return "commons.wikimedia.org" in url or "upload.wikimedia.org" in url
 
-def process_image_entry(entry: dict) -> dict:
-    if not is_wikimedia(entry.get("url", "")):
-        # Replace with placeholder while preserving original caption if possible
-        new_entry = PLACEHOLDER.copy()
-        # Keep original caption if it exists
-        if entry.get("caption"):
-            new_entry["caption"] = entry["caption"]
-        return new_entry
-    return entry
-
-def ensure_list(lst):
-    return lst if isinstance(lst, list) else []
-
-def update_json_file(path: pathlib.Path):
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    # Skip files where the JSON root is a list (e.g., route collections)
+
+def replacement(entry: dict) -> dict | None:
+    """Placeholder for a non-Wikimedia image (keeping its caption), ``None`` if the entry can stay."""
+
+    url = entry.get("url")
+    if isinstance(url, str) and is_wikimedia(url):
+        return None
+    new_entry = dict(PLACEHOLDER)
+    if entry.get("caption"):
+        new_entry["caption"] = entry["caption"]
+    return new_entry
+
+
+def image_changes(data: dict) -> list[tuple[tuple, object]]:
+    """Replacements ``(path, value)`` for a route document, in document order (one traversal)."""
+
+    changes: list[tuple[tuple, object]] = []
+    for path, images in IMAGE_LISTS.matches(data):
+        if not isinstance(images, list):
+            continue
+        if not images and path[-1] == "images":
+            changes.append((path, [dict(PLACEHOLDER)]))
+        for index, image in enumerate(images):
+            if isinstance(image, dict):
+                new_image = replacement(image)
+                if new_image is not None:
+                    changes.append((path + (index,), new_image))
+    return changes
+
+
+def apply_changes(data: dict, changes: list[tuple[tuple, object]]) -> None:
+    # Ersetzte Knoten werden nicht weiter durchlaufen – die Pfade überschneiden sich nie.
+    for path, value in changes:
+        parent = data
+        for part in path[:-1]:
+            parent = parent[part]
+        parent[path[-1]] = value
+
+
+def json_patch(changes: list[tuple[tuple, object]]) -> list[dict]:
+    return [{"op": "replace", "path": json_pointer(path), "value": value} for path, value in changes]
+
+
+def write_atomic(path: Path, payload: bytes) -> None:
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    temporary.write_bytes(payload)
+    os.replace(temporary, path)
+
+
+def rewrite_file(task: tuple[Path, bool]) -> tuple[str, str, list[dict]]:
+    """Rewrite one route file (also runs in a ``--jobs`` worker): ``(path, status, patch)``."""
+
+    path, dry_run = task
+    raw = path.read_bytes()
+    data = json.loads(raw)
+    # Sammel-Dateien mit einer Liste als Wurzel enthalten keine Routen-Bilder.
     if not isinstance(data, dict):
-        print(f"Skipping {path} (root is not a dict)")
-        return
-    modified = False
-
-    # Helper to walk through known image containers
-    def walk_images(container):
-        nonlocal modified
-        if isinstance(container, dict):
-            # Only replace if it looks like an image entry: has 'url' AND ('caption' OR 'source' OR 'credit')
-            # AND it is NOT a website link (which usually doesn't have caption/credit in the same dict)
-            if "url" in container and ("caption" in container or "source" in container or "credit" in container):
-                if not is_wikimedia(container.get("url", "")):
-                    new_img = process_image_entry(container)
-                    if new_img != container:
-                        container.clear()
-                        container.update(new_img)
-                        modified = True
-            
-            # Recurse into all values
-            for key, value in list(container.items()):
-                if key == "images" and isinstance(value, list):
-                    if not value:
-                        container[key] = [PLACEHOLDER.copy()]
-                        modified = True
-                    else:
-                        new_imgs = []
-                        for img in value:
-                            new_img = process_image_entry(img)
-                            new_imgs.append(new_img)
-                        if new_imgs != value:
-                            if "chile-route-4-patagonia-sur-2026" in str(path):
-                                print(f"DEBUG: Modifying images list in {path}")
-                                print(f"Old: {value[0].get('url')}")
-                                print(f"New: {new_imgs[0].get('url')}")
-                            container[key] = new_imgs
-                            modified = True
-                elif key == "photos" and isinstance(value, list):
-                    new_imgs = []
-                    for img in value:
-                        new_img = process_image_entry(img)
-                        new_imgs.append(new_img)
-                    if new_imgs != value:
-                        container[key] = new_imgs
-                        modified = True
-                else:
-                    walk_images(value)
-        elif isinstance(container, list):
-            for item in container:
-                walk_images(item)
-
-    # Sections to process
-    # meta.highlightImages
-    if "meta" in data and isinstance(data["meta"], dict):
-        if "highlightImages" in data["meta"]:
-            walk_images({"images": data["meta"]["highlightImages"]})
-            data["meta"]["highlightImages"] = data["meta"]["highlightImages"]
-    # days -> station, arrival.segments, arrival.mapPoints
-    for day in data.get("days", []):
-        station = day.get("station", {})
-        walk_images(station)
-        arrival = day.get("arrival", {})
-        for seg in arrival.get("segments", []):
-            walk_images(seg)
-        for mp in arrival.get("mapPoints", []):
-            walk_images(mp)
-    # stops[].photos
-    for stop in data.get("stops", []):
-        walk_images(stop)
-    # lodging[].images
-    for lodge in data.get("lodging", []):
-        walk_images(lodge)
-    # food[].images
-    for food in data.get("food", []):
-        walk_images(food)
-
-    if modified:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"Updated {path}")
+        return str(path), "skipped", []
+    changes = image_changes(data)
+    if not changes:
+        return str(path), "unchanged", []
+    patch = json_patch(changes)
+    apply_changes(data, changes)
+    text = json.dumps(data, ensure_ascii=False, indent=2)
+    payload = (text + "\n" if raw.endswith(b"\n") else text).encode("utf-8")
+    if payload == raw:
+        return str(path), "unchanged", []
+    if not dry_run:
+        write_atomic(path, payload)
+    return str(path), "updated", patch
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes-dir", type=Path, default=ROUTES_DIR, help="Ordner mit den Routen-Dateien")
+    parser.add_argument("--jobs", type=int, default=1, help="Dateien in N Prozessen bearbeiten (0 = alle CPU-Kerne)")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Nichts schreiben, JSON Patch pro Datei auf stdout ausgeben"
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs muss >= 0 sein")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    tasks = [(path, args.dry_run) for path in sorted(args.routes_dir.rglob("*.json"))]
+    if args.jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            results = list(pool.map(rewrite_file, tasks))
     else:
-        print(f"No changes needed for {path}")
+        results = [rewrite_file(task) for task in tasks]
+
+    # Im Dry-Run gehört stdout den Patches; Statusmeldungen gehen nach stderr.
+    out = sys.stderr if args.dry_run else sys.stdout
+    updated = 0
+    for name, status, _ in results:
+        if status == "skipped":
+            print(f"Skipping {name} (root is not a dict)", file=out)
+        elif status == "updated":
+            updated += 1
+            print(f"{'Would update' if args.dry_run else 'Updated'} {name}", file=out)
+    print(f"{updated} von {len(results)} Datei(en) {'zu ändern' if args.dry_run else 'geändert'}.", file=out)
+    if args.dry_run:
+        patches = {name: patch for name, status, patch in results if status == "updated"}
+        sys.stdout.write(json.dumps(patches, ensure_ascii=False, indent=2) + "\n")
+    return 0
 
-def main():
-    base_dir = pathlib.Path(__file__).resolve().parents[2] / "travel-routes" / "data" / "routes"
-    for json_path in base_dir.rglob("*.json"):
-        update_json_file(json_path)
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
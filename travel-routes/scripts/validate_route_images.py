@@ -1,44 +1,181 @@
 #!/usr/bin/env python3
-"""Validate that all image URLs in route JSON files are from Wikimedia Commons.
-Prints any files and entries that still have non‑Wikimedia URLs.
+"""Prüft, ob alle Bild-URLs der Routen-Dateien von Wikimedia Commons stammen.
+
+Bildeinträge sind Objekte mit ``url`` und ``caption`` oder ``source`` in den
+Bildlisten aus ``ROUTE_IMAGE_LISTS`` (``json_select.py``). Jede
+Datei unter ``data/routes`` wird einmal gehasht (SHA-256); nur Dateien, deren
+Hash sich seit dem letzten Lauf geändert hat, werden geparst und geprüft –
+mit ``--jobs`` parallel in mehreren Prozessen. Die Ergebnisse pro Datei liegen
+in ``.build-cache/image-validation.json``.
+
+``--report BERICHT.json`` (oder ``-`` für stdout) schreibt alle Funde als JSON:
+Datei, JSON-Pointer (RFC 6901), URL und Grund. ``--strict`` beendet den Lauf
+mit Exit-Code 1, sobald es Funde gibt – so lässt sich das Skript als
+Pre-Deploy-Schritt einsetzen.
 """
-import json, pathlib, sys
 
-def is_wikimedia(url):
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+TRAVEL_ROUTES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TRAVEL_ROUTES_DIR))
+
+from json_select import ROUTE_IMAGE_LISTS, Selector, json_pointer  # noqa: E402
+
+ROUTES_DIR = TRAVEL_ROUTES_DIR / "data" / "routes"
+CACHE_PATH = TRAVEL_ROUTES_DIR / ".build-cache" / "image-validation.json"
+# Erhöhen, sobald sich die Prüfregeln ändern – alte Cache-Einträge werden dann verworfen.
+VALIDATOR_VERSION = 2
+REPORT_VERSION = 1
+IMAGES = Selector(*(f"{pattern}[*]" for pattern in ROUTE_IMAGE_LISTS))
+
+
+def is_wikimedia(url: str) -> bool:
     return "commons.wikimedia.org" in url or "upload.wikimedia.org" in url
 
-def check_file(path: pathlib.Path):
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+
+def image_issues(data: object) -> list[dict]:
+    """Image records without a Wikimedia URL, in document order."""
+
     if not isinstance(data, dict):
-        return []
+        return []  # Sammel-Dateien mit einer Liste als Wurzel enthalten keine Routen-Bilder.
     issues = []
-    def walk(container, location=""):
-        if isinstance(container, dict):
-            # Identify image dicts by presence of 'url' and either 'caption' or 'source'
-            if "url" in container and ("caption" in container or "source" in container):
-                if not is_wikimedia(container["url"]):
-                    issues.append((location, container["url"]))
-            for k, v in container.items():
-                walk(v, f"{location}/{k}" if location else k)
-        elif isinstance(container, list):
-            for i, item in enumerate(container):
-                walk(item, f"{location}[{i}]")
-    walk(data)
+    for path, value in IMAGES.matches(data):
+        if isinstance(value, dict) and "url" in value and ("caption" in value or "source" in value):
+            url = value["url"]
+            if not isinstance(url, str) or not url:
+                issues.append({"pointer": json_pointer(path), "url": url, "reason": "invalid-url"})
+            elif not is_wikimedia(url):
+                issues.append({"pointer": json_pointer(path), "url": url, "reason": "not-wikimedia"})
     return issues
 
-def main():
-    base = pathlib.Path(__file__).resolve().parents[2] / "travel-routes" / "data" / "routes"
-    bad = False
-    for p in base.rglob("*.json"):
-        issues = check_file(p)
+
+def file_key(path: Path) -> str:
+    """Report and cache key: path relative to ``travel-routes/`` where possible."""
+
+    try:
+        return path.relative_to(TRAVEL_ROUTES_DIR).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def check_file(path: Path) -> list[dict]:
+    """Issues of one route file (also runs in a ``--jobs`` worker)."""
+
+    try:
+        data = json.loads(path.read_bytes())
+    except json.JSONDecodeError as error:
+        return [{"pointer": "", "url": None, "reason": f"invalid-json: {error}"}]
+    return image_issues(data)
+
+
+def load_cache(path: Path) -> dict:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+    if cache.get("version") != VALIDATOR_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def save_cache(path: Path, files: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    payload = json.dumps({"version": VALIDATOR_VERSION, "files": files}, ensure_ascii=False)
+    temporary.write_text(payload, encoding="utf-8")
+    os.replace(temporary, path)
+
+
+def validate(paths: list[Path], cached: dict, jobs: int = 1) -> tuple[dict, int]:
+    """Cache entries (``{sha256, issues}`` per file) for ``paths`` and the number of files checked anew."""
+
+    results = {}
+    pending = []
+    for path in paths:
+        name = file_key(path)
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        entry = cached.get(name)
+        if entry and entry.get("sha256") == digest:
+            results[name] = entry
+        else:
+            pending.append((name, digest, path))
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            checked = pool.map(check_file, [path for _, _, path in pending])
+            for (name, digest, _), issues in zip(pending, checked):
+                results[name] = {"sha256": digest, "issues": issues}
+    else:
+        for name, digest, path in pending:
+            results[name] = {"sha256": digest, "issues": check_file(path)}
+    return results, len(pending)
+
+
+def build_report(results: dict, checked: int) -> dict:
+    return {
+        "version": REPORT_VERSION,
+        "files": len(results),
+        "checked": checked,
+        "issues": [{"file": name, **issue} for name in sorted(results) for issue in results[name]["issues"]],
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--routes-dir", type=Path, default=ROUTES_DIR, help="Ordner mit den Routen-Dateien")
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Geänderte Dateien in N Prozessen prüfen (0 = alle CPU-Kerne)"
+    )
+    parser.add_argument("--report", metavar="BERICHT.json", help="Funde als JSON schreiben ('-' für stdout)")
+    parser.add_argument("--no-cache", action="store_true", help="Alle Dateien neu prüfen, Cache ignorieren")
+    parser.add_argument("--strict", action="store_true", help="Mit Exit-Code 1 enden, wenn es Funde gibt")
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs muss >= 0 sein")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    routes_dir = args.routes_dir.resolve()
+    cached = {} if args.no_cache else load_cache(CACHE_PATH)
+    results, checked = validate(sorted(routes_dir.rglob("*.json")), cached, args.jobs)
+    if results != cached:
+        # Einträge anderer Ordner (--routes-dir) bleiben erhalten.
+        prefix = file_key(routes_dir) + "/"
+        kept = {name: entry for name, entry in cached.items() if not name.startswith(prefix)}
+        save_cache(CACHE_PATH, {**kept, **results})
+    report = build_report(results, checked)
+
+    # Der JSON-Bericht auf stdout bleibt maschinenlesbar; die Textausgabe geht dann nach stderr.
+    out = sys.stderr if args.report == "-" else sys.stdout
+    for name in sorted(results):
+        issues = results[name]["issues"]
         if issues:
-            bad = True
-            print(f"Non‑Wikimedia URLs in {p}:")
-            for loc, url in issues:
-                print(f"  {loc}: {url}")
-    if not bad:
-        print("All image URLs are from Wikimedia Commons.")
+            print(f"Non‑Wikimedia URLs in {name}:", file=out)
+            for issue in issues:
+                print(f"  {issue['pointer']}: {issue['url']} ({issue['reason']})", file=out)
+    if not report["issues"]:
+        print("All image URLs are from Wikimedia Commons.", file=out)
+    print(f"{len(results)} Datei(en), {checked} neu geprüft.", file=out)
+
+    if args.report:
+        text = json.dumps(report, ensure_ascii=False, indent=2) + "\n"
+        if args.report == "-":
+            sys.stdout.write(text)
+        else:
+            Path(args.report).write_text(text, encoding="utf-8")
+    return 1 if args.strict and report["issues"] else 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
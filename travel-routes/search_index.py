@@ -0,0 +1,107 @@
+"""Invertierter Suchindex für die Routenauswahl.
+
+Statt jede Route mit einer eigenen ``searchTokens``-Liste auszuliefern, sammelt
+der Build alle Begriffe einmal: normalisiert (Unicode-NFKD ohne Akzente,
+kleingeschrieben), in Wörter zerlegt und alphabetisch sortiert. Jedes Wort
+zeigt auf die Positionen der Routen, in denen es vorkommt.
+
+Weil ``terms`` sortiert ist, findet eine Präfixsuche per Binärsuche den ersten
+passenden Begriff und liest dann nur die direkt folgenden Einträge – die Kosten
+hängen von der Zahl der Treffer ab, nicht von Routen × Tokens.
+"""
+
+from __future__ import annotations
+
+import unicodedata
+from bisect import bisect_left
+from typing import Iterable
+
+ARTIFACT_VERSION = 1
+
+
+class _WordChars(dict):
+    """``str.translate`` table, filled per code point on first use: marks vanish, separators become spaces."""
+
+    def __missing__(self, code: int) -> str | None:
+        category = unicodedata.category(chr(code))[0]
+        value = self[code] = None if category == "M" else chr(code) if category in "LN" else " "
+        return value
+
+
+_WORD_CHARS = _WordChars()
+
+
+def tokenize(value: str) -> list[str]:
+    """Lowercase runs of letters and digits (``\\p{L}``/``\\p{N}``) of ``value``, without accents.
+
+    Marks (Unicode category ``M*``) vanish after NFKD, so ``Valparaíso``
+    becomes ``valparaiso``. The same definition as ``tokenizeSearchText`` in travel-routes.js;
+    both are checked against ``search-tokens.fixture.json``.
+    """
+
+    return unicodedata.normalize("NFKD", str(value)).translate(_WORD_CHARS).lower().split()
+
+
+class SearchIndex:
+    """Sorted term list with route postings and prefix lookup."""
+
+    def __init__(self, route_ids: list[str], terms: list[str], postings: list[list[int]]) -> None:
+        self.route_ids = route_ids
+        self.terms = terms
+        self.postings = postings
+
+    @classmethod
+    def build(cls, documents: Iterable[tuple[str, list[str]]]) -> "SearchIndex":
+        """Index ``(route_id, texts)`` pairs; route order is kept for the postings.
+
+        ``documents`` is consumed once, so it may be a generator over a spool.
+        """
+
+        route_ids: list[str] = []
+        inverted: dict[str, list[int]] = {}
+        for route_id, texts in documents:
+            position = len(route_ids)
+            route_ids.append(route_id)
+            for text in texts:
+                for word in tokenize(text):
+                    # Positions only grow, so a list stays sorted and unique
+                    # with a look at its last item – far smaller than a set.
+                    posting = inverted.setdefault(word, [])
+                    if not posting or posting[-1] != position:
+                        posting.append(position)
+        terms = sorted(inverted)
+        return cls(route_ids, terms, [inverted[term] for term in terms])
+
+    def _prefix_matches(self, prefix: str) -> set[int]:
+        matches: set[int] = set()
+        position = bisect_left(self.terms, prefix)
+        while position < len(self.terms) and self.terms[position].startswith(prefix):
+            matches.update(self.postings[position])
+            position += 1
+        return matches
+
+    def lookup(self, query: str) -> list[str]:
+        """Route ids where every query word is a prefix of some indexed term."""
+
+        words = tokenize(query)
+        if not words:
+            return list(self.route_ids)
+        matches: set[int] | None = None
+        for word in words:
+            found = self._prefix_matches(word)
+            matches = found if matches is None else matches & found
+            if not matches:
+                return []
+        return [self.route_ids[position] for position in sorted(matches)]
+
+    def to_artifact(self) -> dict:
+        return {
+            "version": ARTIFACT_VERSION,
+            "routes": self.route_ids,
+            "terms": self.terms,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_artifact(cls, artifact: dict) -> "SearchIndex":
+        return cls(artifact["routes"], artifact["terms"], artifact["postings"])
@@ -0,0 +1,110 @@
+/**
+ * Abfragen auf `data/spatial-index.json` (KD-Baum aus `spatial_index.py`).
+ * -------------------------------------------------------------------------
+ * Der Build legt die Orte bereits in Baumreihenfolge ab: Jede Teilliste
+ * `[left, right]` hat ihren Median bei `(left + right) >> 1`, die Achse
+ * wechselt pro Ebene (x → y → z auf der Einheitskugel). Wir müssen hier also
+ * nichts sortieren, nur dieselbe Rekursion wie in Python ablaufen.
+ */
+
+const EARTH_RADIUS_KM = 6371;
+
+function toXyz(lat, lng) {
+  const phi = (lat * Math.PI) / 180;
+  const lambda = (lng * Math.PI) / 180;
+  return [Math.cos(phi) * Math.cos(lambda), Math.cos(phi) * Math.sin(lambda), Math.sin(phi)];
+}
+
+function chordToKm(chord) {
+  return 2 * EARTH_RADIUS_KM * Math.asin(Math.min(1, chord / 2));
+}
+
+function kmToChord(km) {
+  return 2 * Math.sin(Math.min(km / EARTH_RADIUS_KM, Math.PI) / 2);
+}
+
+function chordBetween(a, b) {
+  return Math.hypot(a[0] - b[0], a[1] - b[1], a[2] - b[2]);
+}
+
+/**
+ * @param {{ nodeSize: number, fields: string[], items: unknown[][] }} artifact
+ */
+export function createSpatialIndex(artifact) {
+  const { fields, nodeSize } = artifact;
+  const items = artifact.items.map((row) => Object.fromEntries(fields.map((field, position) => [field, row[position]])));
+  const points = items.map((item) => toXyz(item.lat, item.lng));
+
+  /** Alle Orte im Umkreis von `radiusKm`, die nächsten zuerst: `[{ item, km }]`. */
+  function within(lat, lng, radiusKm, kind = null) {
+    const query = toXyz(lat, lng);
+    const limit = kmToChord(radiusKm);
+    const found = [];
+    const stack = [[0, items.length - 1, 0]];
+    while (stack.length) {
+      const [left, right, axis] = stack.pop();
+      if (right < left) continue;
+      let first = left;
+      let last = right;
+      if (right - left > nodeSize) {
+        const middle = (left + right) >> 1;
+        first = last = middle;
+        const delta = query[axis] - points[middle][axis];
+        const nextAxis = (axis + 1) % 3;
+        if (delta <= limit) stack.push([left, middle - 1, nextAxis]);
+        if (delta >= -limit) stack.push([middle + 1, right, nextAxis]);
+      }
+      for (let position = first; position <= last; position += 1) {
+        const chord = chordBetween(query, points[position]);
+        if (chord <= limit && (kind === null || items[position].kind === kind)) {
+          found.push([chord, position]);
+        }
+      }
+    }
+    found.sort((a, b) => a[0] - b[0] || a[1] - b[1]);
+    return found.map(([chord, position]) => ({ item: items[position], km: chordToKm(chord) }));
+  }
+
+  /** Die `k` nächsten Orte, die nächsten zuerst: `[{ item, km }]`. */
+  function nearest(lat, lng, k = 5, kind = null) {
+    if (k <= 0) return [];
+    const query = toXyz(lat, lng);
+    const best = []; // aufsteigend nach Sehnenlänge, höchstens k Einträge
+
+    function consider(position) {
+      if (kind !== null && items[position].kind !== kind) return;
+      const chord = chordBetween(query, points[position]);
+      if (best.length === k && chord >= best[k - 1][0]) return;
+      let index = best.length;
+      while (index > 0 && (best[index - 1][0] > chord || (best[index - 1][0] === chord && best[index - 1][1] > position))) {
+        index -= 1;
+      }
+      best.splice(index, 0, [chord, position]);
+      if (best.length > k) best.pop();
+    }
+
+    function visit(left, right, axis) {
+      if (right < left) return;
+      if (right - left <= nodeSize) {
+        for (let position = left; position <= right; position += 1) consider(position);
+        return;
+      }
+      const middle = (left + right) >> 1;
+      consider(middle);
+      const delta = query[axis] - points[middle][axis];
+      const nextAxis = (axis + 1) % 3;
+      const lower = [left, middle - 1];
+      const upper = [middle + 1, right];
+      const [near, far] = delta <= 0 ? [lower, upper] : [upper, lower];
+      visit(near[0], near[1], nextAxis);
+      if (best.length < k || Math.abs(delta) < best[best.length - 1][0]) {
+        visit(far[0], far[1], nextAxis);
+      }
+    }
+
+    visit(0, items.length - 1, 0);
+    return best.map(([chord, position]) => ({ item: items[position], km: chordToKm(chord) }));
+  }
+
+  return { items, nearest, within };
+}
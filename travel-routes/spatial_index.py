@@ -0,0 +1,163 @@
+"""Räumlicher Index (KD-Baum) für Stopps, POIs, Events und Tagesstationen.
+
+Koordinaten werden auf die Einheitskugel projiziert (x, y, z). In diesem Raum
+ist die Sehnenlänge streng monoton zur Großkreisdistanz, ein gewöhnlicher
+3D-KD-Baum liefert also korrekte Nachbarn – auch über Datumsgrenze und Pole.
+
+Der Baum ist *implizit*: ``items`` wird so sortiert, dass jede Teilliste
+``[left, right]`` ihren Median bei ``(left + right) // 2`` hat und die Achse
+pro Ebene wechselt (x → y → z). Das Artefakt für das Frontend ist deshalb nur
+die sortierte Liste plus ``nodeSize``; ``spatial-index.js`` fragt es mit
+derselben Rekursion ab (Orte in der Nähe eines Stopps in ``travel-routes.js``).
+"""
+
+from __future__ import annotations
+
+import heapq
+from math import asin, cos, radians, sin, sqrt
+
+EARTH_RADIUS_KM = 6371
+ARTIFACT_VERSION = 1
+# Decimal places of ``lat``/``lng`` in the artifact (about 1 m).
+COORDINATE_DIGITS = 5
+
+
+def _to_xyz(lat: float, lng: float) -> tuple[float, float, float]:
+    phi = radians(lat)
+    lam = radians(lng)
+    return (cos(phi) * cos(lam), cos(phi) * sin(lam), sin(phi))
+
+
+def _chord_to_km(chord: float) -> float:
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, chord / 2))
+
+
+def _km_to_chord(km: float) -> float:
+    return 2 * sin(min(km / EARTH_RADIUS_KM, 3.141592653589793) / 2)
+
+
+class SpatialIndex:
+    """k-nearest and radius queries over ``{"id", "kind", "lat", "lng", "name"}`` items."""
+
+    def __init__(self, items: list[dict], node_size: int = 8) -> None:
+        self.node_size = max(1, node_size)
+        self.items = list(items)
+        # Split on the rounded coordinates the artifact stores, so that the
+        # tree order is exact for ``spatial-index.js`` as well.
+        self._xyz = [
+            _to_xyz(round(item["lat"], COORDINATE_DIGITS), round(item["lng"], COORDINATE_DIGITS)) for item in self.items
+        ]
+        self._sort(0, len(self.items) - 1, 0)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _sort(self, left: int, right: int, axis: int) -> None:
+        if right - left <= self.node_size:
+            return
+        pairs = sorted(zip(self._xyz[left : right + 1], self.items[left : right + 1]), key=lambda pair: pair[0][axis])
+        self._xyz[left : right + 1] = [pair[0] for pair in pairs]
+        self.items[left : right + 1] = [pair[1] for pair in pairs]
+        middle = (left + right) // 2
+        next_axis = (axis + 1) % 3
+        self._sort(left, middle - 1, next_axis)
+        self._sort(middle + 1, right, next_axis)
+
+    @staticmethod
+    def _chord(a: tuple[float, float, float], b: tuple[float, float, float]) -> float:
+        return sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2 + (a[2] - b[2]) ** 2)
+
+    def within(self, lat: float, lng: float, radius_km: float, kind: str | None = None) -> list[tuple[dict, float]]:
+        """All items within ``radius_km`` of the point, closest first."""
+
+        query = _to_xyz(lat, lng)
+        limit = _km_to_chord(radius_km)
+        found: list[tuple[float, int]] = []
+        stack = [(0, len(self.items) - 1, 0)]
+        while stack:
+            left, right, axis = stack.pop()
+            if right < left:
+                continue
+            if right - left <= self.node_size:
+                candidates = range(left, right + 1)
+            else:
+                middle = (left + right) // 2
+                candidates = (middle,)
+                delta = query[axis] - self._xyz[middle][axis]
+                next_axis = (axis + 1) % 3
+                if delta <= limit:
+                    stack.append((left, middle - 1, next_axis))
+                if delta >= -limit:
+                    stack.append((middle + 1, right, next_axis))
+            for position in candidates:
+                chord = self._chord(query, self._xyz[position])
+                if chord <= limit and (kind is None or self.items[position].get("kind") == kind):
+                    found.append((chord, position))
+        found.sort()
+        return [(self.items[position], _chord_to_km(chord)) for chord, position in found]
+
+    def nearest(self, lat: float, lng: float, k: int = 5, kind: str | None = None) -> list[tuple[dict, float]]:
+        """The ``k`` items closest to the point, closest first."""
+
+        if k <= 0:
+            return []
+        query = _to_xyz(lat, lng)
+        best: list[tuple[float, int]] = []  # max-heap via negated chord
+
+        def visit(left: int, right: int, axis: int) -> None:
+            if right < left:
+                return
+            if right - left <= self.node_size:
+                candidates = range(left, right + 1)
+                middle = None
+            else:
+                middle = (left + right) // 2
+                candidates = (middle,)
+            for position in candidates:
+                if kind is not None and self.items[position].get("kind") != kind:
+                    continue
+                chord = self._chord(query, self._xyz[position])
+                if len(best) < k:
+                    heapq.heappush(best, (-chord, position))
+                elif chord < -best[0][0]:
+                    heapq.heapreplace(best, (-chord, position))
+            if middle is None:
+                return
+            delta = query[axis] - self._xyz[middle][axis]
+            next_axis = (axis + 1) % 3
+            near, far = ((left, middle - 1), (middle + 1, right)) if delta <= 0 else ((middle + 1, right), (left, middle - 1))
+            visit(*near, next_axis)
+            if len(best) < k or abs(delta) < -best[0][0]:
+                visit(*far, next_axis)
+
+        visit(0, len(self.items) - 1, 0)
+        ranked = sorted((-negated, position) for negated, position in best)
+        return [(self.items[position], _chord_to_km(chord)) for chord, position in ranked]
+
+    def to_artifact(self) -> dict:
+        """Compact JSON form: items as ``[id, kind, lat, lng, name]`` rows in tree order."""
+
+        return {
+            "version": ARTIFACT_VERSION,
+            "nodeSize": self.node_size,
+            "fields": ["id", "kind", "lat", "lng", "name"],
+            "items": [
+                [
+                    item["id"],
+                    item["kind"],
+                    round(item["lat"], COORDINATE_DIGITS),
+                    round(item["lng"], COORDINATE_DIGITS),
+                    item.get("name", ""),
+                ]
+                for item in self.items
+            ],
+        }
+
+    @classmethod
+    def from_artifact(cls, artifact: dict) -> "SpatialIndex":
+        fields = artifact["fields"]
+        index = cls.__new__(cls)
+        index.node_size = artifact["nodeSize"]
+        index.items = [dict(zip(fields, row)) for row in artifact["items"]]
+        index._xyz = [_to_xyz(item["lat"], item["lng"]) for item in index.items]
+        return index
@@ -0,0 +1,117 @@
+"""Tests für ``scripts/check_route_links.py`` gegen einen lokalen HTTP-Server."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+TRAVEL_ROUTES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TRAVEL_ROUTES_DIR / "scripts"))
+
+from check_route_links import LinkChecker  # noqa: E402
+
+SLOW_SECONDS = 1.0
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_HEAD(self) -> None:
+        self.respond(head=True)
+
+    def do_GET(self) -> None:
+        self.respond(head=False)
+
+    def respond(self, head: bool) -> None:
+        path = self.path
+        if path == "/ok":
+            self.send(200, head)
+        elif path == "/no-head":
+            self.send(405 if head else 206, head)
+        elif path.startswith("/hop/"):
+            remaining = int(path.rsplit("/", 1)[1])
+            self.send(302, head, location="/ok" if remaining == 0 else f"/hop/{remaining - 1}")
+        elif path == "/slow":
+            time.sleep(SLOW_SECONDS)
+            self.send(200, head)
+        else:
+            self.send(404, head)
+
+    def send(self, status: int, head: bool, location: str | None = None) -> None:
+        body = b"x"
+        self.send_response(status)
+        if location:
+            self.send_header("Location", location)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class LinkCheckerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def check(self, *paths: str, **options: object) -> tuple[list[dict], LinkChecker]:
+        async def run() -> tuple[list[dict], LinkChecker]:
+            checker = LinkChecker(**options)
+            results = []
+            try:
+                for path in paths:
+                    results.append(await checker.check(self.base + path))
+            finally:
+                await checker.close()
+            return results, checker
+
+        return asyncio.run(run())
+
+    def test_ok(self) -> None:
+        (result,), checker = self.check("/ok")
+        self.assertEqual(result, {"ok": True, "status": 200, "reason": None})
+        self.assertEqual(checker.requests, 1)
+
+    def test_not_found(self) -> None:
+        (result,), _ = self.check("/missing")
+        self.assertEqual(result, {"ok": False, "status": 404, "reason": "HTTP 404"})
+
+    def test_head_not_allowed_falls_back_to_get(self) -> None:
+        (result,), checker = self.check("/no-head")
+        self.assertEqual(result, {"ok": True, "status": 206, "reason": None})
+        self.assertEqual(checker.requests, 2)
+
+    def test_redirect_chain(self) -> None:
+        (result,), checker = self.check("/hop/2")
+        self.assertEqual(result, {"ok": True, "status": 200, "reason": None})
+        self.assertEqual(checker.requests, 4)
+        self.assertEqual(checker.connections, 1)
+
+    def test_too_many_redirects(self) -> None:
+        (result,), _ = self.check("/hop/9")
+        self.assertFalse(result["ok"])
+        self.assertIn("Weiterleitungen", result["reason"])
+
+    def test_timeout_on_reused_connection_is_not_retried(self) -> None:
+        (first, second), checker = self.check("/ok", "/slow", per_host=1, timeout=0.2)
+        self.assertTrue(first["ok"])
+        self.assertEqual(second, {"ok": False, "status": None, "reason": "timeout"})
+        self.assertEqual((checker.requests, checker.connections), (2, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
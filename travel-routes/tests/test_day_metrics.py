@@ -0,0 +1,140 @@
+"""Tests für die Kennzahlen der Tagesrouten (``days[]``) in ``build_data.py``."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+TRAVEL_ROUTES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TRAVEL_ROUTES_DIR))
+
+from build_data import compute_day_metrics, data_table, day_hotel_stay, day_legs, haversine_km  # noqa: E402
+
+SANTIAGO = {"lat": -33.4489, "lng": -70.6693}
+VALPARAISO = {"lat": -33.0472, "lng": -71.6127}
+LAYER_LINE = [[-70.6693, -33.4489], [-71.0, -33.3], [-71.6127, -33.0472]]
+
+
+def arrival(*segments: dict) -> dict:
+    return {"arrival": {"segments": list(segments)}}
+
+
+class DayLegsTest(unittest.TestCase):
+    def test_distance_wins_over_coordinates(self) -> None:
+        day = arrival(
+            {"mode": "car", "distanceKm": 120, "from": {"coordinates": SANTIAGO}, "to": {"coordinates": VALPARAISO}},
+            {"mode": "bus", "from": {"coordinates": SANTIAGO}, "to": {"coordinates": VALPARAISO}},
+        )
+        self.assertEqual(day_legs(day, []), [("drive", 120.0), ("bus", haversine_km(SANTIAGO, VALPARAISO))])
+
+    def test_unknown_modes_are_kept(self) -> None:
+        day = arrival({"mode": "tuk-tuk", "distanceKm": 3}, {"distanceKm": 2})
+        self.assertEqual(day_legs(day, []), [("tuk-tuk", 3.0), ("", 2.0)])
+
+    def test_missing_coordinates_drop_the_leg(self) -> None:
+        day = arrival(
+            {"mode": "bus", "distanceKm": 50},
+            {"mode": "walk", "from": {"coordinates": SANTIAGO}, "to": {"coordinates": {"lat": -33.0}}},
+            {"mode": "drive", "from": {}, "to": None},
+        )
+        self.assertEqual(day_legs(day, []), [("bus", 50.0)])
+
+    def test_layer_lines_replace_incomplete_segments(self) -> None:
+        layer = [{"dayId": "d1", "mode": "car-rental", "geometry": {"type": "LineString", "coordinates": LAYER_LINE}}]
+        incomplete = arrival({"mode": "bus", "distanceKm": 50}, {"mode": "walk"})
+        ((mode, km),) = day_legs(incomplete, layer)
+        self.assertEqual(mode, "drive")
+        self.assertGreater(km, haversine_km(SANTIAGO, VALPARAISO))
+        self.assertEqual(day_legs({}, layer), [(mode, km)])
+        # Vollständige Segmente gewinnen gegen die Linien.
+        self.assertEqual(day_legs(arrival({"mode": "bus", "distanceKm": 50}), layer), [("bus", 50.0)])
+
+    def test_layer_without_geometry_has_no_length(self) -> None:
+        self.assertEqual(day_legs({}, [{"dayId": "d1", "mode": "ferry"}]), [("ferry", 0)])
+
+
+class DayHotelStayTest(unittest.TestCase):
+    def test_hotels_cover_the_gap_to_the_next_date(self) -> None:
+        days = [
+            {"date": "2026-01-01", "hotels": [{"avgNightlyRateEUR": 80}, {"avgNightlyRateEUR": 120}, {"name": "?"}]},
+            {"date": "2026-01-04"},
+        ]
+        self.assertEqual(day_hotel_stay(days, 0), (3, 300.0))
+        self.assertEqual(day_hotel_stay(days, 1), (0, 0.0))
+
+    def test_unknown_gaps_count_one_night(self) -> None:
+        hotel = {"avgNightlyRateEUR": 90}
+        for following in ({}, {"date": "kein Datum"}, {"date": "2025-12-30"}):
+            with self.subTest(following=following):
+                self.assertEqual(day_hotel_stay([{"date": "2026-01-01", "hotels": [hotel]}, following], 0), (1, 90.0))
+        self.assertEqual(day_hotel_stay([{"hotels": [hotel]}], 0), (1, 90.0))
+
+    def test_hotels_without_rates_cost_nothing(self) -> None:
+        days = [{"date": "2026-01-01", "hotels": [{"name": "Hostal"}]}, {"date": "2026-01-03"}]
+        self.assertEqual(day_hotel_stay(days, 0), (2, 0.0))
+
+
+class ComputeDayMetricsTest(unittest.TestCase):
+    def test_metrics_from_days(self) -> None:
+        route = {
+            "meta": {"durationDays": 4, "costEstimate": 1000},
+            "days": [
+                {
+                    "id": "d1",
+                    "date": "2026-01-01",
+                    **arrival({"mode": "flight", "distanceKm": 1000}, {"mode": "tuk-tuk", "distanceKm": 10}),
+                    "hotels": [{"id": "h1", "avgNightlyRateEUR": 100}],
+                    "activities": [{"restaurants": [{}, {}]}, {}],
+                },
+                {"id": "d2", "date": "2026-01-03", **arrival({"mode": "walk"}), "hotels": [{"name": "Hostal"}]},
+                {"id": "d3"},
+            ],
+            "mapLayers": {
+                "dailySegments": [
+                    {"dayId": "d2", "mode": "bus", "geometry": {"type": "LineString", "coordinates": LAYER_LINE}}
+                ]
+            },
+        }
+        metrics = compute_day_metrics(route)
+        carbon = data_table("CARBON_FACTORS")
+        bus_km = day_legs(route["days"][1], route["mapLayers"]["dailySegments"])[0][1]
+        self.assertEqual(metrics["segmentCount"], 3)
+        self.assertEqual(metrics["flightCount"], 1)
+        self.assertEqual(metrics["totalDistanceKm"], round(1010 + bus_km, 1))
+        self.assertEqual(metrics["flightCarbonKg"], round(1000 * carbon["flight"], 1))
+        # Der unbekannte Modus zählt zur Distanz, aber ohne CO₂.
+        self.assertEqual(metrics["estimatedCarbonKg"], round(1000 * carbon["flight"] + bus_km * carbon["bus"], 1))
+        self.assertEqual(metrics["totalNights"], 3)
+        self.assertEqual(metrics["avgNightlyRate"], round(200 / 3, 2))
+        self.assertEqual(metrics["lodgingCount"], 2)
+        self.assertEqual((metrics["foodCount"], metrics["activityCount"]), (2, 2))
+        self.assertEqual((metrics["stopCount"], metrics["dayCount"]), (3, 3))
+        self.assertEqual(metrics["averageDailyBudget"], 250.0)
+
+    def test_route_lodging_overrides_day_hotels(self) -> None:
+        route = {
+            "days": [{"date": "2026-01-01", "hotels": [{"avgNightlyRateEUR": 500}]}, {"date": "2026-01-02"}],
+            "lodging": [
+                {"nights": 2, "avgNightlyRateEUR": 60},
+                {"checkIn": "2026-01-03", "checkOut": "2026-01-04", "pricePerNight": 90},
+                {"checkIn": "2026-01-05"},
+            ],
+        }
+        metrics = compute_day_metrics(route)
+        self.assertEqual(metrics["totalNights"], 3)
+        self.assertEqual(metrics["avgNightlyRate"], 70.0)
+        self.assertEqual(metrics["lodgingCount"], 3)
+        self.assertNotIn("flightCarbonKg", metrics)
+        # Ohne ``meta`` gilt ``defaultDurationDays`` und ein Budget von 0.
+        self.assertEqual(metrics["averageDailyBudget"], 0.0)
+
+    def test_days_without_legs_or_hotels(self) -> None:
+        metrics = compute_day_metrics({"meta": {"durationDays": 0}, "days": [arrival({"mode": "bus"}), {}]})
+        self.assertEqual((metrics["totalDistanceKm"], metrics["segmentCount"]), (0, 0))
+        self.assertNotIn("totalNights", metrics)
+        self.assertNotIn("averageDailyBudget", metrics)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+"""Tests für inkrementelle Builds von ``build_data.py``.
+
+Gebaut wird in ein temporäres Verzeichnis; welche Artefakte ein Build
+geschrieben hat, zeigen mtime und Inhalt.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import io
+import re
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+TRAVEL_ROUTES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TRAVEL_ROUTES_DIR))
+
+import build_data  # noqa: E402
+
+FLAG_OUTPUT_DIRS = ("data/immutable/", "data/asset-routes/")
+
+
+class IncrementalBuildTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.base_dir = Path(temp_dir.name)
+        self.definitions = copy.deepcopy(build_data.data_table("ROUTE_DEFINITIONS"))
+
+    def build(self, *flags: str, definitions: list[dict] | None = None) -> int:
+        """Run a build and return the number of written artifacts it reports."""
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            build_data.run_build(
+                build_data.parse_args(list(flags)), definitions or self.definitions, base_dir=self.base_dir
+            )
+        match = re.search(r"^(\d+) Artefakt\(e\) aktualisiert\.$", output.getvalue(), re.MULTILINE)
+        self.assertIsNotNone(match, output.getvalue())
+        return int(match.group(1))
+
+    def snapshot(self) -> dict[str, tuple[int, bytes]]:
+        return {
+            path.relative_to(self.base_dir).as_posix(): (path.stat().st_mtime_ns, path.read_bytes())
+            for path in self.base_dir.rglob("*")
+            if path.is_file() and build_data.CACHE_DIR_NAME not in path.parts
+        }
+
+    def rewritten(self, before: dict[str, tuple[int, bytes]]) -> set[str]:
+        return {key for key, state in self.snapshot().items() if before.get(key) != state}
+
+    def manifest_outputs(self) -> set[str]:
+        with contextlib.closing(
+            sqlite3.connect(self.base_dir / build_data.CACHE_DIR_NAME / build_data.MANIFEST_NAME)
+        ) as db:
+            return {key for (key,) in db.execute("SELECT key FROM outputs")}
+
+    def test_noop_rebuild_writes_nothing(self) -> None:
+        self.assertGreater(self.build(), 0)
+        before = self.snapshot()
+        with mock.patch.object(build_data, "build_route", wraps=build_data.build_route) as build_route:
+            self.assertEqual(self.build("--incremental"), 0)
+        build_route.assert_not_called()
+        self.assertEqual(self.rewritten(before), set())
+
+    def test_definition_edit_rebuilds_only_that_route(self) -> None:
+        self.build()
+        before = self.snapshot()
+        definitions = copy.deepcopy(self.definitions)
+        definitions[1]["name"] += " (überarbeitet)"
+        with mock.patch.object(build_data, "build_route", wraps=build_data.build_route) as build_route:
+            written = self.build("--incremental", definitions=definitions)
+        self.assertEqual([call.args[0]["id"] for call in build_route.call_args_list], [definitions[1]["id"]])
+        rewritten = self.rewritten(before)
+        self.assertIn(f"data/routes/{definitions[1]['id']}.json", rewritten)
+        self.assertEqual(written, len(rewritten))
+
+    def test_table_edit_rewrites_only_affected_routes(self) -> None:
+        # ``hanga-roa-lodge`` kommt nur in var1 vor.
+        self.assertEqual(
+            [definition["id"] for definition in self.definitions if "hanga-roa-lodge" in definition["stops"]], ["var1"]
+        )
+        self.build()
+        before = self.snapshot()
+        enrichments = copy.deepcopy(build_data.data_table("STOP_ENRICHMENTS"))
+        enrichments["hanga-roa-lodge"]["description"] += " Frühstück mit Meerblick."
+        with mock.patch.object(build_data, "STOP_ENRICHMENTS", enrichments), mock.patch.object(
+            build_data, "_CATALOG", None
+        ):
+            written = self.build("--incremental")
+        rewritten = self.rewritten(before)
+        route_files = {key for key in rewritten if key.startswith(("data/routes/", "data/geo/"))}
+        self.assertIn("data/routes/var1.json", route_files)
+        self.assertLessEqual(route_files, set(build_data.route_output_keys("var1")))
+        self.assertEqual(written, len(rewritten))
+
+    def test_spooled_index_matches_a_full_build(self) -> None:
+        # Definitionen kommen als Generator, der nur einmal durchlaufen werden kann.
+        self.build(definitions=(definition for definition in self.definitions))
+        definitions = copy.deepcopy(self.definitions)
+        definitions[2]["summary"] = "Neue Zusammenfassung."
+        self.build("--incremental", definitions=(definition for definition in definitions))
+        incremental = (self.base_dir / "travel-routes-data.json").read_bytes()
+
+        self.base_dir = self.base_dir / "full"
+        self.base_dir.mkdir()
+        self.build(definitions=definitions)
+        self.assertEqual(incremental, (self.base_dir / "travel-routes-data.json").read_bytes())
+
+    def test_dropping_a_flag_prunes_its_outputs(self) -> None:
+        self.build("--hash-names", "--asset-table", "--shared-stops")
+        for prefix in FLAG_OUTPUT_DIRS:
+            self.assertTrue(any(key.startswith(prefix) for key in self.snapshot()), prefix)
+            self.assertTrue(any(key.startswith(prefix) for key in self.manifest_outputs()), prefix)
+
+        self.build("--incremental")
+        for prefix in FLAG_OUTPUT_DIRS:
+            self.assertEqual([key for key in self.snapshot() if key.startswith(prefix)], [])
+            self.assertEqual([key for key in self.manifest_outputs() if key.startswith(prefix)], [])
+        self.assertEqual(set(self.snapshot()), self.manifest_outputs())
+
+
+if __name__ == "__main__":
+    unittest.main()
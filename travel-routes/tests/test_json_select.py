@@ -0,0 +1,90 @@
+"""Tests für die Pfad-Selektoren in ``json_select.py``."""
+
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+TRAVEL_ROUTES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TRAVEL_ROUTES_DIR))
+
+from json_select import ROUTE_IMAGE_LISTS, Selector, json_pointer, parse, replace_paths  # noqa: E402
+
+
+class ParseTest(unittest.TestCase):
+    def test_steps(self) -> None:
+        self.assertEqual(parse("stops[0].name"), (("key", "stops"), ("index", 0), ("key", "name")))
+        self.assertEqual(
+            parse("days[*].mobilityOptions.*.images"),
+            (("key", "days"), ("items",), ("key", "mobilityOptions"), ("values",), ("key", "images")),
+        )
+        self.assertEqual(parse("*.photo-url"), (("values",), ("key", "photo-url")))
+        self.assertEqual(parse("a[*][2]"), (("key", "a"), ("items",), ("index", 2)))
+        for pattern in ROUTE_IMAGE_LISTS:
+            with self.subTest(pattern=pattern):
+                self.assertTrue(parse(pattern))
+
+    def test_invalid_patterns(self) -> None:
+        for pattern in ("", "a[*]b", "a[0]*", "a*", ".a", "a.", "a..b", "a.[0]", "a[x]", "a b"):
+            with self.subTest(pattern=pattern), self.assertRaises(ValueError):
+                parse(pattern)
+
+
+class SelectorTest(unittest.TestCase):
+    def test_forked_paths_keep_document_order(self) -> None:
+        document = {"b": [{"x": 1, "y": 2}, {"y": 3}], "a": {"x": 4}}
+        selector = Selector("a.x", "b[*].y", "b[*].x", "b[1]")
+        self.assertEqual(
+            selector.matches(document),
+            [(("b", 0, "x"), 1), (("b", 0, "y"), 2), (("b", 1), {"y": 3}), (("b", 1, "y"), 3), (("a", "x"), 4)],
+        )
+
+    def test_keys_come_before_wildcards_on_the_same_child(self) -> None:
+        document = {"options": {"bus": {"images": [1]}, "car": {}}}
+        selector = Selector("options.*", "options.bus.images")
+        self.assertEqual(
+            [json_pointer(path) for path, _ in selector.matches(document)],
+            ["/options/bus/images", "/options/bus", "/options/car"],
+        )
+
+    def test_terminal_nodes_emit_before_descending(self) -> None:
+        self.assertEqual(Selector("a.b", "a").values({"a": {"b": 1}}), [{"b": 1}, 1])
+
+    def test_mismatched_types_and_missing_keys_are_skipped(self) -> None:
+        selector = Selector("a[*].b", "c.*")
+        self.assertEqual(selector.matches({"a": {"0": {"b": 1}}, "c": [1, 2]}), [])
+        self.assertEqual(selector.matches({"a": [None, {"b": None}]}), [(("a", 1, "b"), None)])
+
+    def test_json_pointer_escapes(self) -> None:
+        self.assertEqual(json_pointer(("a/b", "c~d", 0)), "/a~1b/c~0d/0")
+        self.assertEqual(json_pointer(()), "")
+
+
+class ReplacePathsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.document = {
+            "stops": [{"photos": [1], "name": "Santiago"}, {"photos": [2]}],
+            "meta": {"theme": "Wüste"},
+        }
+
+    def test_copies_only_the_containers_along_the_paths(self) -> None:
+        updated = replace_paths(self.document, [(("stops", 0, "photos"), ["a"]), (("stops", 0, "name"), "SCL")])
+        self.assertEqual(updated["stops"][0], {"photos": ["a"], "name": "SCL"})
+        self.assertIsNot(updated["stops"], self.document["stops"])
+        self.assertIsNot(updated["stops"][0], self.document["stops"][0])
+        self.assertIs(updated["stops"][1], self.document["stops"][1])
+        self.assertIs(updated["meta"], self.document["meta"])
+        self.assertEqual(self.document["stops"][0], {"photos": [1], "name": "Santiago"})
+
+    def test_paths_with_a_shared_prefix_are_applied_together(self) -> None:
+        updated = replace_paths(self.document, [(("stops", 0, "photos", 0), "a"), (("stops", 1, "photos", 0), "b")])
+        self.assertEqual([stop["photos"] for stop in updated["stops"]], [["a"], ["b"]])
+        self.assertEqual([stop["photos"] for stop in self.document["stops"]], [[1], [2]])
+
+    def test_without_replacements_the_document_is_returned(self) -> None:
+        self.assertIs(replace_paths(self.document, []), self.document)
+
+
+if __name__ == "__main__":
+    unittest.main()
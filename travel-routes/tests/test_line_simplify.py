@@ -0,0 +1,99 @@
+"""Tests für die Zoom-Bänder in ``line_simplify.py``."""
+
+from __future__ import annotations
+
+import random
+import sys
+import unittest
+from math import sin
+from pathlib import Path
+
+TRAVEL_ROUTES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TRAVEL_ROUTES_DIR))
+
+from line_simplify import (  # noqa: E402
+    MAX_ZOOM,
+    ZOOM_BANDS,
+    band_decimals,
+    band_tolerance,
+    build_detail_levels,
+    quantize,
+    simplify_douglas_peucker,
+    simplify_line,
+)
+
+
+def wiggly_line(count: int, seed: int) -> list[list[float]]:
+    """A road-like line from Santiago southwards with jitter at every scale."""
+
+    rng = random.Random(seed)
+    return [
+        [-70.6693 + 0.3 * sin(step / 7) + rng.uniform(-1e-3, 1e-3), -33.4489 - step * 0.01 + rng.uniform(-1e-4, 1e-4)]
+        for step in range(count)
+    ]
+
+
+class SimplifyTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.lines = {str(seed): wiggly_line(400, seed) for seed in range(5)}
+        cls.lines["two-points"] = [[-70.6693123456, -33.4489123456], [-71.6127, -33.0472]]
+
+    def test_endpoints_are_kept_exactly(self) -> None:
+        for _, max_zoom in ZOOM_BANDS:
+            for feature_id, line in self.lines.items():
+                with self.subTest(max_zoom=max_zoom, feature_id=feature_id):
+                    simplified = simplify_line(line, max_zoom)
+                    self.assertEqual(simplified[0], line[0])
+                    self.assertEqual(simplified[-1], line[-1])
+
+    def test_point_counts_grow_with_zoom(self) -> None:
+        for feature_id, line in self.lines.items():
+            counts = [len(simplify_line(line, max_zoom)) for _, max_zoom in ZOOM_BANDS]
+            with self.subTest(feature_id=feature_id, counts=counts):
+                self.assertEqual(counts, sorted(counts))
+                self.assertEqual(counts[-1], len(line))
+                if feature_id != "two-points":
+                    self.assertLess(counts[0], counts[-1])
+
+    def test_simplified_line_stays_within_tolerance(self) -> None:
+        line = self.lines["0"]
+        for _, max_zoom in ZOOM_BANDS[:-1]:
+            tolerance = band_tolerance(max_zoom)
+            kept = simplify_douglas_peucker(line, tolerance)
+            # Every dropped vertex lies within the tolerance of the kept chord around it.
+            positions = [line.index(point) for point in kept]
+            for first, last in zip(positions, positions[1:]):
+                (x1, y1), (x2, y2) = line[first], line[last]
+                length = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+                for x, y in line[first + 1:last]:
+                    distance = abs((y2 - y1) * x - (x2 - x1) * y + x2 * y1 - y2 * x1) / length
+                    self.assertLessEqual(distance, tolerance)
+
+    def test_band_precision(self) -> None:
+        self.assertEqual(band_tolerance(MAX_ZOOM), 0.0)
+        self.assertEqual(band_decimals(MAX_ZOOM), 6)
+        decimals = [band_decimals(max_zoom) for _, max_zoom in ZOOM_BANDS]
+        self.assertEqual(decimals, sorted(decimals))
+        for _, max_zoom in ZOOM_BANDS[:-1]:
+            # Rounding moves a vertex by at most half a pixel.
+            self.assertLessEqual(0.5 * 10 ** -band_decimals(max_zoom), band_tolerance(max_zoom) / 2)
+
+    def test_quantize_drops_rounding_duplicates(self) -> None:
+        line = [[0.123456, 1.0], [0.5001, 1.0001], [0.5002, 1.0002], [0.987654, 2.0]]
+        self.assertEqual(quantize(line, 2), [[0.123456, 1.0], [0.5, 1.0], [0.987654, 2.0]])
+
+    def test_detail_levels_merge_identical_bands(self) -> None:
+        levels = build_detail_levels({"a": self.lines["two-points"]})
+        self.assertEqual(levels, [{"minZoom": 0, "maxZoom": MAX_ZOOM, "geometries": {"a": self.lines["two-points"]}}])
+
+        levels = build_detail_levels(self.lines)
+        self.assertEqual(levels[0]["minZoom"], 0)
+        self.assertEqual(levels[-1]["maxZoom"], MAX_ZOOM)
+        for previous, level in zip(levels, levels[1:]):
+            self.assertEqual(level["minZoom"], previous["maxZoom"] + 1)
+            self.assertNotEqual(level["geometries"], previous["geometries"])
+
+
+if __name__ == "__main__":
+    unittest.main()
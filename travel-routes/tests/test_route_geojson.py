@@ -0,0 +1,74 @@
+"""Tests für ``route_geojson.py``.
+
+``route-geometry.fixture.json`` enthält Routen samt den Collections, die
+``buildSegmentCollection``/``buildStopCollection`` (``src/lib/travel/map-data.ts``)
+daraus erzeugen; ``map-data.test.ts`` prüft dieselbe Datei auf der Client-Seite.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+TRAVEL_ROUTES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TRAVEL_ROUTES_DIR))
+
+from route_geojson import build_route_geometry, calculate_bounding_box, parse_dash_array  # noqa: E402
+
+FIXTURE = TRAVEL_ROUTES_DIR / "route-geometry.fixture.json"
+
+
+class RouteGeometryTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.fixture = json.loads(FIXTURE.read_text(encoding="utf-8"))
+
+    def test_matches_map_data(self) -> None:
+        for case in self.fixture["routes"]:
+            with self.subTest(route=case["route"]["id"]):
+                geometry = build_route_geometry(case["route"], self.fixture["transportModes"])
+                self.assertEqual(geometry["routeId"], case["route"]["id"])
+                self.assertEqual(geometry["segments"], case["segments"])
+                self.assertEqual(geometry["stops"], case["stops"])
+                self.assertEqual(geometry["bounds"], case["bounds"])
+
+    def test_days_split_the_route_collections(self) -> None:
+        case = next(case for case in self.fixture["routes"] if case["route"].get("days"))
+        geometry = build_route_geometry(case["route"], self.fixture["transportModes"])
+        self.assertEqual(list(geometry["days"]), ["d1", "d2", "d3"])
+        for kind in ("segments", "stops"):
+            features = [feature for day in geometry["days"].values() for feature in day[kind]["features"]]
+            self.assertEqual(features, geometry[kind]["features"])
+        self.assertEqual(geometry["days"]["d2"]["bounds"], None)
+        self.assertEqual(geometry["days"]["d3"]["bounds"], [[-73.2459, -39.8196], [-71.9756, -39.2724]])
+
+    def test_daily_segments_take_precedence(self) -> None:
+        line = {"type": "LineString", "coordinates": [[-70.6, -33.4], [-71.0, -33.9], [-71.6, -33.0]]}
+        route = {
+            "id": "layers",
+            "mapLayers": {"dailySegments": [{"dayId": "d1", "mode": "bus", "geometry": line}, {"dayId": "d2"}]},
+            "days": [
+                {"id": "d1", "arrival": {"segments": [{"from": {"coordinates": [0, 0]}, "to": {"coordinates": [1, 1]}}]}}
+            ],
+        }
+        geometry = build_route_geometry(route, self.fixture["transportModes"])
+        (feature,) = geometry["segments"]["features"]
+        self.assertEqual(feature["geometry"], line)
+        self.assertEqual(feature["properties"]["id"], "d1")
+        self.assertEqual(geometry["days"]["d1"]["segments"]["features"], [feature])
+
+    def test_dash_array(self) -> None:
+        self.assertEqual(parse_dash_array("4 2.5"), [4, 2.5])
+        self.assertEqual(parse_dash_array("4 -1 x 0 2"), [4, 2])
+        self.assertIsNone(parse_dash_array("6"))
+        self.assertIsNone(parse_dash_array(None))
+
+    def test_bounding_box_skips_invalid_coordinates(self) -> None:
+        self.assertEqual(calculate_bounding_box([[1, 2], [float("nan"), 0], [-3, 5]]), [[-3, 2], [1, 5]])
+        self.assertIsNone(calculate_bounding_box([]))
+
+
+if __name__ == "__main__":
+    unittest.main()
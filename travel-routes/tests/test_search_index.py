@@ -0,0 +1,37 @@
+"""Tests für den Tokenizer des Suchindex.
+
+``search-tokens.fixture.json`` teilt sich dieser Test mit
+``travel-routes.test.js``: Build (Python) und Seite (JavaScript) müssen
+dieselben Texte in dieselben Begriffe zerlegen.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import unittest
+from pathlib import Path
+
+TRAVEL_ROUTES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TRAVEL_ROUTES_DIR))
+
+from search_index import SearchIndex, tokenize  # noqa: E402
+
+FIXTURE = TRAVEL_ROUTES_DIR / "search-tokens.fixture.json"
+
+
+class TokenizeTest(unittest.TestCase):
+    def test_shared_fixture(self) -> None:
+        for case in json.loads(FIXTURE.read_text(encoding="utf-8")):
+            with self.subTest(text=case["text"]):
+                self.assertEqual(tokenize(case["text"]), case["tokens"])
+
+    def test_lookup_folds_like_the_index(self) -> None:
+        index = SearchIndex.build([("coast", ["Valparaíso – Cerro_Alegre"]), ("hindi", ["हिन्दी"])])
+        self.assertEqual(index.lookup("valpa ALEGRE"), ["coast"])
+        self.assertEqual(index.lookup("हिन्दी"), ["hindi"])
+        self.assertEqual(index.lookup("cerro_alegre"), ["coast"])
+
+
+if __name__ == "__main__":
+    unittest.main()
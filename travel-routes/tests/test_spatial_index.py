@@ -0,0 +1,117 @@
+"""Tests für den KD-Baum in ``spatial_index.py``.
+
+``spatial-index.fixture.json`` ist das Artefakt zu ``fixture_places()``;
+``travel-routes.test.js`` prüft damit ``spatial-index.js``. Nach Änderungen am
+Baum neu schreiben: ``python3 tests/test_spatial_index.py --write-fixture``.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sys
+import unittest
+from math import asin, cos, radians, sin, sqrt
+from pathlib import Path
+
+TRAVEL_ROUTES_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(TRAVEL_ROUTES_DIR))
+
+from spatial_index import SpatialIndex  # noqa: E402
+
+FIXTURE = TRAVEL_ROUTES_DIR / "spatial-index.fixture.json"
+KINDS = ("stop", "event", "station")
+
+
+def fixture_places(count: int = 300, seed: int = 2026) -> list[dict]:
+    """Places clustered in Chile plus some anywhere, including poles and the date line."""
+
+    rng = random.Random(seed)
+    places = []
+    for position in range(count):
+        if position % 3:
+            lat, lng = rng.uniform(-56, -17), rng.uniform(-76, -66)
+        else:
+            lat, lng = rng.uniform(-90, 90), rng.uniform(-180, 180)
+        places.append({"id": f"p{position}", "kind": KINDS[position % 3], "lat": lat, "lng": lng, "name": f"Ort {position}"})
+    places += [
+        {"id": "north-pole", "kind": "stop", "lat": 90.0, "lng": 0.0, "name": ""},
+        {"id": "date-line-west", "kind": "stop", "lat": -17.5, "lng": 179.99, "name": ""},
+        {"id": "date-line-east", "kind": "stop", "lat": -17.5, "lng": -179.99, "name": ""},
+    ]
+    return places
+
+
+def haversine_km(a: dict, b: dict) -> float:
+    dlat = radians(b["lat"] - a["lat"])
+    dlng = radians(b["lng"] - a["lng"])
+    h = sin(dlat / 2) ** 2 + cos(radians(a["lat"])) * cos(radians(b["lat"])) * sin(dlng / 2) ** 2
+    return 2 * 6371 * asin(min(1, sqrt(h)))
+
+
+class SpatialIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.places = fixture_places()
+        cls.index = SpatialIndex(cls.places)
+        rng = random.Random(7)
+        cls.queries = [(rng.uniform(-90, 90), rng.uniform(-180, 180)) for _ in range(300)]
+        cls.queries += [(rng.uniform(-56, -17), rng.uniform(-76, -66)) for _ in range(300)]
+
+    def brute_force(self, lat: float, lng: float, kind: str | None = None) -> list[tuple[float, str]]:
+        point = {"lat": lat, "lng": lng}
+        return sorted(
+            (haversine_km(point, place), place["id"])
+            for place in self.places
+            if kind is None or place["kind"] == kind
+        )
+
+    def assert_same_places(self, found: list[tuple[dict, float]], expected: list[tuple[float, str]]) -> None:
+        self.assertEqual(len(found), len(expected))
+        for (item, km), (expected_km, _) in zip(found, expected):
+            self.assertAlmostEqual(km, expected_km, delta=0.01)
+        self.assertEqual({item["id"] for item, _ in found}, {place_id for _, place_id in expected})
+
+    def test_nearest_matches_brute_force(self) -> None:
+        for lat, lng in self.queries:
+            with self.subTest(lat=lat, lng=lng):
+                self.assert_same_places(self.index.nearest(lat, lng, 5), self.brute_force(lat, lng)[:5])
+
+    def test_nearest_by_kind(self) -> None:
+        for lat, lng in self.queries[::10]:
+            found = self.index.nearest(lat, lng, 3, kind="event")
+            self.assertTrue(all(item["kind"] == "event" for item, _ in found))
+            self.assert_same_places(found, self.brute_force(lat, lng, "event")[:3])
+
+    def test_within_matches_brute_force(self) -> None:
+        for (lat, lng), radius in zip(self.queries, (50, 250, 1000) * 200):
+            with self.subTest(lat=lat, lng=lng, radius=radius):
+                # Places right at the border may fall on either side by rounding.
+                expected = [hit for hit in self.brute_force(lat, lng) if hit[0] < radius - 0.01]
+                found = [hit for hit in self.index.within(lat, lng, radius) if hit[1] < radius - 0.01]
+                self.assert_same_places(found, expected)
+                self.assertEqual([km for _, km in found], sorted(km for _, km in found))
+
+    def test_date_line_neighbours(self) -> None:
+        (first, _), (second, km) = self.index.nearest(-17.5, 179.99, 2)
+        self.assertEqual((first["id"], second["id"]), ("date-line-west", "date-line-east"))
+        self.assertLess(km, 3)
+
+    def test_artifact_roundtrip(self) -> None:
+        restored = SpatialIndex.from_artifact(json.loads(json.dumps(self.index.to_artifact())))
+        for lat, lng in self.queries[::20]:
+            self.assertEqual(
+                [item["id"] for item, _ in restored.nearest(lat, lng, 5)],
+                [item["id"] for item, _ in self.index.nearest(lat, lng, 5)],
+            )
+
+    def test_fixture_is_current(self) -> None:
+        self.assertEqual(json.loads(FIXTURE.read_text(encoding="utf-8")), self.index.to_artifact())
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["--write-fixture"]:
+        artifact = SpatialIndex(fixture_places()).to_artifact()
+        FIXTURE.write_text(json.dumps(artifact, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8")
+    else:
+        unittest.main()
@@ -7,6 +7,14 @@
  * Einsteiger:innen nachvollziehbar.
  */
 
+import {
+  createSharedTableLoader,
+  hasStopReferences,
+  resolveAssetReferences as resolveAssetIds,
+  resolveStopReferences as resolveStopIds,
+} from './route-references.js';
+import { createSpatialIndex } from './spatial-index.js';
+
 const hasDocument = typeof document !== 'undefined';
 const assetBase = (() => {
   try {
@@ -55,8 +63,11 @@ const state = {
   filter: 'curated',
   activeTags: new Set(),
   searchTerm: '',
+  searchIndex: null,
+  spatialIndex: null,
   selectedRouteId: null,
   routeDetails: new Map(),
+  sharedTables: new Map(),
   poiOverview: [],
   poiCollection: new Set(),
   detailView: 'planning',
@@ -247,6 +258,21 @@ function fetchFresh(resource, options = {}) {
   });
 }
 
+// Inhaltsgehashte Dateien (`build_data.py --hash-names`) ändern sich nie. Sie dürfen
+// deshalb aus dem Browser-Cache kommen – nur der Index selbst wird frisch geladen.
+const IMMUTABLE_RESOURCE_PATTERN = /(^|\/)data\/immutable\//;
+
+function isImmutableResource(resource) {
+  return typeof resource === 'string' && IMMUTABLE_RESOURCE_PATTERN.test(resource);
+}
+
+function fetchRouteResource(resource) {
+  if (isImmutableResource(resource)) {
+    return fetch(resolveResource(resource), { cache: 'force-cache' });
+  }
+  return fetchFresh(resource);
+}
+
 async function init() {
   const response = await fetchFresh('travel-routes-data.json');
   if (!response.ok) {
@@ -273,6 +299,18 @@ async function init() {
   setupResponsivePanel();
   setupSuggestionOverlay();
 
+  // Der Suchindex wird erst nach dem ersten Rendern nachgeladen – bis er da ist,
+  // greift die einfache Textsuche über Name, Zusammenfassung und Thema.
+  if (data.searchIndex?.file) {
+    loadSearchIndex(data.searchIndex.file).then(() => {
+      if (state.searchTerm) renderRoutes();
+    });
+  }
+  // Der räumliche Index ergänzt Stopps um Orte in der Nähe – ebenfalls erst nachgeladen.
+  if (data.spatialIndex?.file) {
+    loadSpatialIndex(data.spatialIndex.file).then(() => renderNearbyPlaces());
+  }
+
   if (data.poiOverview?.file) {
     await loadPoiOverview(data.poiOverview.file);
     renderPoiOverview();
@@ -396,31 +434,74 @@ function renderRoutes() {
   highlightActiveRouteCard();
 }
 
+// Für Einsteiger:innen: Suche und Index nutzen dieselbe Normalisierung wie
+// `search_index.py` – Akzente fallen weg, alles wird kleingeschrieben und in
+// Wörter zerlegt. So findet "valparaiso" auch "Valparaíso".
+function normalizeSearchText(value) {
+  return String(value ?? '')
+    .normalize('NFKD')
+    .replace(/\p{M}/gu, '')
+    .toLowerCase();
+}
+
+function tokenizeSearchText(value) {
+  return normalizeSearchText(value)
+    .split(/[^\p{L}\p{N}]+/u)
+    .filter(Boolean);
+}
+
+// Liefert die Routen-IDs, bei denen jedes Suchwort Präfix eines Index-Begriffs ist.
+// `terms` ist sortiert, daher reicht eine Binärsuche bis zum ersten Treffer.
+function searchRouteIds(index, query) {
+  const words = tokenizeSearchText(query);
+  if (!index || words.length === 0) return null;
+  let matches = null;
+  for (const word of words) {
+    let low = 0;
+    let high = index.terms.length;
+    while (low < high) {
+      const middle = (low + high) >> 1;
+      if (index.terms[middle] < word) low = middle + 1;
+      else high = middle;
+    }
+    const found = new Set();
+    for (let position = low; position < index.terms.length && index.terms[position].startsWith(word); position += 1) {
+      index.postings[position].forEach((routePosition) => found.add(index.routes[routePosition]));
+    }
+    matches = matches ? new Set([...matches].filter((id) => found.has(id))) : found;
+    if (matches.size === 0) break;
+  }
+  return matches;
+}
+
+function routeMatchesText(route, words) {
+  const tokens = new Set(route.searchTokens ?? []);
+  [route.name, route.summary, route.meta?.theme]
+    .filter(Boolean)
+    .forEach((value) => tokens.add(String(value)));
+  if (route.source === 'custom') {
+    (route.stops ?? []).forEach((stop) => tokens.add(stop.name));
+    (route.food ?? []).forEach((item) => tokens.add(item.name));
+    (route.activities ?? []).forEach((item) => tokens.add(item.title));
+    (route.flights ?? []).forEach((flight) => tokens.add(flight.flightNumber));
+  }
+  const haystack = tokenizeSearchText(Array.from(tokens).filter(Boolean).join(' '));
+  return words.every((word) => haystack.some((term) => term.startsWith(word)));
+}
+
 function getVisibleRoutes() {
   const collection = state.filter === 'custom' ? state.customRoutes : state.curatedRoutes;
   if (!state.searchTerm && state.activeTags.size === 0) {
     return collection;
   }
-  const term = state.searchTerm.toLowerCase();
+  const words = tokenizeSearchText(state.searchTerm);
+  const indexMatches = state.filter === 'custom' ? null : searchRouteIds(state.searchIndex, state.searchTerm);
   return collection.filter((route) => {
     const matchesTag = state.activeTags.size === 0 || route.tags?.some((tag) => state.activeTags.has(tag));
     if (!matchesTag) return false;
-    if (!term) return true;
-    const tokens = new Set(route.searchTokens ?? []);
-    [route.name, route.summary, route.meta?.theme]
-      .filter(Boolean)
-      .forEach((value) => tokens.add(String(value)));
-    if (route.source === 'custom') {
-      (route.stops ?? []).forEach((stop) => tokens.add(stop.name));
-      (route.food ?? []).forEach((item) => tokens.add(item.name));
-      (route.activities ?? []).forEach((item) => tokens.add(item.title));
-      (route.flights ?? []).forEach((flight) => tokens.add(flight.flightNumber));
-    }
-    const haystack = Array.from(tokens)
-      .filter(Boolean)
-      .join(' ')
-      .toLowerCase();
-    return haystack.includes(term);
+    if (words.length === 0) return true;
+    if (indexMatches) return indexMatches.has(route.id);
+    return routeMatchesText(route, words);
   });
 }
 
@@ -849,6 +930,9 @@ function renderStopList(route, stops) {
       ? `<figure class="travel-stop__photo"><img src="${stop.photos[0].url}" alt="${stop.name}" loading="lazy"/></figure>`
       : '';
     const description = stop.description ? `<p>${stop.description}</p>` : '';
+    const nearby = Number.isFinite(stop.coordinates?.lat) && Number.isFinite(stop.coordinates?.lng)
+      ? `<div class="travel-stop__nearby travel-text-muted" data-nearby-id="${stop.id}" data-lat="${stop.coordinates.lat}" data-lng="${stop.coordinates.lng}"></div>`
+      : '';
 
     const content = `
       ${photo}
@@ -868,6 +952,7 @@ function renderStopList(route, stops) {
         ${contact}
         ${servicesHtml}
         ${knowledgeHtml}
+        ${nearby}
       </div>`;
 
     if (route.source === 'custom') {
@@ -881,6 +966,7 @@ function renderStopList(route, stops) {
     }
     list.appendChild(li);
   });
+  renderNearbyPlaces(list);
 
   if (route.source === 'custom') {
     list.querySelectorAll('input[type="checkbox"]').forEach((checkbox) => {
@@ -1091,11 +1177,11 @@ async function loadCuratedRoute(routeId) {
   const entry = state.curatedRoutes.find((r) => r.id === routeId);
   if (!entry) return null;
   try {
-    const response = await fetchFresh(entry.file);
+    const response = await fetchRouteResource(entry.file);
     if (!response.ok) {
       throw new Error(`Route konnte nicht geladen werden (${response.status})`);
     }
-    const data = await response.json();
+    const data = await resolveAssetReferences(await resolveStopReferences(await response.json()));
     data.source = 'curated';
     state.routeDetails.set(routeId, data);
     return data;
@@ -1105,6 +1191,30 @@ async function loadCuratedRoute(routeId) {
   }
 }
 
+// Gemeinsame, inhaltsgehashte Tabellen (Stopp-Katalog, Asset-Tabelle) laden wir
+// einmal pro Datei und teilen sie zwischen allen Routen – wiederholte Stopps und
+// Bilder werden so nur einmal übertragen.
+const loadSharedTable = createSharedTableLoader(async (file) => {
+  const response = await fetchRouteResource(file);
+  if (!response.ok) throw new Error(`Tabelle fehlgeschlagen (${response.status})`);
+  return response.json();
+}, state.sharedTables);
+
+// Mit `build_data.py --shared-stops` listen Routen-Dateien nur Stopp-IDs auf.
+async function resolveStopReferences(route) {
+  if (!route?.stopsCatalog || !hasStopReferences(route)) {
+    return route;
+  }
+  return resolveStopIds(route, await loadSharedTable(route.stopsCatalog, 'stops'));
+}
+
+// Mit `build_data.py --asset-table` stehen Bilder in `images`/`photos` nur als
+// `{ asset: "<id>" }` in der Route; die Einträge liefert die Asset-Tabelle.
+async function resolveAssetReferences(route, assetTable = state.data?.assetTable) {
+  if (!assetTable?.file) return route;
+  return resolveAssetIds(route, await loadSharedTable(assetTable.file, 'assets'));
+}
+
 async function addCustomRouteFromCurated(routeId) {
   const original = await loadCuratedRoute(routeId);
   if (!original) return;
@@ -1751,6 +1861,58 @@ async function loadPoiOverview(path) {
   }
 }
 
+async function loadSearchIndex(path) {
+  try {
+    const response = await fetchFresh(path);
+    if (!response.ok) throw new Error(`Suchindex fehlgeschlagen (${response.status})`);
+    const data = await response.json();
+    const valid = Array.isArray(data.terms) && Array.isArray(data.postings) && Array.isArray(data.routes);
+    state.searchIndex = valid ? data : null;
+  } catch (error) {
+    console.warn('Konnte Suchindex nicht laden', error);
+    state.searchIndex = null;
+  }
+}
+
+async function loadSpatialIndex(path) {
+  try {
+    const response = await fetchFresh(path);
+    if (!response.ok) throw new Error(`Räumlicher Index fehlgeschlagen (${response.status})`);
+    const data = await response.json();
+    state.spatialIndex = Array.isArray(data.items) && Array.isArray(data.fields) ? createSpatialIndex(data) : null;
+  } catch (error) {
+    console.warn('Konnte räumlichen Index nicht laden', error);
+    state.spatialIndex = null;
+  }
+}
+
+const NEARBY_LIMIT = 3;
+const NEARBY_RADIUS_KM = 50;
+
+// Die nächsten Stopps, Events und Tagesstationen um einen Ort – ohne den Ort selbst.
+function nearbyPlaces(index, placeId, lat, lng, limit = NEARBY_LIMIT, radiusKm = NEARBY_RADIUS_KM) {
+  if (!index) return [];
+  return index
+    .nearest(lat, lng, limit + 1)
+    .filter(({ item, km }) => item.id !== placeId && km <= radiusKm)
+    .slice(0, limit);
+}
+
+function renderNearbyPlaces(root = hasDocument ? document : null) {
+  if (!root || !state.spatialIndex) return;
+  root.querySelectorAll('[data-nearby-id]').forEach((element) => {
+    const places = nearbyPlaces(
+      state.spatialIndex,
+      element.getAttribute('data-nearby-id'),
+      Number(element.getAttribute('data-lat')),
+      Number(element.getAttribute('data-lng')),
+    );
+    element.innerHTML = places.length
+      ? `📍 In der Nähe: ${places.map(({ item, km }) => `${item.name || item.id} (${km < 1 ? '< 1' : Math.round(km)} km)`).join(' • ')}`
+      : '';
+  });
+}
+
 function renderPoiOverview() {
   if (!dom.poiList) return;
   if (!state.poiOverview.length) {
@@ -1876,9 +2038,18 @@ export {
   dom,
   scrollDetailToStop,
   fetchFresh,
+  fetchRouteResource,
+  isImmutableResource,
+  resolveStopReferences,
+  resolveAssetReferences,
   createCustomRouteFromSuggestion,
   setAssetManifestForTesting,
   resetAssetManifestForTesting,
   resolveResource,
   getDefaultRouteSelection,
+  getVisibleRoutes,
+  searchRouteIds,
+  tokenizeSearchText,
+  loadSpatialIndex,
+  nearbyPlaces,
 };
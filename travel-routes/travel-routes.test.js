@@ -3,16 +3,25 @@ import { fileURLToPath } from 'node:url';
 import { dirname, join } from 'node:path';
 import { test } from 'node:test';
 import assert from 'node:assert/strict';
+import {
+  createSharedTableLoader,
+  resolveAssetReferences as resolveAssetIds,
+  resolveStopReferences as resolveStopIds,
+} from './route-references.js';
 
 const __dirname = dirname(fileURLToPath(import.meta.url));
 const jsonPath = join(__dirname, 'travel-routes-data.json');
 const cssPath = join(__dirname, 'travel-routes.css');
 const data = JSON.parse(readFileSync(jsonPath, 'utf8'));
 const cssSource = readFileSync(cssPath, 'utf8');
-const rawRoutes = (data.routeIndex ?? []).map((entry) => {
-  const routePath = join(__dirname, entry.file);
-  return JSON.parse(readFileSync(routePath, 'utf8'));
-});
+const readDataFile = (file) => JSON.parse(readFileSync(join(__dirname, file), 'utf8'));
+// Mit `build_data.py --shared-stops`/`--asset-table` enthalten Routen-Dateien nur
+// Verweise; geprüft werden die Routen so, wie die Seite sie nach dem Laden sieht.
+const stopsCatalog = data.stopsCatalog ? readDataFile(data.stopsCatalog.file).stops : null;
+const assets = data.assetTable ? readDataFile(data.assetTable.file).assets : null;
+const rawRoutes = (data.routeIndex ?? []).map((entry) =>
+  resolveAssetIds(resolveStopIds(readDataFile(entry.file), stopsCatalog), assets),
+);
 
 // Klassische Varianten im Datensatz besitzen "stops" und "segments".
 // Das neue Beispiel für den Karten-Slider nutzt dagegen ein "days"-Schema.
@@ -83,13 +92,118 @@ test('desktop layout keeps detail view within the first screen', () => {
   );
 });
 
-test('route index entries expose search tokens', () => {
+// Neue Builds liefern die Suchbegriffe als eigenen invertierten Index aus,
+// ältere Datensätze hängen sie noch als `searchTokens` an jede Route.
+test('route index entries are searchable', () => {
+  if (data.searchIndex?.file) {
+    const index = JSON.parse(readFileSync(join(__dirname, data.searchIndex.file), 'utf8'));
+    assert.equal(index.terms.length, index.postings.length, 'every term needs postings');
+    assert.deepEqual([...index.terms].sort(), index.terms, 'terms must be sorted for prefix lookups');
+    const indexed = new Set(index.routes);
+    data.routeIndex.forEach((entry) => {
+      assert.ok(indexed.has(entry.id), `route ${entry.id} missing from search index`);
+      assert.equal(entry.searchTokens, undefined, 'search tokens should not bloat the route index');
+    });
+    return;
+  }
   data.routeIndex.forEach((entry) => {
     assert.ok(Array.isArray(entry.searchTokens), 'search tokens missing');
     assert.ok(entry.searchTokens.length > 0, 'search tokens should not be empty');
   });
 });
 
+test('searchRouteIds matches accent-folded prefixes across all query words', async () => {
+  const { searchRouteIds, tokenizeSearchText } = await import('./travel-routes.js');
+  const index = {
+    routes: ['coast', 'desert'],
+    terms: ['atacama', 'cerro', 'pedro', 'san', 'valparaiso'],
+    postings: [[1], [0], [1], [1], [0]],
+  };
+
+  assert.deepEqual(tokenizeSearchText('Valparaíso – Cerro Alegre'), ['valparaiso', 'cerro', 'alegre']);
+  assert.deepEqual([...searchRouteIds(index, 'Valpa')], ['coast']);
+  assert.deepEqual([...searchRouteIds(index, 'san ped')], ['desert']);
+  assert.equal(searchRouteIds(index, 'san cerro').size, 0);
+  assert.equal(searchRouteIds(index, '   '), null);
+  assert.equal(searchRouteIds(null, 'atacama'), null);
+});
+
+// Dieselben Fälle prüft tests/test_search_index.py gegen search_index.tokenize(),
+// damit Index-Begriffe und Suchanfragen identisch zerlegt werden.
+test('tokenizeSearchText matches the shared tokenizer fixture', async () => {
+  const { tokenizeSearchText } = await import('./travel-routes.js');
+  const cases = JSON.parse(readFileSync(join(__dirname, 'search-tokens.fixture.json'), 'utf8'));
+  cases.forEach(({ text, tokens }) => {
+    assert.deepEqual(tokenizeSearchText(text), tokens, `tokens of ${JSON.stringify(text)}`);
+  });
+});
+
+test('spatial-index.js answers like a brute-force scan over the shared fixture', async () => {
+  const { createSpatialIndex } = await import('./spatial-index.js');
+  const artifact = JSON.parse(readFileSync(join(__dirname, 'spatial-index.fixture.json'), 'utf8'));
+  const index = createSpatialIndex(artifact);
+  const toRadians = (value) => (value * Math.PI) / 180;
+  const haversineKm = (lat, lng, item) => {
+    const h =
+      Math.sin(toRadians(item.lat - lat) / 2) ** 2 +
+      Math.cos(toRadians(lat)) * Math.cos(toRadians(item.lat)) * Math.sin(toRadians(item.lng - lng) / 2) ** 2;
+    return 2 * 6371 * Math.asin(Math.min(1, Math.sqrt(h)));
+  };
+  let seed = 7;
+  const random = () => {
+    seed = (seed * 1103515245 + 12345) % 2147483648;
+    return seed / 2147483648;
+  };
+  for (let query = 0; query < 400; query += 1) {
+    const lat = query % 2 ? -56 + random() * 39 : -90 + random() * 180;
+    const lng = query % 2 ? -76 + random() * 10 : -180 + random() * 360;
+    const kind = query % 5 === 0 ? 'event' : null;
+    const expected = index.items
+      .filter((item) => kind === null || item.kind === kind)
+      .map((item) => ({ id: item.id, km: haversineKm(lat, lng, item) }))
+      .sort((a, b) => a.km - b.km);
+
+    const nearest = index.nearest(lat, lng, 5, kind);
+    assert.deepEqual(
+      nearest.map(({ item }) => item.id).sort(),
+      expected.slice(0, 5).map(({ id }) => id).sort(),
+      `nearest to ${lat}/${lng}`,
+    );
+    nearest.forEach(({ km }, position) => assert.ok(Math.abs(km - expected[position].km) < 1e-6));
+
+    const radius = [50, 250, 1000][query % 3];
+    const within = index.within(lat, lng, radius, kind).map(({ item }) => item.id);
+    assert.deepEqual(
+      within.sort(),
+      expected.filter(({ km }) => km <= radius).map(({ id }) => id).sort(),
+      `within ${radius} km of ${lat}/${lng}`,
+    );
+  }
+});
+
+test('nearbyPlaces skips the place itself and stays within the radius', async () => {
+  const { nearbyPlaces } = await import('./travel-routes.js');
+  const { createSpatialIndex } = await import('./spatial-index.js');
+  const index = createSpatialIndex({
+    version: 1,
+    nodeSize: 8,
+    fields: ['id', 'kind', 'lat', 'lng', 'name'],
+    items: [
+      ['castro', 'stop', -42.481, -73.762, 'Castro'],
+      ['feria', 'event', -42.48, -73.76, 'Feria'],
+      ['dalcahue', 'stop', -42.378, -73.65, 'Dalcahue'],
+      ['ancud', 'stop', -41.869, -73.83, 'Ancud'],
+      ['santiago', 'stop', -33.45, -70.66, 'Santiago'],
+    ],
+  });
+  const places = nearbyPlaces(index, 'castro', -42.481, -73.762);
+  assert.deepEqual(
+    places.map(({ item }) => item.id),
+    ['feria', 'dalcahue'],
+  );
+  assert.deepEqual(nearbyPlaces(null, 'castro', -42.481, -73.762), []);
+});
+
 test('transport modes contain rich metadata', () => {
   Object.values(data.transportModes).forEach((mode) => {
     assert.ok(mode.description, 'mode description missing');
@@ -425,6 +539,144 @@ test('fetchFresh enforces cache busting headers', async () => {
   }
 });
 
+test('fetchRouteResource lets content-hashed files use the browser cache', async () => {
+  const module = await import('./travel-routes.js');
+  const { fetchRouteResource, isImmutableResource } = module;
+
+  assert.equal(isImmutableResource('data/immutable/routes/var1.0123456789ab.json'), true);
+  assert.equal(isImmutableResource('./data/immutable/geo/var1.0123456789ab.json'), true);
+  assert.equal(isImmutableResource('data/routes/var1.json'), false);
+
+  const received = [];
+  const originalFetch = globalThis.fetch;
+  globalThis.fetch = async (resource, options) => {
+    received.push(options);
+    return { ok: true, json: async () => ({}) };
+  };
+
+  try {
+    await fetchRouteResource('data/immutable/routes/var1.0123456789ab.json');
+    await fetchRouteResource('data/routes/var1.json');
+
+    assert.equal(received[0].cache, 'force-cache');
+    assert.equal(received[1].cache, 'no-store');
+  } finally {
+    globalThis.fetch = originalFetch;
+  }
+});
+
+test('resolveStopReferences loads the shared stop catalog once', async () => {
+  const module = await import('./travel-routes.js');
+  const { resolveStopReferences, state } = module;
+  const catalogFile = 'data/immutable/stops/stops-catalog.0123456789ab.json';
+
+  const requested = [];
+  const originalFetch = globalThis.fetch;
+  globalThis.fetch = async (resource, options) => {
+    requested.push({ resource, options });
+    return {
+      ok: true,
+      json: async () => ({ version: 1, stops: { 'scl-airport': { id: 'scl-airport', name: 'SCL' } } }),
+    };
+  };
+
+  try {
+    const first = await resolveStopReferences({ id: 'var1', stops: ['scl-airport'], stopsCatalog: catalogFile });
+    const second = await resolveStopReferences({
+      id: 'var2',
+      stops: ['scl-airport', 'unknown-stop'],
+      stopsCatalog: catalogFile,
+    });
+
+    assert.equal(requested.length, 1);
+    assert.equal(requested[0].options.cache, 'force-cache');
+    assert.deepEqual(first.stops, [{ id: 'scl-airport', name: 'SCL' }]);
+    assert.equal(first.stops[0], second.stops[0]);
+    assert.deepEqual(second.stops[1], { id: 'unknown-stop' });
+    assert.equal('stopsCatalog' in first, false);
+
+    const inline = { id: 'var3', stops: [{ id: 'santiago-center' }] };
+    assert.equal(await resolveStopReferences(inline), inline);
+  } finally {
+    globalThis.fetch = originalFetch;
+    state.sharedTables.clear();
+  }
+});
+
+test('createSharedTableLoader fetches each table once and retries failures', async () => {
+  const requested = [];
+  let failNext = true;
+  const loadSharedTable = createSharedTableLoader(async (file) => {
+    requested.push(file);
+    if (failNext) {
+      failNext = false;
+      throw new Error('offline');
+    }
+    return { stops: { castro: { id: 'castro' } }, assets: { a1: { url: 'a1.png' } } };
+  });
+  const originalWarn = console.warn;
+  console.warn = () => {};
+
+  try {
+    assert.deepEqual(await loadSharedTable('catalog.json', 'stops'), {});
+    assert.deepEqual(await loadSharedTable('catalog.json', 'stops'), { castro: { id: 'castro' } });
+    assert.deepEqual(await loadSharedTable('catalog.json', 'assets'), { a1: { url: 'a1.png' } });
+    assert.deepEqual(await loadSharedTable('catalog.json', 'missing'), {});
+    assert.deepEqual(requested, ['catalog.json', 'catalog.json']);
+  } finally {
+    console.warn = originalWarn;
+  }
+});
+
+test('route files reference only stops from the shared catalog', () => {
+  if (!data.stopsCatalog) return;
+  const catalog = readDataFile(data.stopsCatalog.file).stops;
+  for (const entry of data.routeIndex) {
+    const route = readDataFile(entry.file);
+    if (!Array.isArray(route.stops)) continue;
+    route.stops
+      .filter((stop) => typeof stop === 'string')
+      .forEach((stopId) => assert.ok(catalog[stopId], `${entry.id}: ${stopId} fehlt im Stopp-Katalog`));
+  }
+});
+
+test('resolveAssetReferences fills image lists from the shared asset table', async () => {
+  const module = await import('./travel-routes.js');
+  const { resolveAssetReferences, state } = module;
+  const assetTable = { file: 'data/immutable/assets/asset-table.0123456789ab.json', count: 1 };
+  const placeholder = { url: 'https://upload.wikimedia.org/placeholder.png', caption: 'Placeholder image' };
+
+  let requests = 0;
+  const originalFetch = globalThis.fetch;
+  globalThis.fetch = async () => {
+    requests += 1;
+    return { ok: true, json: async () => ({ version: 1, assets: { a1: placeholder } }) };
+  };
+
+  try {
+    const inline = { url: 'https://upload.wikimedia.org/inline.png', caption: 'Inline' };
+    const route = await resolveAssetReferences(
+      {
+        id: 'chile-route-2026',
+        stops: [{ id: 'scl-airport', photos: [{ asset: 'a1' }] }],
+        days: [{ hotels: [{ name: 'Hotel', images: [{ asset: 'a1' }, inline, { asset: 'missing' }] }] }],
+      },
+      assetTable,
+    );
+    await resolveAssetReferences({ id: 'var1', food: [{ images: [{ asset: 'a1' }] }] }, assetTable);
+
+    assert.equal(requests, 1);
+    assert.deepEqual(route.stops[0].photos, [placeholder]);
+    assert.deepEqual(route.days[0].hotels[0].images, [placeholder, inline, { asset: 'missing' }]);
+
+    const untouched = { id: 'var2', food: [{ images: [{ asset: 'a1' }] }] };
+    assert.deepEqual(await resolveAssetReferences(untouched, undefined), untouched);
+  } finally {
+    globalThis.fetch = originalFetch;
+    state.sharedTables.clear();
+  }
+});
+
 test('scrollDetailToStop focuses list entries and falls back gracefully', async () => {
   const module = await import('./travel-routes.js');
   const { dom, scrollDetailToStop } = module;